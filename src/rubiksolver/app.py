@@ -13,22 +13,28 @@ def main():
     parser.add_argument(
         "--debug", action="store_true", help="Run the program in debug mode."
     )
+    parser.add_argument(
+        "--two-phase",
+        action="store_true",
+        help="Solve with the built-in two-phase solver instead of kociemba, "
+        "streaming shorter solutions before playback.",
+    )
     args = parser.parse_args()
 
     if args.debug:
         print("Running in debug mode")
         with cProfile.Profile() as profile:
-            run(True)
+            run(True, args.two_phase)
         results = pstats.Stats(profile)
         results.sort_stats(pstats.SortKey.TIME)
         results.dump_stats("rubiksolver.prof")
     else:
-        run(False)
+        run(False, args.two_phase)
 
 
-def run(debug: bool):
+def run(debug: bool, twoPhase: bool = False):
     app = QApplication(sys.argv)
-    window = CubeDetectionAppWindow(debug)
+    window = CubeDetectionAppWindow(debug, twoPhase)
     window.setMinimumSize(1600, 900)
     window.show()
     window.move(0, 0)
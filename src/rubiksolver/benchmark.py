@@ -0,0 +1,239 @@
+"""
+Benchmarks of the move engine and the solvers, reported as JSON.
+
+Every benchmark is run twice: once for timing and once under tracemalloc to
+record the peak of Python allocations, so that the tracing overhead does not
+distort the rates. Solves are slowed down so much by tracing that their
+memory run is limited to a few states and may hit the solver timeout. Solves
+that time out during the timing run are counted and do not end the benchmark.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from importlib import metadata
+
+import kociemba
+import numpy as np
+
+from rubiksolver.cube import (
+    CubeMove,
+    RubiksCube,
+    TwoPhaseSolver,
+    randomCube,
+    randomMoveScrambles,
+    randomStates,
+)
+
+MemorySolves = 3
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The measurements of a single benchmark.
+
+    attributes:
+    --  name: identifier of the benchmark, stable across releases
+    --  operations: number of operations performed
+    --  seconds: wall clock time of the timing run
+    --  rate: operations per second
+    --  peakMemory: peak bytes allocated through Python during the memory run
+    --  latency: per operation latency percentiles in seconds, if measured
+    --  timeouts: operations of the timing run that hit a timeout
+    """
+
+    name: str
+    operations: int
+    seconds: float
+    rate: float
+    peakMemory: int
+    latency: dict[str, float] = field(default_factory=dict)
+    timeouts: int = 0
+
+
+def _peakMemory(run: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _measure(
+    name: str,
+    operations: int,
+    run: Callable[[], object],
+    memoryRun: Callable[[], object] | None = None,
+) -> BenchmarkResult:
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    peak = _peakMemory(run if memoryRun is None else memoryRun)
+    return BenchmarkResult(name, operations, seconds, operations / seconds, peak)
+
+
+def _percentiles(latencies: list[float]) -> dict[str, float]:
+    values = np.array(latencies)
+    return {
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+def benchmarkApplyMove(count: int, seed: int) -> BenchmarkResult:
+    moves, _ = randomMoveScrambles(1, count, seed)
+    sequence = [CubeMove(m) for m in moves[0]]
+    cube = randomCube(seed)
+
+    def run():
+        for move in sequence:
+            cube.applyMove(move)
+
+    return _measure("cube.applyMove", count, run)
+
+
+def benchmarkBatchApplyMove(count: int, seed: int) -> BenchmarkResult:
+    batch = randomStates(count, seed)
+    moves, _ = randomMoveScrambles(1, 20, seed)
+    sequence = [CubeMove(m) for m in moves[0]]
+
+    def run():
+        batch.applyMoves(sequence)
+
+    return _measure("batch.applyMove", count * len(sequence), run)
+
+
+def benchmarkToString(count: int, seed: int) -> BenchmarkResult:
+    cubes = randomStates(min(count, 1000), seed).toCubes()
+
+    def run():
+        for i in range(count):
+            str(cubes[i % len(cubes)])
+
+    return _measure("cube.__str__", count, run)
+
+
+def benchmarkBatchToStrings(count: int, seed: int) -> BenchmarkResult:
+    batch = randomStates(count, seed)
+    return _measure("batch.toStrings", count, batch.toStrings)
+
+
+def benchmarkParseSolution(count: int, seed: int) -> BenchmarkResult:
+    moves, _ = randomMoveScrambles(min(count, 1000), 20, seed)
+    names = {move: move.name.replace("PRIME", "'") for move in CubeMove}
+    solutions = [" ".join(names[CubeMove(m)] for m in row) for row in moves]
+    cube = RubiksCube()
+
+    def run():
+        for i in range(count):
+            cube.parseSolution(solutions[i % len(solutions)])
+
+    return _measure("cube.parseSolution", count, run)
+
+
+def benchmarkSolve(
+    name: str, solver: Callable[[str], str], count: int, seed: int
+) -> BenchmarkResult:
+    states = randomStates(count, seed).toStrings()
+    latencies: list[float] = []
+    timeouts = 0
+
+    def run():
+        nonlocal timeouts
+        for facelets in states:
+            start = time.perf_counter()
+            try:
+                solver(facelets)
+            except TimeoutError:
+                # Counted with the time spent until the deadline
+                timeouts += 1
+            latencies.append(time.perf_counter() - start)
+
+    def memoryRun():
+        for facelets in states[:MemorySolves]:
+            try:
+                solver(facelets)
+            except TimeoutError:
+                # The allocations peak early, a search cut short still counts
+                pass
+
+    result = _measure(name, count, run, memoryRun)
+    result.latency = _percentiles(latencies)
+    result.timeouts = timeouts
+    return result
+
+
+def _version() -> str:
+    try:
+        return metadata.version("rubiksolver")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def runBenchmarks(
+    moves: int, states: int, solves: int, seed: int, solvers: list[str]
+) -> dict:
+    results = [
+        benchmarkApplyMove(moves, seed),
+        benchmarkBatchApplyMove(states, seed),
+        benchmarkToString(states, seed),
+        benchmarkBatchToStrings(states, seed),
+        benchmarkParseSolution(states, seed),
+    ]
+    if "kociemba" in solvers:
+        results.append(benchmarkSolve("solve.kociemba", kociemba.solve, solves, seed))
+    if "twophase" in solvers:
+        results.append(benchmarkSolve("solve.twophase", TwoPhaseSolver(), solves, seed))
+
+    return {
+        "version": _version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "maxResidentMemory": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "benchmarks": [asdict(result) for result in results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the move engine and the solvers, printing JSON."
+    )
+    parser.add_argument("-o", "--output", help="Write the JSON report to a file.")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("--moves", type=int, default=200_000)
+    parser.add_argument("--states", type=int, default=20_000)
+    parser.add_argument("--solves", type=int, default=200)
+    parser.add_argument(
+        "--solver",
+        action="append",
+        choices=["kociemba", "twophase"],
+        help="Solvers to benchmark, both by default.",
+    )
+    args = parser.parse_args()
+
+    report = runBenchmarks(
+        args.moves,
+        args.states,
+        args.solves,
+        args.seed,
+        args.solver or ["kociemba", "twophase"],
+    )
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
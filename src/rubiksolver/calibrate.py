@@ -1,19 +1,68 @@
+import argparse
 from os import path
 
 import cv2 as cv
-import matplotlib.pyplot as plt
 import numpy as np
 
+from rubiksolver.cube import CubeLabel
+from rubiksolver.vision import CalibratedColorClassificationModel
+from rubiksolver.vision.vision import ColorModelFile
+
 path_to_npyfile = path.join(path.expanduser("~"), ".local", "share", "rubiksolver")
 filename = "meancolors.npy"
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Plot or fit the facelet colors collected in debug mode."
+    )
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="Fit a color model to the collected colors instead of plotting them.",
+    )
+    parser.add_argument(
+        "--kind", choices=CalibratedColorClassificationModel.Kinds, default="gaussian"
+    )
+    parser.add_argument("-o", "--output", default=ColorModelFile)
+    args = parser.parse_args()
+
     if not path.exists(path.join(path_to_npyfile, filename)):
         print(f"Calibration data not found. {filename} not found at {path_to_npyfile}")
         return
 
     colors = np.load(path.join(path_to_npyfile, filename)).astype(np.uint8)
+    if args.fit:
+        fit(colors, args.kind, args.output)
+    else:
+        plot(colors)
+
+
+def fit(colors: np.ndarray, kind: str, output: str) -> None:
+    try:
+        model = CalibratedColorClassificationModel.fit(colors, kind=kind)
+    except ValueError as error:
+        print(f"Could not fit a color model: {error}")
+        return
+
+    labels, confidence = model.classifyWithConfidence(colors)
+    for label in range(6):
+        selected = labels == label
+        print(
+            f"{CubeLabel(label).name:>5}: {selected.sum():6d} samples, "
+            f"mean HSV {np.round(colors[selected].mean(axis=0)).astype(int)}, "
+            f"mean confidence {confidence[selected].mean():.3f}"
+        )
+    print(f"{'none':>5}: {(labels < 0).sum():6d} samples rejected")
+
+    model.save(output)
+    print(f"Saved the {kind} color model to {output}")
+
+
+def plot(colors: np.ndarray) -> None:
+    # matplotlib is only a development dependency
+    import matplotlib.pyplot as plt
+
     colors_HSV = np.expand_dims(colors, 0)
     colors_RGB = cv.cvtColor(colors_HSV, cv.COLOR_HSV2RGB)
     H, S, _ = cv.split(colors_HSV)
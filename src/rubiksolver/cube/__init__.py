@@ -1,3 +1,6 @@
+from .batch import CubeBatch
+from .cache import CacheStatistics, SolutionCache
+from .coord import CubieCoordinates, MoveTables
 from .cube import (
     CubeFace,
     CubeLabel,
@@ -7,13 +10,59 @@ from .cube import (
     MoveTimeline,
     RubiksCube,
 )
+from .cubie import CubieCube
+from .encoding import PackedCube, rankCubie, unrankCubie
+from .notation import compileNotation
+from .optimal import OptimalResult, OptimalSolver, OptimalTables
+from .permutation import Permutation
+from .pool import SolveResult, SolverPool, solveMany
+from .scramble import randomCube, randomMoveScrambles, randomStates
+from .sequence import invertMoves, simplifyMoves
+from .solver import SolverTables, TwoPhaseSolver
+from .symmetry import Symmetries, Symmetry, canonicalize
+from .validation import ValidationResult, ValidationStatus, validate
+from .variants import SolveVariant, SolveVariants, invertFacelets, invertSolution
 
 __all__ = [
+    "CacheStatistics",
+    "CubeBatch",
+    "CubieCoordinates",
+    "CubieCube",
     "CubeFace",
     "CubeLabel",
     "CubePosition",
     "Facelet",
+    "PackedCube",
+    "Permutation",
     "RubiksCube",
+    "SolutionCache",
     "MoveTimeline",
     "CubeMove",
+    "MoveTables",
+    "SolverTables",
+    "TwoPhaseSolver",
+    "OptimalResult",
+    "OptimalSolver",
+    "OptimalTables",
+    "SolverPool",
+    "SolveResult",
+    "solveMany",
+    "Symmetry",
+    "Symmetries",
+    "canonicalize",
+    "SolveVariant",
+    "SolveVariants",
+    "invertFacelets",
+    "invertSolution",
+    "ValidationResult",
+    "ValidationStatus",
+    "validate",
+    "compileNotation",
+    "invertMoves",
+    "randomCube",
+    "randomMoveScrambles",
+    "randomStates",
+    "simplifyMoves",
+    "rankCubie",
+    "unrankCubie",
 ]
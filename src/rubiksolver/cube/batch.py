@@ -0,0 +1,155 @@
+"""
+Vectorized storage and manipulation of many Rubik's cube states at once
+"""
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from .cube import CubeLabel, CubeMove, RubiksCube
+
+
+class CubeBatch:
+    """
+    A batch of N Rubik's cube states stored as an (N, 54) uint8 array.
+
+    Each entry holds the value of the facelet's CubeLabel, with unlabeled
+    facelets encoded as CubeBatch.Unlabeled. Facelets are indexed exactly like
+    RubiksCube.state.
+
+    attributes:
+    --  states: the (N, 54) array of facelet label codes
+    """
+
+    NumFacelets = 54
+    Unlabeled = 6
+
+    # Row i is the gather permutation of CubeMove(i).
+    MovePermutations: np.ndarray = np.array(
+        [RubiksCube.MovePermutation[CubeMove(i)] for i in range(len(CubeMove))],
+        dtype=np.intp,
+    )
+
+    # Label code -> facelet string character, and the reverse ASCII table.
+    CodeToChar: np.ndarray = np.frombuffer(b"URFDLBX", dtype=np.uint8)
+    CharToCode: np.ndarray = np.full(256, 255, dtype=np.uint8)
+    CharToCode[CodeToChar] = np.arange(len(CodeToChar), dtype=np.uint8)
+
+    # Packed states hold 3 bits per facelet, every group of 8 facelets filling
+    # 3 little endian bytes.
+    PackedSize = 21
+    PackShifts: np.ndarray = np.arange(0, 24, 3, dtype=np.uint32)
+
+    def __init__(self, states: np.ndarray) -> None:
+        states = np.asarray(states, dtype=np.uint8)
+        if states.ndim != 2 or states.shape[1] != CubeBatch.NumFacelets:
+            raise ValueError(
+                f"Expected an array of shape (N, {CubeBatch.NumFacelets}), "
+                f"got {states.shape}"
+            )
+        self.states = states
+
+    def __len__(self) -> int:
+        return self.states.shape[0]
+
+    @classmethod
+    def solved(cls, count: int) -> "CubeBatch":
+        """
+        Returns a batch of `count` solved cubes.
+        """
+        row = np.repeat(np.arange(6, dtype=np.uint8), 9)
+        return cls(np.tile(row, (count, 1)))
+
+    @classmethod
+    def fromCubes(cls, cubes: Iterable[RubiksCube]) -> "CubeBatch":
+        rows = [
+            [
+                CubeBatch.Unlabeled if label == CubeLabel.UNLABELD else label.value
+                for label in cube.state
+            ]
+            for cube in cubes
+        ]
+        return cls(np.array(rows, dtype=np.uint8).reshape(-1, CubeBatch.NumFacelets))
+
+    @classmethod
+    def fromStrings(cls, facelets: Iterable[str]) -> "CubeBatch":
+        """
+        Builds a batch from kociemba facelet strings, e.g. the output of
+        str(RubiksCube).
+        """
+        facelets = list(facelets)
+        for string in facelets:
+            if len(string) != CubeBatch.NumFacelets:
+                raise ValueError(f'Facelet string "{string}" must be 54 characters')
+
+        raw = np.frombuffer("".join(facelets).encode("ascii"), dtype=np.uint8)
+        codes = CubeBatch.CharToCode[raw].reshape(-1, CubeBatch.NumFacelets)
+        if np.any(codes == 255):
+            raise ValueError("Facelet strings may only contain the characters URFDLBX")
+
+        return cls(codes)
+
+    @classmethod
+    def fromPacked(cls, packed: np.ndarray) -> "CubeBatch":
+        """
+        Builds a batch from the (N, 21) output of CubeBatch.pack.
+        """
+        packed = np.asarray(packed, dtype=np.uint8).reshape(-1, 7, 3)
+        raw = np.zeros((packed.shape[0], 7, 4), dtype=np.uint8)
+        raw[:, :, :3] = packed
+        codes = (raw.view("<u4") >> CubeBatch.PackShifts) & 7
+        return cls(codes.reshape(-1, 56)[:, : CubeBatch.NumFacelets])
+
+    def pack(self) -> np.ndarray:
+        """
+        Returns the states packed into an (N, 21) uint8 array.
+        """
+        padded = np.zeros((len(self), 56), dtype=np.uint32)
+        padded[:, : CubeBatch.NumFacelets] = self.states
+        words = (padded.reshape(-1, 7, 8) << CubeBatch.PackShifts).sum(
+            axis=2, dtype=np.uint32
+        )
+        raw = words.astype("<u4").view(np.uint8).reshape(-1, 7, 4)
+        return np.ascontiguousarray(raw[:, :, :3]).reshape(-1, CubeBatch.PackedSize)
+
+    def toCubes(self) -> list[RubiksCube]:
+        labels = [CubeLabel(i) for i in range(6)] + [CubeLabel.UNLABELD]
+        cubes: list[RubiksCube] = []
+        for row in self.states.tolist():
+            cube = RubiksCube()
+            cube.state = [labels[code] for code in row]
+            cubes.append(cube)
+        return cubes
+
+    def toStrings(self) -> list[str]:
+        raw = CubeBatch.CodeToChar[self.states].tobytes().decode("ascii")
+        n = CubeBatch.NumFacelets
+        return [raw[i : i + n] for i in range(0, len(raw), n)]
+
+    def applyMove(self, move: CubeMove | np.ndarray) -> None:
+        """
+        Applies a move to every cube in the batch. `move` may either be a single
+        CubeMove or an integer array of N CubeMove values, one per cube.
+        """
+        if isinstance(move, CubeMove):
+            self.states = self.states[:, CubeBatch.MovePermutations[move.value]]
+            return
+
+        moves = np.asarray(move)
+        if moves.shape != (len(self),):
+            raise ValueError(f"Expected {len(self)} moves, got shape {moves.shape}")
+
+        self.states = np.take_along_axis(
+            self.states, CubeBatch.MovePermutations[moves], axis=1
+        )
+
+    def applyMoves(self, moves: Sequence[CubeMove]) -> None:
+        for move in moves:
+            self.applyMove(move)
+
+    def isSolved(self) -> np.ndarray:
+        """
+        Returns a boolean array marking the cubes whose faces are uniform.
+        """
+        faces = self.states.reshape(-1, 6, 9)
+        return np.all(faces == faces[:, :, 4:5], axis=(1, 2))
@@ -0,0 +1,184 @@
+"""
+Bounded LRU cache of cube solutions keyed by facelet string
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from os import makedirs, path
+
+import kociemba
+
+from .symmetry import canonicalize
+
+CacheFile = path.join(
+    path.expanduser("~"), ".local", "share", "rubiksolver", "solutions.sqlite3"
+)
+
+
+@dataclass
+class CacheStatistics:
+    """
+    A snapshot of the counters of a SolutionCache.
+
+    attributes:
+    --  hits: lookups answered from memory or disk
+    --  diskHits: the subset of hits answered by the on-disk tier
+    --  misses: lookups that had to invoke the solver
+    --  evictions: entries dropped from memory to respect the capacity
+    --  size: number of entries currently held in memory
+    --  capacity: maximum number of entries held in memory
+    """
+
+    hits: int
+    diskHits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+
+    @property
+    def hitRate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SolutionCache:
+    """
+    A solver wrapper that memoizes solutions in an LRU ordered dictionary,
+    optionally backed by an SQLite file that survives restarts.
+
+    The cache is itself a solver callable, so it can be handed to RubiksCube in
+    place of kociemba.solve.
+
+    With `symmetryReduction` enabled, states are keyed by their canonical form
+    under the 48 cube symmetries and the stored solution is mapped back to the
+    requested state, so symmetric states share a single entry.
+    """
+
+    def __init__(
+        self,
+        solver: Callable[[str], str] = kociemba.solve,
+        capacity: int = 4096,
+        filename: str | None = None,
+        symmetryReduction: bool = False,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("The cache capacity must be positive")
+
+        self.solver = solver
+        self.capacity = capacity
+        self.filename = filename
+        self.symmetryReduction = symmetryReduction
+
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._diskHits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._db: sqlite3.Connection | None = None
+        if filename is not None:
+            directory = path.dirname(path.abspath(filename))
+            if not path.exists(directory):
+                makedirs(directory)
+            self._db = sqlite3.connect(filename, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions "
+                "(facelets TEXT PRIMARY KEY, solution TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def __call__(self, facelets: str) -> str:
+        return self.solve(facelets)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, facelets: str) -> bool:
+        return facelets in self._entries
+
+    def solve(self, facelets: str) -> str:
+        """
+        Returns the cached solution of `facelets`, invoking the solver on a
+        miss. Solver errors propagate and are not cached.
+        """
+        if not self.symmetryReduction:
+            return self._solve(facelets)
+
+        canonical, symmetry = canonicalize(facelets)
+        return symmetry.inverse.mapSolution(self._solve(canonical))
+
+    def _solve(self, facelets: str) -> str:
+        solution = self.get(facelets)
+        if solution is not None:
+            return solution
+
+        solution = self.solver(facelets)
+        self.put(facelets, solution)
+        return solution
+
+    def get(self, facelets: str) -> str | None:
+        with self._lock:
+            solution = self._entries.get(facelets)
+            if solution is not None:
+                self._entries.move_to_end(facelets)
+                self._hits += 1
+                return solution
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT solution FROM solutions WHERE facelets = ?", (facelets,)
+                ).fetchone()
+                if row is not None:
+                    self._hits += 1
+                    self._diskHits += 1
+                    self._insert(facelets, row[0])
+                    return row[0]
+
+            self._misses += 1
+            return None
+
+    def put(self, facelets: str, solution: str) -> None:
+        with self._lock:
+            self._insert(facelets, solution)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                    (facelets, solution),
+                )
+                self._db.commit()
+
+    def statistics(self) -> CacheStatistics:
+        with self._lock:
+            return CacheStatistics(
+                self._hits,
+                self._diskHits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self.capacity,
+            )
+
+    def clear(self) -> None:
+        """
+        Empties the in-memory tier. The on-disk tier is left untouched.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _insert(self, facelets: str, solution: str) -> None:
+        self._entries[facelets] = solution
+        self._entries.move_to_end(facelets)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
@@ -0,0 +1,290 @@
+"""
+Integer coordinates of cubie level cube states and their move tables.
+
+Every encoder/decoder works on NumPy arrays with a leading batch axis so that
+the move tables can be generated for all coordinate values at once.
+"""
+
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb, factorial
+
+import numpy as np
+
+from .cube import CubeMove, RubiksCube
+from .cubie import CubieCube, CubieMoves, Edge
+
+N_TWIST = 3**7
+N_FLIP = 2**11
+N_SLICE = comb(12, 4)
+N_SLICE_SORTED = N_SLICE * factorial(4)
+N_CORNERS = factorial(8)
+N_UD_EDGES = factorial(8)
+N_EDGES = factorial(12)
+
+N_MOVES = 18
+
+# Move index m = 3 * face + power, where power 0, 1, 2 is a clockwise quarter,
+# half and counter-clockwise quarter turn of CubeFace(face).
+MoveNames: list[str] = [face + suffix for face in "URFDLB" for suffix in ("", "2", "'")]
+
+CubeMoveIndex: dict[CubeMove, int] = {
+    move: 3 * face.value + turns - 1
+    for move, (face, turns) in RubiksCube.MoveTurns.items()
+}
+
+# Moves that keep a cube inside the subgroup G1 = <U, D, R2, F2, L2, B2>.
+Phase2Moves: list[int] = [0, 1, 2, 4, 7, 9, 10, 11, 13, 16]
+
+# Cubie representation of every move, in move index order.
+MoveCubies: list[CubieCube] = [
+    CubieMoves[move] for move in sorted(CubeMoveIndex, key=CubeMoveIndex.get)
+]
+MoveCP = np.array([cube.cp for cube in MoveCubies], dtype=np.intp)
+MoveCO = np.array([cube.co for cube in MoveCubies], dtype=np.int8)
+MoveEP = np.array([cube.ep for cube in MoveCubies], dtype=np.intp)
+MoveEO = np.array([cube.eo for cube in MoveCubies], dtype=np.int8)
+
+
+def _buildEdgeGroupPlacements() -> tuple[np.ndarray, np.ndarray]:
+    """
+    Enumerates the 495 ways to place a group of four edges. A placement is
+    ranked in colex order over 11 - position, so that positions 8 to 11 (the
+    solved placement of the UD-slice edges) have rank 0.
+    """
+    positions = np.zeros((N_SLICE, 4), dtype=np.intp)
+    rankByMask = np.full(1 << 12, -1, dtype=np.int32)
+    for c in combinations(range(12), 4):
+        rank = sum(comb(ck, k + 1) for k, ck in enumerate(c))
+        placement = sorted(11 - ck for ck in c)
+        positions[rank] = placement
+        rankByMask[sum(1 << p for p in placement)] = rank
+    return positions, rankByMask
+
+
+EdgeGroupPositions, EdgeGroupRankByMask = _buildEdgeGroupPlacements()
+
+# First edge of the edge groups tracked by the edge group coordinates.
+U_EDGES = Edge.UR.value
+D_EDGES = Edge.DR.value
+SLICE_EDGES = Edge.FR.value
+
+
+def encodeOrientation(orientation: np.ndarray, base: int) -> np.ndarray:
+    """
+    Encodes the orientations of all but the last cubie as a base `base` number.
+    """
+    index = np.zeros(orientation.shape[0], dtype=np.int64)
+    for i in range(orientation.shape[1] - 1):
+        index = index * base + orientation[:, i]
+    return index
+
+
+def decodeOrientation(index: np.ndarray, base: int, n: int) -> np.ndarray:
+    index = np.asarray(index, dtype=np.int64).copy()
+    orientation = np.zeros((index.shape[0], n), dtype=np.int8)
+    for i in range(n - 2, -1, -1):
+        orientation[:, i] = index % base
+        index //= base
+    orientation[:, n - 1] = (-orientation[:, : n - 1].sum(axis=1)) % base
+    return orientation
+
+
+def encodePermutation(permutation: np.ndarray) -> np.ndarray:
+    """
+    Returns the lexicographic rank (Lehmer code) of each permutation row.
+    """
+    n = permutation.shape[1]
+    index = np.zeros(permutation.shape[0], dtype=np.int64)
+    for i in range(n - 1):
+        smaller = (permutation[:, i + 1 :] < permutation[:, i : i + 1]).sum(axis=1)
+        index += smaller * factorial(n - 1 - i)
+    return index
+
+
+def decodePermutation(index: np.ndarray, n: int) -> np.ndarray:
+    index = np.asarray(index, dtype=np.int64).copy()
+    count = index.shape[0]
+    available = np.ones((count, n), dtype=bool)
+    permutation = np.zeros((count, n), dtype=np.intp)
+    rows = np.arange(count)
+    for i in range(n):
+        digit = index // factorial(n - 1 - i)
+        index %= factorial(n - 1 - i)
+        rank = np.cumsum(available, axis=1) - 1
+        chosen = np.argmax(available & (rank == digit[:, None]), axis=1)
+        permutation[:, i] = chosen
+        available[rows, chosen] = False
+    return permutation
+
+
+def encodeEdgeGroup(ep: np.ndarray, first: int) -> np.ndarray:
+    """
+    Encodes the positions and the order of the four edges first, ..., first + 3.
+    """
+    inGroup = (ep >= first) & (ep < first + 4)
+    mask = (inGroup * (1 << np.arange(12))).sum(axis=1)
+    placement = EdgeGroupRankByMask[mask].astype(np.int64)
+    order = ep[inGroup].reshape(-1, 4) - first
+    return placement * 24 + encodePermutation(order)
+
+
+def decodeEdgeGroup(index: np.ndarray, first: int) -> np.ndarray:
+    """
+    Returns edge permutations with the four edges of the group placed according
+    to `index`. The remaining positions hold the other edges in ascending order.
+    """
+    index = np.asarray(index, dtype=np.int64)
+    positions = EdgeGroupPositions[index // 24]
+    order = decodePermutation(index % 24, 4) + first
+    others = np.array([e for e in range(12) if not first <= e < first + 4])
+
+    ep = np.zeros((index.shape[0], 12), dtype=np.intp)
+    inGroup = np.zeros((index.shape[0], 12), dtype=bool)
+    np.put_along_axis(inGroup, positions, True, axis=1)
+    np.put_along_axis(ep, positions, order, axis=1)
+    ep[~inGroup] = np.tile(others, index.shape[0])
+    return ep
+
+
+def encodeSliceSorted(ep: np.ndarray) -> np.ndarray:
+    return encodeEdgeGroup(ep, SLICE_EDGES)
+
+
+def decodeSliceSorted(index: np.ndarray) -> np.ndarray:
+    return decodeEdgeGroup(index, SLICE_EDGES)
+
+
+def applyCornerMove(cp: np.ndarray, co: np.ndarray, move: int):
+    return cp[:, MoveCP[move]], (co[:, MoveCP[move]] + MoveCO[move]) % 3
+
+
+def applyEdgeMove(ep: np.ndarray, eo: np.ndarray, move: int):
+    return ep[:, MoveEP[move]], (eo[:, MoveEP[move]] + MoveEO[move]) % 2
+
+
+@dataclass(frozen=True)
+class CubieCoordinates:
+    """
+    The coordinates of a cubie cube used by the two-phase algorithm.
+
+    attributes:
+    --  twist: corner orientation, 0 <= twist < 3^7
+    --  flip: edge orientation, 0 <= flip < 2^11
+    --  sliceSorted: position and order of the UD-slice edges, < 11880. The
+        phase 1 UD-slice coordinate is sliceSorted // 24
+    --  corners: corner permutation, < 8!
+    --  edges: edge permutation, < 12!
+    """
+
+    twist: int
+    flip: int
+    sliceSorted: int
+    corners: int
+    edges: int
+
+    @classmethod
+    def fromCubie(cls, cube: CubieCube) -> "CubieCoordinates":
+        co = np.array([cube.co], dtype=np.int8)
+        eo = np.array([cube.eo], dtype=np.int8)
+        cp = np.array([cube.cp], dtype=np.intp)
+        ep = np.array([cube.ep], dtype=np.intp)
+        return cls(
+            int(encodeOrientation(co, 3)[0]),
+            int(encodeOrientation(eo, 2)[0]),
+            int(encodeSliceSorted(ep)[0]),
+            int(encodePermutation(cp)[0]),
+            int(encodePermutation(ep)[0]),
+        )
+
+    @property
+    def slice(self) -> int:
+        return self.sliceSorted // 24
+
+    def toCubie(self) -> CubieCube:
+        return CubieCube(
+            decodePermutation(np.array([self.corners]), 8)[0].tolist(),
+            decodeOrientation(np.array([self.twist]), 3, 8)[0].tolist(),
+            decodePermutation(np.array([self.edges]), 12)[0].tolist(),
+            decodeOrientation(np.array([self.flip]), 2, 12)[0].tolist(),
+        )
+
+
+def udEdgesCoordinate(cube: CubieCube) -> int:
+    """
+    Returns the permutation coordinate of the 8 U and D edges of a cube in G1.
+    """
+    if max(cube.ep[:8]) >= 8:
+        raise ValueError("The UD-slice edges are not in the UD-slice")
+    return int(encodePermutation(np.array([cube.ep[:8]], dtype=np.intp))[0])
+
+
+@dataclass
+class MoveTables:
+    """
+    Coordinate move tables, table[coordinate, move] being the coordinate after
+    applying the move with index `move` (see MoveNames).
+
+    attributes:
+    --  twist: (3^7, 18) corner orientation move table
+    --  flip: (2^11, 18) edge orientation move table
+    --  sliceSorted: (11880, 18) UD-slice edge move table
+    --  uEdges: (11880, 18) move table of the edge group UR, UF, UL, UB
+    --  dEdges: (11880, 18) move table of the edge group DR, DF, DL, DB
+    --  corners: (8!, 18) corner permutation move table
+    --  udEdges: (8!, 18) U and D edge permutation move table. Only the columns
+        of Phase2Moves are meaningful.
+    """
+
+    twist: np.ndarray
+    flip: np.ndarray
+    sliceSorted: np.ndarray
+    uEdges: np.ndarray
+    dEdges: np.ndarray
+    corners: np.ndarray
+    udEdges: np.ndarray
+
+    @classmethod
+    def build(cls) -> "MoveTables":
+        twist = np.zeros((N_TWIST, N_MOVES), dtype=np.uint16)
+        co = decodeOrientation(np.arange(N_TWIST), 3, 8)
+        cp = np.tile(np.arange(8), (N_TWIST, 1))
+        for move in range(N_MOVES):
+            twist[:, move] = encodeOrientation(applyCornerMove(cp, co, move)[1], 3)
+
+        flip = np.zeros((N_FLIP, N_MOVES), dtype=np.uint16)
+        eo = decodeOrientation(np.arange(N_FLIP), 2, 12)
+        ep = np.tile(np.arange(12), (N_FLIP, 1))
+        for move in range(N_MOVES):
+            flip[:, move] = encodeOrientation(applyEdgeMove(ep, eo, move)[1], 2)
+
+        sliceSorted, uEdges, dEdges = (
+            MoveTables.buildEdgeGroupTable(first)
+            for first in (SLICE_EDGES, U_EDGES, D_EDGES)
+        )
+
+        corners = np.zeros((N_CORNERS, N_MOVES), dtype=np.uint16)
+        cp = decodePermutation(np.arange(N_CORNERS), 8)
+        for move in range(N_MOVES):
+            corners[:, move] = encodePermutation(cp[:, MoveCP[move]])
+
+        udEdges = np.zeros((N_UD_EDGES, N_MOVES), dtype=np.uint16)
+        ep = np.concatenate(
+            [
+                decodePermutation(np.arange(N_UD_EDGES), 8),
+                np.tile(np.arange(8, 12), (N_UD_EDGES, 1)),
+            ],
+            axis=1,
+        )
+        for move in Phase2Moves:
+            udEdges[:, move] = encodePermutation(ep[:, MoveEP[move]][:, :8])
+
+        return cls(twist, flip, sliceSorted, uEdges, dEdges, corners, udEdges)
+
+    @staticmethod
+    def buildEdgeGroupTable(first: int) -> np.ndarray:
+        table = np.zeros((N_SLICE_SORTED, N_MOVES), dtype=np.uint16)
+        ep = decodeEdgeGroup(np.arange(N_SLICE_SORTED), first)
+        for move in range(N_MOVES):
+            table[:, move] = encodeEdgeGroup(ep[:, MoveEP[move]], first)
+        return table
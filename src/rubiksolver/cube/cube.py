@@ -1,5 +1,7 @@
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
+from operator import itemgetter
 
 import kociemba
 
@@ -48,6 +50,12 @@ class CubeMove(Enum):
     LPRIME = 9
     B = 10
     BPRIME = 11
+    U2 = 12
+    R2 = 13
+    F2 = 14
+    D2 = 15
+    L2 = 16
+    B2 = 17
 
 
 class MoveTimeline:
@@ -64,12 +72,34 @@ class MoveTimeline:
         CubeMove.LPRIME: CubeMove.L,
         CubeMove.B: CubeMove.BPRIME,
         CubeMove.BPRIME: CubeMove.B,
+        CubeMove.U2: CubeMove.U2,
+        CubeMove.R2: CubeMove.R2,
+        CubeMove.F2: CubeMove.F2,
+        CubeMove.D2: CubeMove.D2,
+        CubeMove.L2: CubeMove.L2,
+        CubeMove.B2: CubeMove.B2,
     }
 
-    def __init__(self, moves: list[CubeMove]):
+    def __init__(
+        self,
+        moves: list[CubeMove],
+        initialState: list[CubeLabel] | None = None,
+        checkpointInterval: int = 8,
+    ):
+        if checkpointInterval <= 0:
+            raise ValueError("The checkpoint interval must be positive")
+
         self.moves = moves
         self.currentPosition = 0
         self.numMoves = len(moves)
+        self.initialState = initialState
+        self.checkpointInterval = checkpointInterval
+
+        # Built on the first seek: the state at every multiple of the checkpoint
+        # interval, and for every position the permutation composed of the
+        # moves played since the last checkpoint.
+        self._checkpoints: list[tuple[CubeLabel, ...]] = []
+        self._offsets: list[itemgetter] = []
 
     def next(self) -> CubeMove | None:
         if self.currentPosition >= self.numMoves:
@@ -86,6 +116,40 @@ class MoveTimeline:
         move = self.MoveReverse[self.moves[self.currentPosition]]
         return move
 
+    def seek(self, position: int) -> list[CubeLabel]:
+        """
+        Moves the timeline to `position` and returns the cube state there, i.e.
+        the initial state after the first `position` moves. Costs a single
+        gather once the checkpoints are built.
+        """
+        if self.initialState is None:
+            raise ValueError("Seeking requires a timeline with an initial state")
+        if not 0 <= position <= self.numMoves:
+            raise IndexError(f"Position {position} out of range")
+
+        if not self._offsets:
+            self._buildCheckpoints()
+
+        self.currentPosition = position
+        checkpoint = self._checkpoints[position // self.checkpointInterval]
+        return list(self._offsets[position](checkpoint))
+
+    def _buildCheckpoints(self) -> None:
+        identity = tuple(range(len(self.initialState)))
+        state = tuple(self.initialState)
+        offset = identity
+
+        for position in range(self.numMoves + 1):
+            if position % self.checkpointInterval == 0:
+                self._checkpoints.append(state)
+                offset = identity
+            self._offsets.append(itemgetter(*offset))
+
+            if position < self.numMoves:
+                gather = RubiksCube.MoveGather[self.moves[position]]
+                state = gather(state)
+                offset = gather(offset)
+
 
 @dataclass
 class Facelet:
@@ -199,6 +263,34 @@ class RubiksCube:
         ],
     }
 
+    # Face turned by every move and the number of clockwise quarter turns.
+    MoveTurns: dict[CubeMove, tuple[CubeFace, int]] = {
+        CubeMove.U: (CubeFace.UP, 1),
+        CubeMove.U2: (CubeFace.UP, 2),
+        CubeMove.UPRIME: (CubeFace.UP, 3),
+        CubeMove.R: (CubeFace.RIGHT, 1),
+        CubeMove.R2: (CubeFace.RIGHT, 2),
+        CubeMove.RPRIME: (CubeFace.RIGHT, 3),
+        CubeMove.F: (CubeFace.FRONT, 1),
+        CubeMove.F2: (CubeFace.FRONT, 2),
+        CubeMove.FPRIME: (CubeFace.FRONT, 3),
+        CubeMove.D: (CubeFace.DOWN, 1),
+        CubeMove.D2: (CubeFace.DOWN, 2),
+        CubeMove.DPRIME: (CubeFace.DOWN, 3),
+        CubeMove.L: (CubeFace.LEFT, 1),
+        CubeMove.L2: (CubeFace.LEFT, 2),
+        CubeMove.LPRIME: (CubeFace.LEFT, 3),
+        CubeMove.B: (CubeFace.BACK, 1),
+        CubeMove.B2: (CubeFace.BACK, 2),
+        CubeMove.BPRIME: (CubeFace.BACK, 3),
+    }
+
+    # Flat facelet permutation of every move, i.e. after applying `move` the
+    # facelet at index i holds the label previously at MovePermutation[move][i].
+    # Both tables are derived from EdgeMap once the class has been created.
+    MovePermutation: dict[CubeMove, tuple[int, ...]] = {}
+    MoveGather: dict[CubeMove, itemgetter] = {}
+
     StrLabel: dict[CubeLabel, str] = {
         CubeLabel.UNLABELD: "X",
         CubeLabel.UP: "U",
@@ -209,7 +301,8 @@ class RubiksCube:
         CubeLabel.BACK: "B",
     }
 
-    def __init__(self) -> None:
+    def __init__(self, solver: Callable[[str], str] = kociemba.solve) -> None:
+        self.solver = solver
         self.numFacelets = 9 * 6
         self.state: list[CubeLabel] = [
             CubeLabel.UNLABELD for _ in range(self.numFacelets)
@@ -222,71 +315,78 @@ class RubiksCube:
 
     def isComplete(self) -> bool:
         try:
-            if CubeLabel.UNLABELD not in self.state and self.solution is None:
-                solution = kociemba.solve(str(self))
+            if self.isLabeled() and self.solution is None:
+                solution = self.solver(str(self))
                 if isinstance(solution, str):
-                    print(solution)
-                    self.solution = self.parseSolution(solution)
+                    self.setSolution(solution)
                     return True
         except ValueError:
             return False
         return False
 
+    def isLabeled(self) -> bool:
+        return CubeLabel.UNLABELD not in self.state
+
+    def setSolution(self, solution: str) -> None:
+        print(solution)
+        self.solution = self.parseSolution(solution)
+
     def parseSolution(self, solution: str) -> MoveTimeline:
+        return MoveTimeline(RubiksCube.ParseMoves(solution), list(self.state))
+
+    @staticmethod
+    def ParseMoves(solution: str) -> list[CubeMove]:
+        """
+        Parses a space separated sequence of face turns in kociemba notation.
+        """
         moves: list[CubeMove] = []
-        for move in solution.split(" "):
+        for move in solution.split():
             match move:
                 case "U":
                     moves.append(CubeMove.U)
                 case "U'":
                     moves.append(CubeMove.UPRIME)
                 case "U2":
-                    moves.append(CubeMove.U)
-                    moves.append(CubeMove.U)
+                    moves.append(CubeMove.U2)
 
                 case "R":
                     moves.append(CubeMove.R)
                 case "R'":
                     moves.append(CubeMove.RPRIME)
                 case "R2":
-                    moves.append(CubeMove.R)
-                    moves.append(CubeMove.R)
+                    moves.append(CubeMove.R2)
 
                 case "F":
                     moves.append(CubeMove.F)
                 case "F'":
                     moves.append(CubeMove.FPRIME)
                 case "F2":
-                    moves.append(CubeMove.F)
-                    moves.append(CubeMove.F)
+                    moves.append(CubeMove.F2)
 
                 case "D":
                     moves.append(CubeMove.D)
                 case "D'":
                     moves.append(CubeMove.DPRIME)
                 case "D2":
-                    moves.append(CubeMove.D)
-                    moves.append(CubeMove.D)
+                    moves.append(CubeMove.D2)
 
                 case "L":
                     moves.append(CubeMove.L)
                 case "L'":
                     moves.append(CubeMove.LPRIME)
                 case "L2":
-                    moves.append(CubeMove.L)
-                    moves.append(CubeMove.L)
+                    moves.append(CubeMove.L2)
 
                 case "B":
                     moves.append(CubeMove.B)
                 case "B'":
                     moves.append(CubeMove.BPRIME)
                 case "B2":
-                    moves.append(CubeMove.B)
-                    moves.append(CubeMove.B)
+                    moves.append(CubeMove.B2)
                 case _:
                     raise ValueError(f'Move "{move}" not recognized!')
 
-        return MoveTimeline(moves)
+        return moves
 
     def reset(self) -> None:
         self.state = [CubeLabel.UNLABELD for _ in range(self.numFacelets)]
@@ -297,67 +397,43 @@ class RubiksCube:
         self.solution = None
 
     def applyMove(self, move: CubeMove) -> None:
-        match move:
-            case CubeMove.U:
-                self.rotateUpCW()
-            case CubeMove.UPRIME:
-                self.rotateUpCCW()
-            case CubeMove.R:
-                self.rotateRightCW()
-            case CubeMove.RPRIME:
-                self.rotateRightCCW()
-            case CubeMove.F:
-                self.rotateFrontCW()
-            case CubeMove.FPRIME:
-                self.rotateFrontCCW()
-            case CubeMove.D:
-                self.rotateDownCW()
-            case CubeMove.DPRIME:
-                self.rotateDownCCW()
-            case CubeMove.L:
-                self.rotateLeftCW()
-            case CubeMove.LPRIME:
-                self.rotateLeftCCW()
-            case CubeMove.B:
-                self.rotateBackCW()
-            case CubeMove.BPRIME:
-                self.rotateBackCCW()
+        self.state[:] = RubiksCube.MoveGather[move](self.state)
 
     def rotateFrontCW(self) -> None:
-        self._rotateFaceCW(CubeFace.FRONT)
+        self.applyMove(CubeMove.F)
 
     def rotateFrontCCW(self) -> None:
-        self._rotateFaceCCW(CubeFace.FRONT)
+        self.applyMove(CubeMove.FPRIME)
 
     def rotateBackCW(self) -> None:
-        self._rotateFaceCW(CubeFace.BACK)
+        self.applyMove(CubeMove.B)
 
     def rotateBackCCW(self) -> None:
-        self._rotateFaceCCW(CubeFace.BACK)
+        self.applyMove(CubeMove.BPRIME)
 
     def rotateUpCW(self) -> None:
-        self._rotateFaceCW(CubeFace.UP)
+        self.applyMove(CubeMove.U)
 
     def rotateUpCCW(self) -> None:
-        self._rotateFaceCCW(CubeFace.UP)
+        self.applyMove(CubeMove.UPRIME)
 
     def rotateDownCW(self) -> None:
-        self._rotateFaceCW(CubeFace.DOWN)
+        self.applyMove(CubeMove.D)
 
     def rotateDownCCW(self) -> None:
-        self._rotateFaceCCW(CubeFace.DOWN)
+        self.applyMove(CubeMove.DPRIME)
 
     def rotateLeftCW(self) -> None:
-        self._rotateFaceCW(CubeFace.LEFT)
+        self.applyMove(CubeMove.L)
 
     def rotateLeftCCW(self) -> None:
-        self._rotateFaceCCW(CubeFace.LEFT)
+        self.applyMove(CubeMove.LPRIME)
 
     def rotateRightCW(self) -> None:
-        self._rotateFaceCW(CubeFace.RIGHT)
+        self.applyMove(CubeMove.R)
 
     def rotateRightCCW(self) -> None:
-        self._rotateFaceCCW(CubeFace.RIGHT)
+        self.applyMove(CubeMove.RPRIME)
 
     def setFaceletLabel(self, facelet: Facelet, facelet_label: CubeLabel) -> None:
         self.state[RubiksCube.FaceletToIndex(facelet)] = facelet_label
@@ -427,3 +503,30 @@ class RubiksCube:
     @staticmethod
     def FaceletToIndex(facelet: Facelet) -> int:
         return (facelet.face.value * 9) + facelet.postion.value
+
+    @staticmethod
+    def DeriveMovePermutation(move: CubeMove) -> tuple[int, ...]:
+        """
+        Traces the facelet swaps of a move over the facelet indices themselves,
+        yielding the gather permutation of the move.
+        """
+        face, turns = RubiksCube.MoveTurns[move]
+        cube = RubiksCube()
+        cube.state = list(range(cube.numFacelets))  # type: ignore[arg-type]
+
+        if turns == 3:
+            cube._rotateFaceCCW(face)
+        else:
+            for _ in range(turns):
+                cube._rotateFaceCW(face)
+
+        return tuple(cube.state)  # type: ignore[arg-type]
+
+
+RubiksCube.MovePermutation = {
+    move: RubiksCube.DeriveMovePermutation(move) for move in CubeMove
+}
+RubiksCube.MoveGather = {
+    move: itemgetter(*permutation)
+    for move, permutation in RubiksCube.MovePermutation.items()
+}
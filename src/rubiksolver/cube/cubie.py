@@ -0,0 +1,302 @@
+"""
+Cubie level representation of the Rubik's cube.
+
+A cube state is described by the permutation and orientation of its 8 corner
+and 12 edge cubies, following the conventions of Kociemba's two-phase
+algorithm. The facelet layout is the one used by RubiksCube.state.
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+
+from .cube import CubeFace, CubeLabel, CubeMove, CubePosition, Facelet, RubiksCube
+
+
+class Corner(Enum):
+    URF = 0
+    UFL = 1
+    ULB = 2
+    UBR = 3
+    DFR = 4
+    DLF = 5
+    DBL = 6
+    DRB = 7
+
+
+class Edge(Enum):
+    UR = 0
+    UF = 1
+    UL = 2
+    UB = 3
+    DR = 4
+    DF = 5
+    DL = 6
+    DB = 7
+    FR = 8
+    FL = 9
+    BL = 10
+    BR = 11
+
+
+def _index(face: CubeFace, position: CubePosition) -> int:
+    return RubiksCube.FaceletToIndex(Facelet(face, position))
+
+
+# Facelet indices of every corner position, listed clockwise starting with the
+# U or D facelet.
+CornerFacelets: list[tuple[int, ...]] = [
+    (
+        _index(CubeFace.UP, CubePosition.NINE),
+        _index(CubeFace.RIGHT, CubePosition.ONE),
+        _index(CubeFace.FRONT, CubePosition.THREE),
+    ),
+    (
+        _index(CubeFace.UP, CubePosition.SEVEN),
+        _index(CubeFace.FRONT, CubePosition.ONE),
+        _index(CubeFace.LEFT, CubePosition.THREE),
+    ),
+    (
+        _index(CubeFace.UP, CubePosition.ONE),
+        _index(CubeFace.LEFT, CubePosition.ONE),
+        _index(CubeFace.BACK, CubePosition.THREE),
+    ),
+    (
+        _index(CubeFace.UP, CubePosition.THREE),
+        _index(CubeFace.BACK, CubePosition.ONE),
+        _index(CubeFace.RIGHT, CubePosition.THREE),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.THREE),
+        _index(CubeFace.FRONT, CubePosition.NINE),
+        _index(CubeFace.RIGHT, CubePosition.SEVEN),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.ONE),
+        _index(CubeFace.LEFT, CubePosition.NINE),
+        _index(CubeFace.FRONT, CubePosition.SEVEN),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.SEVEN),
+        _index(CubeFace.BACK, CubePosition.NINE),
+        _index(CubeFace.LEFT, CubePosition.SEVEN),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.NINE),
+        _index(CubeFace.RIGHT, CubePosition.NINE),
+        _index(CubeFace.BACK, CubePosition.SEVEN),
+    ),
+]
+
+# Facelet indices of every edge position, the first being the reference facelet.
+EdgeFacelets: list[tuple[int, ...]] = [
+    (
+        _index(CubeFace.UP, CubePosition.SIX),
+        _index(CubeFace.RIGHT, CubePosition.TWO),
+    ),
+    (
+        _index(CubeFace.UP, CubePosition.EIGHT),
+        _index(CubeFace.FRONT, CubePosition.TWO),
+    ),
+    (
+        _index(CubeFace.UP, CubePosition.FOUR),
+        _index(CubeFace.LEFT, CubePosition.TWO),
+    ),
+    (
+        _index(CubeFace.UP, CubePosition.TWO),
+        _index(CubeFace.BACK, CubePosition.TWO),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.SIX),
+        _index(CubeFace.RIGHT, CubePosition.EIGHT),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.TWO),
+        _index(CubeFace.FRONT, CubePosition.EIGHT),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.FOUR),
+        _index(CubeFace.LEFT, CubePosition.EIGHT),
+    ),
+    (
+        _index(CubeFace.DOWN, CubePosition.EIGHT),
+        _index(CubeFace.BACK, CubePosition.EIGHT),
+    ),
+    (
+        _index(CubeFace.FRONT, CubePosition.SIX),
+        _index(CubeFace.RIGHT, CubePosition.FOUR),
+    ),
+    (
+        _index(CubeFace.FRONT, CubePosition.FOUR),
+        _index(CubeFace.LEFT, CubePosition.SIX),
+    ),
+    (
+        _index(CubeFace.BACK, CubePosition.SIX),
+        _index(CubeFace.LEFT, CubePosition.FOUR),
+    ),
+    (
+        _index(CubeFace.BACK, CubePosition.FOUR),
+        _index(CubeFace.RIGHT, CubePosition.SIX),
+    ),
+]
+
+# Colors of the facelets of every corner and edge cubie, in the same order as
+# CornerFacelets and EdgeFacelets.
+CornerColors: list[tuple[CubeLabel, ...]] = [
+    tuple(CubeLabel(f // 9) for f in facelets) for facelets in CornerFacelets
+]
+EdgeColors: list[tuple[CubeLabel, ...]] = [
+    tuple(CubeLabel(f // 9) for f in facelets) for facelets in EdgeFacelets
+]
+
+
+@dataclass
+class CubieCube:
+    """
+    A cube state on the cubie level.
+
+    attributes:
+    --  cp: cp[i] is the corner cubie occupying corner position i
+    --  co: co[i] is the orientation (0, 1, 2) of the cubie at position i
+    --  ep: ep[i] is the edge cubie occupying edge position i
+    --  eo: eo[i] is the orientation (0, 1) of the cubie at position i
+    """
+
+    cp: list[int] = field(default_factory=lambda: list(range(8)))
+    co: list[int] = field(default_factory=lambda: [0] * 8)
+    ep: list[int] = field(default_factory=lambda: list(range(12)))
+    eo: list[int] = field(default_factory=lambda: [0] * 12)
+
+    @classmethod
+    def fromFacelets(cls, state: list[CubeLabel]) -> "CubieCube":
+        """
+        Converts a fully labeled facelet state into a cubie cube.
+
+        Raises ValueError if some corner or edge does not carry the colors of
+        an actual cubie.
+        """
+        cube = cls()
+
+        for i, facelets in enumerate(CornerFacelets):
+            colors = [state[f] for f in facelets]
+            for ori in range(3):
+                if colors[ori] in (CubeLabel.UP, CubeLabel.DOWN):
+                    break
+            else:
+                raise ValueError(f"Corner position {Corner(i).name} has no U/D color")
+
+            col1, col2 = colors[(ori + 1) % 3], colors[(ori + 2) % 3]
+            for j, cubie in enumerate(CornerColors):
+                if col1 == cubie[1] and col2 == cubie[2]:
+                    cube.cp[i] = j
+                    cube.co[i] = ori
+                    break
+            else:
+                raise ValueError(f"Corner position {Corner(i).name} is not a corner")
+
+        for i, facelets in enumerate(EdgeFacelets):
+            colors = (state[facelets[0]], state[facelets[1]])
+            for j, cubie in enumerate(EdgeColors):
+                if colors == cubie:
+                    cube.ep[i] = j
+                    cube.eo[i] = 0
+                    break
+                if colors == (cubie[1], cubie[0]):
+                    cube.ep[i] = j
+                    cube.eo[i] = 1
+                    break
+            else:
+                raise ValueError(f"Edge position {Edge(i).name} is not an edge")
+
+        return cube
+
+    @classmethod
+    def fromCube(cls, cube: RubiksCube) -> "CubieCube":
+        return cls.fromFacelets(cube.state)
+
+    @classmethod
+    def fromMove(cls, move: CubeMove) -> "CubieCube":
+        """
+        Returns the cubie cube reached by applying `move` to a solved cube.
+        """
+        cube = RubiksCube()
+        cube.state = [CubeLabel(i // 9) for i in range(cube.numFacelets)]
+        cube.applyMove(move)
+        return cls.fromFacelets(cube.state)
+
+    def toFacelets(self) -> list[CubeLabel]:
+        state = [CubeLabel(i // 9) for i in range(54)]
+
+        for i, facelets in enumerate(CornerFacelets):
+            cubie, ori = self.cp[i], self.co[i]
+            for k in range(3):
+                state[facelets[(k + ori) % 3]] = CornerColors[cubie][k]
+
+        for i, facelets in enumerate(EdgeFacelets):
+            cubie, ori = self.ep[i], self.eo[i]
+            for k in range(2):
+                state[facelets[(k + ori) % 2]] = EdgeColors[cubie][k]
+
+        return state
+
+    def toCube(self) -> RubiksCube:
+        cube = RubiksCube()
+        cube.state = self.toFacelets()
+        return cube
+
+    def multiply(self, other: "CubieCube") -> "CubieCube":
+        """
+        Returns the state reached by applying `other` to this state.
+        """
+        return CubieCube(
+            [self.cp[j] for j in other.cp],
+            [(self.co[j] + o) % 3 for j, o in zip(other.cp, other.co)],
+            [self.ep[j] for j in other.ep],
+            [(self.eo[j] + o) % 2 for j, o in zip(other.ep, other.eo)],
+        )
+
+    def inverse(self) -> "CubieCube":
+        cube = CubieCube()
+        for i, j in enumerate(self.cp):
+            cube.cp[j] = i
+            cube.co[j] = (3 - self.co[i]) % 3
+        for i, j in enumerate(self.ep):
+            cube.ep[j] = i
+            cube.eo[j] = self.eo[i]
+        return cube
+
+    def applyMove(self, move: CubeMove) -> "CubieCube":
+        return self.multiply(CubieMoves[move])
+
+    def cornerParity(self) -> int:
+        return _parity(self.cp)
+
+    def edgeParity(self) -> int:
+        return _parity(self.ep)
+
+    def isSolvable(self) -> bool:
+        """
+        Checks the permutation and orientation invariants of a reachable state.
+        """
+        return (
+            sorted(self.cp) == list(range(8))
+            and sorted(self.ep) == list(range(12))
+            and sum(self.co) % 3 == 0
+            and sum(self.eo) % 2 == 0
+            and self.cornerParity() == self.edgeParity()
+        )
+
+
+def _parity(permutation: list[int]) -> int:
+    inversions = 0
+    for i in range(len(permutation)):
+        for j in range(i + 1, len(permutation)):
+            if permutation[j] < permutation[i]:
+                inversions += 1
+    return inversions % 2
+
+
+# Cubie representation of every quarter and half turn, derived from the
+# facelet moves.
+CubieMoves: dict[CubeMove, CubieCube] = {
+    move: CubieCube.fromMove(move) for move in CubeMove
+}
@@ -0,0 +1,108 @@
+"""
+Compact encodings of cube states.
+
+A facelet state packs into 21 bytes, 3 bits per facelet in the order of
+RubiksCube.state with the label codes of CubeBatch (unlabeled facelets
+included), see CubeBatch.pack. A solvable state also has a dense integer rank in
+[0, NumStates) derived from its cubie coordinates.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import CubeBatch
+from .coord import (
+    N_CORNERS,
+    N_EDGES,
+    N_FLIP,
+    N_TWIST,
+    decodeOrientation,
+    decodePermutation,
+    encodeOrientation,
+    encodePermutation,
+)
+from .cube import CubeLabel, RubiksCube
+from .cubie import CubieCube
+
+# Number of reachable cube states, 43 252 003 274 489 856 000.
+NumStates = N_CORNERS * N_TWIST * (N_EDGES // 2) * N_FLIP
+
+_CodeLabels = [CubeLabel(i) for i in range(6)] + [CubeLabel.UNLABELD]
+_LabelCodes = {label: code for code, label in enumerate(_CodeLabels)}
+
+
+@dataclass(frozen=True, slots=True)
+class PackedCube:
+    """
+    An immutable, hashable 21 byte snapshot of a facelet state, suitable as a
+    dictionary key or set member. Hashing and comparison are those of bytes.
+    For very large collections keep the packed rows of CubeBatch.pack in a
+    NumPy array instead, which avoids the per-object overhead altogether.
+
+    attributes:
+    --  data: the packed facelet label codes
+    """
+
+    data: bytes
+
+    @classmethod
+    def fromCube(cls, cube: RubiksCube) -> "PackedCube":
+        value = 0
+        for label in reversed(cube.state):
+            value = (value << 3) | _LabelCodes[label]
+        return cls(value.to_bytes(CubeBatch.PackedSize, "little"))
+
+    @classmethod
+    def fromString(cls, facelets: str) -> "PackedCube":
+        return cls(CubeBatch.fromStrings([facelets]).pack()[0].tobytes())
+
+    def codes(self) -> list[int]:
+        value = int.from_bytes(self.data, "little")
+        return [(value >> (3 * i)) & 7 for i in range(CubeBatch.NumFacelets)]
+
+    def toCube(self) -> RubiksCube:
+        cube = RubiksCube()
+        cube.state = [_CodeLabels[code] for code in self.codes()]
+        return cube
+
+    def toString(self) -> str:
+        return bytes(CubeBatch.CodeToChar[self.codes()]).decode("ascii")
+
+
+def rankCubie(cube: CubieCube) -> int:
+    """
+    Returns the rank of a solvable cubie cube in [0, NumStates), the solved
+    cube having rank 0.
+
+    Edge permutations whose Lehmer codes differ only in the last bit differ by
+    a transposition, so halving the edge rank drops exactly the information
+    fixed by the parity constraint.
+    """
+    corners = int(encodePermutation(np.array([cube.cp]))[0])
+    twist = int(encodeOrientation(np.array([cube.co]), 3)[0])
+    edges = int(encodePermutation(np.array([cube.ep]))[0])
+    flip = int(encodeOrientation(np.array([cube.eo]), 2)[0])
+    return ((corners * N_TWIST + twist) * (N_EDGES // 2) + edges // 2) * N_FLIP + flip
+
+
+def unrankCubie(rank: int) -> CubieCube:
+    """
+    Inverse of rankCubie.
+    """
+    if not 0 <= rank < NumStates:
+        raise ValueError(f"Rank {rank} out of range")
+
+    rank, flip = divmod(rank, N_FLIP)
+    rank, halfEdges = divmod(rank, N_EDGES // 2)
+    corners, twist = divmod(rank, N_TWIST)
+
+    cube = CubieCube(
+        decodePermutation(np.array([corners]), 8)[0].tolist(),
+        decodeOrientation(np.array([twist]), 3, 8)[0].tolist(),
+        decodePermutation(np.array([2 * halfEdges]), 12)[0].tolist(),
+        decodeOrientation(np.array([flip]), 2, 12)[0].tolist(),
+    )
+    if cube.edgeParity() != cube.cornerParity():
+        cube.ep[-2], cube.ep[-1] = cube.ep[-1], cube.ep[-2]
+    return cube
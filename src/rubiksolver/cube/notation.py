@@ -0,0 +1,133 @@
+"""
+Compiler from extended cube notation to facelet permutations.
+
+Besides the face turns U R F D L B, the notation accepts
+--  wide turns: Uw or u (outer and middle layer)
+--  slice turns: M (like L), E (like D) and S (like F)
+--  whole cube rotations: x (like R), y (like U) and z (like F)
+--  repetition groups: (R U R' U')3, (R U)2', nested freely
+Every move may be followed by a count and a prime, e.g. R2, U', R2'.
+
+Layer turns are derived geometrically from the sticker coordinates of
+symmetry.FaceletPositions, so slices and rotations move centers too.
+Compiled moves and whole notation strings are memoized.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from .cube import CubeFace
+from .permutation import Permutation
+from .symmetry import FaceFrames, FaceletPositions
+
+# Face whose clockwise direction the move follows, and the layers it turns,
+# given by the value of the sticker coordinate along the face normal.
+OuterLayer = frozenset({2, 3})
+MiddleLayer = frozenset({0})
+AllLayers = frozenset({-3, -2, 0, 2, 3})
+
+MoveLayers: dict[str, tuple[CubeFace, frozenset[int]]] = {
+    "U": (CubeFace.UP, OuterLayer),
+    "R": (CubeFace.RIGHT, OuterLayer),
+    "F": (CubeFace.FRONT, OuterLayer),
+    "D": (CubeFace.DOWN, OuterLayer),
+    "L": (CubeFace.LEFT, OuterLayer),
+    "B": (CubeFace.BACK, OuterLayer),
+    "Uw": (CubeFace.UP, OuterLayer | MiddleLayer),
+    "Rw": (CubeFace.RIGHT, OuterLayer | MiddleLayer),
+    "Fw": (CubeFace.FRONT, OuterLayer | MiddleLayer),
+    "Dw": (CubeFace.DOWN, OuterLayer | MiddleLayer),
+    "Lw": (CubeFace.LEFT, OuterLayer | MiddleLayer),
+    "Bw": (CubeFace.BACK, OuterLayer | MiddleLayer),
+    "M": (CubeFace.LEFT, MiddleLayer),
+    "E": (CubeFace.DOWN, MiddleLayer),
+    "S": (CubeFace.FRONT, MiddleLayer),
+    "x": (CubeFace.RIGHT, AllLayers),
+    "y": (CubeFace.UP, AllLayers),
+    "z": (CubeFace.FRONT, AllLayers),
+}
+for _face in "URFDLB":
+    MoveLayers[_face.lower()] = MoveLayers[_face + "w"]
+
+_Token = re.compile(r"\s*(?:(\()|(\))|([URFDLB]w|[URFDLBurfdlbMESxyz]))(\d*)(')?")
+
+
+def clockwiseMatrix(normal: tuple[int, ...]) -> np.ndarray:
+    """
+    Returns the matrix of a clockwise quarter turn about `normal`, as seen when
+    looking at the face from outside the cube.
+    """
+    n = np.array(normal)
+    # Rodrigues' formula for an angle of -90 degrees
+    columns = [np.cross(v, n) + n * np.dot(n, v) for v in np.eye(3, dtype=np.int64)]
+    return np.array(columns).T
+
+
+@lru_cache(maxsize=None)
+def movePermutation(move: str) -> Permutation:
+    """
+    Returns the permutation of a single clockwise move such as "U", "Rw" or "M".
+    """
+    if move not in MoveLayers:
+        raise ValueError(f'Move "{move}" not recognized!')
+
+    face, layers = MoveLayers[move]
+    normal = FaceFrames[face][0]
+    matrix = clockwiseMatrix(normal)
+
+    index = {tuple(p): i for i, p in enumerate(FaceletPositions.tolist())}
+    depth = FaceletPositions @ np.array(normal)
+    # A sticker at p receives the sticker from inverse(matrix) @ p == p @ matrix
+    source = FaceletPositions @ matrix
+    return Permutation(
+        index[tuple(q)] if d in layers else i
+        for i, (q, d) in enumerate(zip(source.tolist(), depth.tolist()))
+    )
+
+
+@lru_cache(maxsize=None)
+def _powered(move: str, count: int, prime: bool) -> Permutation:
+    permutation = movePermutation(move) ** count
+    return permutation.inverse() if prime else permutation
+
+
+@lru_cache(maxsize=4096)
+def compileNotation(notation: str) -> Permutation:
+    """
+    Compiles a move sequence in extended notation into a single permutation.
+    Raises ValueError on unknown moves or unbalanced parentheses.
+    """
+    groups: list[Permutation] = [Permutation.identity()]
+    position = 0
+    notation = notation.rstrip()
+
+    while position < len(notation):
+        match = _Token.match(notation, position)
+        if match is None:
+            raise ValueError(f"Unexpected character at {position}: {notation!r}")
+        position = match.end()
+
+        opening, closing, move, count, prime = match.groups()
+        if count and (opening or not int(count)):
+            raise ValueError(f"Unexpected count at {match.start(4)}: {notation!r}")
+
+        if opening:
+            if prime:
+                raise ValueError(f"Unexpected prime at {match.start(5)}: {notation!r}")
+            groups.append(Permutation.identity())
+            continue
+
+        if closing:
+            if len(groups) == 1:
+                raise ValueError(f"Unbalanced parentheses: {notation!r}")
+            group = groups.pop() ** int(count or 1)
+            groups[-1] = groups[-1] * (group.inverse() if prime else group)
+            continue
+
+        groups[-1] = groups[-1] * _powered(move, int(count or 1), bool(prime))
+
+    if len(groups) != 1:
+        raise ValueError(f"Unbalanced parentheses: {notation!r}")
+    return groups[0]
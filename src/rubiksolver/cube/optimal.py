@@ -0,0 +1,488 @@
+"""
+Optimal (shortest solution) solver based on iterative deepening A*.
+
+The search is guided by the maximum of four pattern databases: the corners
+(permutation and twist) and three groups of four edges (positions and order)
+together with the orientation of all edges. A two-phase solution found first
+serves as an upper bound and as the answer when the time budget runs out.
+
+The first levels of the search tree can be split across worker processes,
+which load the pattern databases as shared read-only memory maps.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from os import path
+
+import numpy as np
+
+from .coord import (
+    D_EDGES,
+    N_FLIP,
+    N_MOVES,
+    N_TWIST,
+    SLICE_EDGES,
+    U_EDGES,
+    MoveNames,
+    MoveTables,
+    encodeEdgeGroup,
+    encodeOrientation,
+    encodePermutation,
+)
+from .cubie import CubieCube
+from .solver import (
+    TableSet,
+    TwoPhaseSolver,
+    _flat,
+    buildPruningTable,
+    parseFacelets,
+)
+
+OptimalTablesVersion = 1
+OptimalTableDirectory = path.join(
+    path.expanduser("~"),
+    ".local",
+    "share",
+    "rubiksolver",
+    f"optimal-v{OptimalTablesVersion}",
+)
+
+# Edge group coordinates of the solved cube.
+_Identity = np.arange(12)[None]
+SolvedUEdges = int(encodeEdgeGroup(_Identity, U_EDGES)[0])
+SolvedDEdges = int(encodeEdgeGroup(_Identity, D_EDGES)[0])
+SolvedSliceSorted = int(encodeEdgeGroup(_Identity, SLICE_EDGES)[0])
+
+
+def optimalCoordinates(cube: CubieCube) -> tuple[int, ...]:
+    """
+    Returns the (corners, twist, flip, sliceSorted, uEdges, dEdges) coordinates
+    searched by the optimal solver.
+    """
+    ep = np.array([cube.ep], dtype=np.intp)
+    return (
+        int(encodePermutation(np.array([cube.cp], dtype=np.intp))[0]),
+        int(encodeOrientation(np.array([cube.co], dtype=np.int8), 3)[0]),
+        int(encodeOrientation(np.array([cube.eo], dtype=np.int8), 2)[0]),
+        int(encodeEdgeGroup(ep, SLICE_EDGES)[0]),
+        int(encodeEdgeGroup(ep, U_EDGES)[0]),
+        int(encodeEdgeGroup(ep, D_EDGES)[0]),
+    )
+
+
+@dataclass
+class OptimalTables(TableSet):
+    """
+    The move tables and pattern databases of the optimal solver. The corner
+    database has 8! * 3^7 entries, each edge database 11880 * 2^11.
+
+    attributes:
+    --  corners, twist, flip, sliceSorted, uEdges, dEdges: move tables, see
+        MoveTables
+    --  cornersTwistPrune: (corners, twist) pattern database
+    --  sliceFlipPrune: (UD-slice edges, flip) pattern database
+    --  uEdgesFlipPrune: (U edges, flip) pattern database
+    --  dEdgesFlipPrune: (D edges, flip) pattern database
+    """
+
+    corners: np.ndarray
+    twist: np.ndarray
+    flip: np.ndarray
+    sliceSorted: np.ndarray
+    uEdges: np.ndarray
+    dEdges: np.ndarray
+    cornersTwistPrune: np.ndarray
+    sliceFlipPrune: np.ndarray
+    uEdgesFlipPrune: np.ndarray
+    dEdgesFlipPrune: np.ndarray
+
+    Version = OptimalTablesVersion
+    Directory = OptimalTableDirectory
+
+    @classmethod
+    def build(cls, maxDepth: int | None = None) -> "OptimalTables":
+        """
+        Generates the tables, which takes about a minute, mostly for the corner
+        database. Limiting the databases to `maxDepth` makes them much faster
+        to build but weaker.
+        """
+        moves = MoveTables.build()
+        allMoves = list(range(N_MOVES))
+
+        return cls(
+            moves.corners,
+            moves.twist,
+            moves.flip,
+            moves.sliceSorted,
+            moves.uEdges,
+            moves.dEdges,
+            buildPruningTable(moves.corners, moves.twist, allMoves, maxDepth=maxDepth),
+            *(
+                buildPruningTable(
+                    group, moves.flip, allMoves, (solved, 0), maxDepth=maxDepth
+                )
+                for group, solved in (
+                    (moves.sliceSorted, SolvedSliceSorted),
+                    (moves.uEdges, SolvedUEdges),
+                    (moves.dEdges, SolvedDEdges),
+                )
+            ),
+        )
+
+
+@dataclass
+class OptimalResult:
+    """
+    The outcome of an optimal search.
+
+    attributes:
+    --  solution: the shortest move sequence found
+    --  optimal: whether the solution is proven to be the shortest one. False if
+        the time budget ran out first
+    --  lowerBound: length below which no solution exists
+    --  nodes: number of search nodes expanded
+    --  elapsed: seconds spent
+    """
+
+    solution: str
+    optimal: bool
+    lowerBound: int
+    nodes: int
+    elapsed: float
+
+    @property
+    def length(self) -> int:
+        return len(self.solution.split())
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class OptimalSolver:
+    """
+    Finds shortest solutions within a wall clock budget.
+
+    With `workers` > 1 the search tree below the first `splitDepth` moves is
+    distributed over a process pool, whose workers load the tables saved in
+    `directory`; None uses all cores. Given `tables` must then have been loaded
+    from disk, and the workers load them from the directory they came from
+    instead. Call shutdown() or use as a context manager to stop them.
+    """
+
+    def __init__(
+        self,
+        tables: OptimalTables | None = None,
+        twoPhase: TwoPhaseSolver | None = None,
+        timeout: float = 60.0,
+        workers: int | None = 1,
+        splitDepth: int = 2,
+        directory: str = OptimalTableDirectory,
+        context: str | None = None,
+    ) -> None:
+        self.tables = (
+            tables if tables is not None else OptimalTables.loadOrBuild(directory)
+        )
+        self._twoPhase = twoPhase
+        self.timeout = timeout
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.splitDepth = splitDepth
+        if tables is not None and self.workers > 1:
+            # The workers must search the very tables passed in
+            if not isinstance(tables.corners, np.memmap):
+                raise ValueError("Parallel search needs tables loaded from a directory")
+            directory = path.dirname(tables.corners.filename)
+        self.directory = directory
+        self.context = context
+
+        self._corners = _flat(self.tables.corners)
+        self._twist = _flat(self.tables.twist)
+        self._flip = _flat(self.tables.flip)
+        self._sliceSorted = _flat(self.tables.sliceSorted)
+        self._uEdges = _flat(self.tables.uEdges)
+        self._dEdges = _flat(self.tables.dEdges)
+        self._cornersTwistPrune = _flat(self.tables.cornersTwistPrune)
+        self._sliceFlipPrune = _flat(self.tables.sliceFlipPrune)
+        self._uEdgesFlipPrune = _flat(self.tables.uEdgesFlipPrune)
+        self._dEdgesFlipPrune = _flat(self.tables.dEdgesFlipPrune)
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._poolStop = None
+        # Set in worker processes when another subtree found a solution
+        self._stop = None
+
+    def __enter__(self) -> "OptimalSolver":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def __call__(self, facelets: str) -> str:
+        return self.solve(facelets)
+
+    @property
+    def twoPhase(self) -> TwoPhaseSolver:
+        if self._twoPhase is None:
+            self._twoPhase = TwoPhaseSolver()
+        return self._twoPhase
+
+    def solve(self, facelets: str, timeout: float | None = None) -> str:
+        """
+        Returns the shortest solution found within `timeout` seconds.
+        """
+        return self.search(facelets, timeout).solution
+
+    def search(self, facelets: str, timeout: float | None = None) -> OptimalResult:
+        """
+        Runs the optimal search for at most `timeout` seconds. Raises ValueError
+        for an invalid cube and TimeoutError if not even the two-phase solver
+        found a solution in time.
+        """
+        start = time.time()
+        # Wall clock deadline, so that it can be shared with worker processes
+        deadline = start + (self.timeout if timeout is None else timeout)
+        cube = parseFacelets(facelets)
+        coordinates = optimalCoordinates(cube)
+        self._nodes = 0
+
+        best: list[int] | None = None
+        try:
+            moves = self.twoPhase.solveMoves(
+                cube,
+                self.twoPhase.maxLength,
+                min(self.twoPhase.timeout, max(deadline - time.time(), 0.0)),
+            )
+            best = list(moves)
+        except TimeoutError:
+            pass
+
+        depth = self._heuristic(coordinates)
+        optimal = False
+        try:
+            while best is None or depth < len(best):
+                found = self._searchDepth(coordinates, depth, deadline)
+                if found is not None:
+                    best = found
+                    break
+                depth += 1
+            optimal = True
+        except TimeoutError:
+            if best is None:
+                raise
+
+        return OptimalResult(
+            " ".join(MoveNames[move] for move in best),
+            optimal,
+            len(best) if optimal else depth,
+            self._nodes,
+            time.time() - start,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+    def _searchDepth(
+        self, coordinates: tuple[int, ...], depth: int, deadline: float
+    ) -> list[int] | None:
+        if self.workers == 1 or depth <= self.splitDepth:
+            return self._searchFrom(coordinates, [], depth, deadline)
+        return self._searchParallel(coordinates, depth, deadline)
+
+    def _searchFrom(
+        self,
+        coordinates: tuple[int, ...],
+        prefix: list[int],
+        depth: int,
+        deadline: float,
+    ) -> list[int] | None:
+        """
+        Searches for solutions of exactly `depth` moves starting with `prefix`.
+        """
+        self._deadline = deadline
+        self._path = list(prefix)
+        for move in prefix:
+            coordinates = self._move(coordinates, move)
+        if self._heuristic(coordinates) > depth - len(prefix):
+            return None
+        if self._search(*coordinates, depth - len(prefix)):
+            return self._path
+        return None
+
+    def _searchParallel(
+        self, coordinates: tuple[int, ...], depth: int, deadline: float
+    ) -> list[int] | None:
+        if self._executor is None:
+            context = multiprocessing.get_context(self.context)
+            self._poolStop = context.Event()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_initWorker,
+                initargs=(self.directory, self._poolStop),
+            )
+
+        self._poolStop.clear()
+        pending = {
+            self._executor.submit(_searchPrefix, coordinates, prefix, depth, deadline)
+            for prefix in self._prefixes(coordinates, self.splitDepth, depth)
+        }
+
+        found = None
+        timedOut = False
+        while pending and found is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                solution, nodes, expired = future.result()
+                self._nodes += nodes
+                timedOut |= expired
+                if solution is not None:
+                    found = solution
+
+        if pending:
+            # Stop the remaining subtrees before the event is reused
+            self._poolStop.set()
+            for future in pending:
+                future.cancel()
+            wait(pending)
+
+        if found is None and timedOut:
+            raise TimeoutError("The optimal search timed out")
+        return found
+
+    def _prefixes(
+        self, coordinates: tuple[int, ...], length: int, depth: int
+    ) -> list[list[int]]:
+        """
+        Returns the move sequences of `length` moves that can start a solution
+        of `depth` moves, ordered by the pruning bound of their end state.
+        """
+        prefixes = [([], coordinates)]
+        for level in range(length):
+            extended = []
+            for prefix, state in prefixes:
+                lastFace = prefix[-1] // 3 if prefix else -1
+                for move in range(N_MOVES):
+                    face = move // 3
+                    if face == lastFace or lastFace - face == 3:
+                        continue
+                    newState = self._move(state, move)
+                    if self._heuristic(newState) <= depth - level - 1:
+                        extended.append((prefix + [move], newState))
+            prefixes = extended
+
+        prefixes.sort(key=lambda item: self._heuristic(item[1]))
+        return [prefix for prefix, _ in prefixes]
+
+    def _move(self, coordinates: tuple[int, ...], move: int) -> tuple[int, ...]:
+        corners, twist, flip, sliceSorted, uEdges, dEdges = coordinates
+        return (
+            self._corners[corners * N_MOVES + move],
+            self._twist[twist * N_MOVES + move],
+            self._flip[flip * N_MOVES + move],
+            self._sliceSorted[sliceSorted * N_MOVES + move],
+            self._uEdges[uEdges * N_MOVES + move],
+            self._dEdges[dEdges * N_MOVES + move],
+        )
+
+    def _heuristic(self, coordinates: tuple[int, ...]) -> int:
+        corners, twist, flip, sliceSorted, uEdges, dEdges = coordinates
+        return max(
+            self._cornersTwistPrune[corners * N_TWIST + twist],
+            self._sliceFlipPrune[sliceSorted * N_FLIP + flip],
+            self._uEdgesFlipPrune[uEdges * N_FLIP + flip],
+            self._dEdgesFlipPrune[dEdges * N_FLIP + flip],
+        )
+
+    def _tick(self) -> None:
+        self._nodes += 1
+        if self._nodes & 1023 == 0:
+            if time.time() > self._deadline:
+                raise TimeoutError("The optimal search timed out")
+            if self._stop is not None and self._stop.is_set():
+                raise _Cancelled
+
+    def _search(
+        self,
+        corners: int,
+        twist: int,
+        flip: int,
+        sliceSorted: int,
+        uEdges: int,
+        dEdges: int,
+        togo: int,
+    ) -> bool:
+        if togo == 0:
+            # Every pattern database is zero only at the solved state.
+            return True
+
+        self._tick()
+        path = self._path
+        lastFace = path[-1] // 3 if path else -1
+
+        for move in range(N_MOVES):
+            face = move // 3
+            if face == lastFace or lastFace - face == 3:
+                continue
+
+            newCorners = self._corners[corners * N_MOVES + move]
+            newTwist = self._twist[twist * N_MOVES + move]
+            if self._cornersTwistPrune[newCorners * N_TWIST + newTwist] >= togo:
+                continue
+
+            newFlip = self._flip[flip * N_MOVES + move]
+            newSliceSorted = self._sliceSorted[sliceSorted * N_MOVES + move]
+            if self._sliceFlipPrune[newSliceSorted * N_FLIP + newFlip] >= togo:
+                continue
+            newUEdges = self._uEdges[uEdges * N_MOVES + move]
+            if self._uEdgesFlipPrune[newUEdges * N_FLIP + newFlip] >= togo:
+                continue
+            newDEdges = self._dEdges[dEdges * N_MOVES + move]
+            if self._dEdgesFlipPrune[newDEdges * N_FLIP + newFlip] >= togo:
+                continue
+
+            path.append(move)
+            if self._search(
+                newCorners,
+                newTwist,
+                newFlip,
+                newSliceSorted,
+                newUEdges,
+                newDEdges,
+                togo - 1,
+            ):
+                return True
+            path.pop()
+
+        return False
+
+
+_workerSolver: OptimalSolver | None = None
+
+
+def _initWorker(directory: str, stop) -> None:
+    global _workerSolver
+    _workerSolver = OptimalSolver(OptimalTables.load(directory))
+    _workerSolver._stop = stop
+
+
+def _searchPrefix(
+    coordinates: tuple[int, ...], prefix: list[int], depth: int, deadline: float
+) -> tuple[list[int] | None, int, bool]:
+    """
+    Searches one subtree in a worker, returning the solution (if any), the
+    number of nodes expanded and whether the deadline expired.
+    """
+    solver = _workerSolver
+    solver._nodes = 0
+    try:
+        solution = solver._searchFrom(coordinates, prefix, depth, deadline)
+    except TimeoutError:
+        return None, solver._nodes, True
+    except _Cancelled:
+        return None, solver._nodes, False
+    return solution, solver._nodes, False
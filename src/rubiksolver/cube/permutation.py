@@ -0,0 +1,124 @@
+"""
+Facelet permutations: whole move sequences compiled into a single gather.
+"""
+
+from collections.abc import Iterable, Sequence
+from math import lcm
+from operator import itemgetter
+
+import numpy as np
+
+from .batch import CubeBatch
+from .cube import CubeLabel, CubeMove, RubiksCube
+
+
+class Permutation:
+    """
+    A permutation of the 54 facelets in gather form: applying it to a state
+    yields new[i] = old[indices[i]], exactly like RubiksCube.MovePermutation.
+
+    `p * q` is the permutation of applying p and then q, so the permutation of a
+    move sequence is the product of its moves from left to right.
+    """
+
+    __slots__ = ("indices", "_gather")
+
+    def __init__(self, indices: Sequence[int]) -> None:
+        indices = tuple(indices)
+        if sorted(indices) != list(range(len(indices))):
+            raise ValueError("Indices do not form a permutation")
+        self.indices = indices
+        self._gather = itemgetter(*indices)
+
+    @classmethod
+    def identity(cls, size: int = 54) -> "Permutation":
+        return cls(range(size))
+
+    @classmethod
+    def fromMove(cls, move: CubeMove) -> "Permutation":
+        return cls(RubiksCube.MovePermutation[move])
+
+    @classmethod
+    def fromMoves(cls, moves: Iterable[CubeMove]) -> "Permutation":
+        indices = tuple(range(54))
+        for move in moves:
+            indices = RubiksCube.MoveGather[move](indices)
+        return cls(indices)
+
+    @classmethod
+    def fromNotation(cls, notation: str) -> "Permutation":
+        """
+        Compiles a space separated sequence of face turns, e.g. "R U R' U'".
+        """
+        return cls.fromMoves(RubiksCube.ParseMoves(notation))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Permutation) and self.indices == other.indices
+
+    def __hash__(self) -> int:
+        return hash(self.indices)
+
+    def __repr__(self) -> str:
+        return f"Permutation(order={self.order()}, moved={self.support()})"
+
+    def __mul__(self, other: "Permutation") -> "Permutation":
+        return Permutation(other._gather(self.indices))
+
+    def __pow__(self, exponent: int) -> "Permutation":
+        base = self if exponent >= 0 else self.inverse()
+        exponent = abs(exponent)
+        result = Permutation.identity(len(self))
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            base = base * base
+            exponent >>= 1
+        return result
+
+    def inverse(self) -> "Permutation":
+        indices = [0] * len(self.indices)
+        for i, j in enumerate(self.indices):
+            indices[j] = i
+        return Permutation(indices)
+
+    def cycles(self) -> list[tuple[int, ...]]:
+        """
+        Returns the cycles of length two or more.
+        """
+        seen = [False] * len(self.indices)
+        cycles = []
+        for start in range(len(self.indices)):
+            cycle = []
+            i = start
+            while not seen[i]:
+                seen[i] = True
+                cycle.append(i)
+                i = self.indices[i]
+            if len(cycle) > 1:
+                cycles.append(tuple(cycle))
+        return cycles
+
+    def order(self) -> int:
+        """
+        Returns how many times the permutation must be applied to get back
+        the starting state, e.g. 6 for R U R' U'.
+        """
+        return lcm(*(len(cycle) for cycle in self.cycles()))
+
+    def support(self) -> int:
+        """
+        Returns the number of facelets moved.
+        """
+        return sum(i != j for i, j in enumerate(self.indices))
+
+    def applyState(self, state: Sequence[CubeLabel]) -> list[CubeLabel]:
+        return list(self._gather(state))
+
+    def apply(self, cube: RubiksCube) -> None:
+        cube.state[:] = self._gather(cube.state)
+
+    def applyBatch(self, batch: CubeBatch) -> None:
+        batch.states = batch.states[:, np.array(self.indices, dtype=np.intp)]
@@ -0,0 +1,316 @@
+"""
+Solving many cube states at once on a pool of worker processes.
+
+Every worker loads the solver tables once, as read-only memory maps, when it
+starts, so the pages are shared between processes and a solve never pays for
+table loading.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+
+from .solver import SolverTables, TableDirectory, TwoPhaseSolver
+from .variants import SolveVariant, SolveVariants
+
+
+@dataclass
+class SolveResult:
+    """
+    The outcome of solving one state of a batch.
+
+    attributes:
+    --  index: position of the state in the submitted batch
+    --  facelets: the facelet string that was solved
+    --  solution: the move sequence, or None if the solve failed
+    --  error: the reason the solve failed, or None on success
+    --  latency: seconds spent solving inside the worker
+    """
+
+    index: int
+    facelets: str
+    solution: str | None
+    error: str | None
+    latency: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_workerSolver: TwoPhaseSolver | None = None
+# The highest index cancelled through SolverPool.cancel, shared with the parent
+_cancelledIndex = None
+
+
+def _initWorker(directory: str, maxLength: int, timeout: float, cancelled) -> None:
+    global _workerSolver, _cancelledIndex
+    _workerSolver = TwoPhaseSolver(SolverTables.load(directory), maxLength, timeout)
+    _cancelledIndex = cancelled
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _solveOne(
+    index: int,
+    facelets: str,
+    maxLength: int | None = None,
+    timeout: float | None = None,
+) -> SolveResult:
+    start = time.perf_counter()
+    try:
+        solution = _workerSolver.solve(
+            facelets, maxLength, timeout, lambda: index <= _cancelledIndex.value
+        )
+    except (ValueError, TimeoutError) as error:
+        return SolveResult(
+            index, facelets, None, str(error), time.perf_counter() - start
+        )
+    return SolveResult(index, facelets, solution, None, time.perf_counter() - start)
+
+
+def _streamSolutions(
+    index: int,
+    facelets: str,
+    timeout: float | None,
+    improveTime: float | None,
+    results,
+) -> None:
+    """
+    Puts a SolveResult on the `results` queue for every solution found by an
+    anytime solve, or one with the error if none is found, then None.
+    """
+    start = time.perf_counter()
+
+    def found(solution: str) -> None:
+        latency = time.perf_counter() - start
+        results.put(SolveResult(index, facelets, solution, None, latency))
+
+    try:
+        _workerSolver.solveAnytime(
+            facelets,
+            found,
+            timeout,
+            improveTime,
+            lambda: index <= _cancelledIndex.value,
+        )
+    except (ValueError, TimeoutError) as error:
+        latency = time.perf_counter() - start
+        results.put(SolveResult(index, facelets, None, str(error), latency))
+    finally:
+        results.put(None)
+
+
+class SolverPool:
+    """
+    A ProcessPoolExecutor whose workers each hold a TwoPhaseSolver.
+
+    The tables are generated in the calling process if they are missing, so
+    that workers only ever load them. Use as a context manager or call
+    shutdown() when done. Processes that run other threads (e.g. a Qt
+    application) should pass context="spawn" instead of relying on fork.
+    """
+
+    PollInterval = 0.05
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        maxLength: int = 22,
+        timeout: float = 10.0,
+        directory: str = TableDirectory,
+        context: str | None = None,
+    ) -> None:
+        SolverTables.loadOrBuild(directory)
+
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self._context = multiprocessing.get_context(context)
+        self._cancelled = self._context.Value("q", -1)
+        self._queues = None
+        self._managerLock = threading.Lock()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_initWorker,
+            initargs=(directory, maxLength, timeout, self._cancelled),
+        )
+
+    def __enter__(self) -> "SolverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def warmUp(self) -> None:
+        """
+        Starts every worker process and waits until they loaded the tables, so
+        that the first solves do not pay for it.
+        """
+        for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def submit(
+        self,
+        facelets: str,
+        index: int = 0,
+        maxLength: int | None = None,
+        timeout: float | None = None,
+    ) -> Future:
+        """
+        Schedules a single solve, returning a future of its SolveResult.
+        `maxLength` and `timeout` override the pool defaults for this solve.
+        """
+        return self._executor.submit(_solveOne, index, facelets, maxLength, timeout)
+
+    def solutions(
+        self,
+        facelets: str,
+        index: int = 0,
+        timeout: float | None = None,
+        improveTime: float | None = None,
+    ) -> Iterator[SolveResult]:
+        """
+        Anytime solving on a worker: yields a SolveResult as soon as the first
+        solution is found, then one for every shorter solution found by the
+        same search (see TwoPhaseSolver.solveAnytime). If no solution is found
+        a single result holding the error is yielded. Cancelling `index`
+        ends the stream early.
+        """
+        results = self._manager().Queue()
+        future = self._executor.submit(
+            _streamSolutions, index, facelets, timeout, improveTime, results
+        )
+        while True:
+            try:
+                result = results.get(timeout=self.PollInterval)
+            except queue.Empty:
+                if future.done():
+                    # The worker died before finishing the stream
+                    future.result()
+                    return
+                continue
+            if result is None:
+                return
+            yield result
+
+    def solveMany(
+        self, states: Iterable[str], ordered: bool = True
+    ) -> list[SolveResult] | Iterator[SolveResult]:
+        """
+        Solves every facelet string of `states`. Returns the results in input
+        order, or, if `ordered` is False, an iterator yielding them as soon as
+        they complete. Invalid or unsolvable states are reported through
+        SolveResult.error instead of raising.
+        """
+        states = list(states)
+        if ordered:
+            chunksize = max(1, len(states) // (self.workers * 8))
+            return list(
+                self._executor.map(
+                    _solveOne, range(len(states)), states, chunksize=chunksize
+                )
+            )
+
+        futures = [self.submit(facelets, i) for i, facelets in enumerate(states)]
+        return (future.result() for future in as_completed(futures))
+
+    def solveShortest(
+        self,
+        facelets: str,
+        timeout: float | None = None,
+        variants: list[SolveVariant] | None = None,
+    ) -> SolveResult:
+        """
+        Solves the `variants` of `facelets` concurrently and returns the
+        shortest solution found within `timeout` seconds, mapped back to
+        `facelets`.
+
+        By default as many of SolveVariants (three orientations of the state
+        and of its inverse) are solved as the pool has workers. Extra variants
+        would queue behind the others and multiply the latency, each saving
+        less than a move on average.
+        """
+        if variants is None:
+            variants = SolveVariants[: self.workers]
+        start = time.perf_counter()
+        try:
+            states = [variant.apply(facelets) for variant in variants]
+        except ValueError as error:
+            return SolveResult(0, facelets, None, str(error), 0.0)
+
+        futures = {
+            self.submit(state, i, timeout=timeout): variant
+            for i, (state, variant) in enumerate(zip(states, variants))
+        }
+        done, pending = wait(futures, timeout=timeout)
+        for future in pending:
+            future.cancel()
+
+        solutions: list[str] = []
+        errors: list[str] = []
+        for future in done:
+            result = future.result()
+            if result.ok:
+                solutions.append(futures[future].mapSolution(result.solution))
+            else:
+                errors.append(result.error)
+
+        latency = time.perf_counter() - start
+        if not solutions:
+            error = errors[0] if errors else "Solve timed out"
+            return SolveResult(0, facelets, None, error, latency)
+
+        shortest = min(solutions, key=lambda solution: len(solution.split()))
+        return SolveResult(0, facelets, shortest, None, latency)
+
+    def cancel(self, index: int) -> None:
+        """
+        Cancels every solve submitted with an index up to `index`, including
+        solves a worker is already running, which stop within milliseconds
+        and report an error. Meant for callers numbering their solves with
+        increasing indices.
+        """
+        with self._cancelled.get_lock():
+            self._cancelled.value = max(self._cancelled.value, index)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if not wait:
+            # Running solves would otherwise keep their workers until timeout
+            self.cancel(2**63 - 1)
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        with self._managerLock:
+            if self._queues is not None:
+                self._queues.shutdown()
+                self._queues = None
+
+    def _manager(self):
+        """
+        The manager process serving the queues that stream solutions back,
+        started on first use.
+        """
+        with self._managerLock:
+            if self._queues is None:
+                self._queues = self._context.Manager()
+            return self._queues
+
+
+def solveMany(
+    states: Iterable[str],
+    workers: int | None = None,
+    maxLength: int = 22,
+    timeout: float = 10.0,
+    directory: str = TableDirectory,
+) -> list[SolveResult]:
+    """
+    Solves a batch of facelet strings on a temporary SolverPool of `workers`
+    processes (all cores by default) and returns the results in input order.
+    """
+    with SolverPool(workers, maxLength, timeout, directory) as pool:
+        return pool.solveMany(states)
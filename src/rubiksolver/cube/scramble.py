@@ -0,0 +1,193 @@
+"""
+Seedable generators of scrambled cube states, vectorized over whole batches.
+
+randomStates draws states uniformly from the 43 quintillion solvable ones by
+drawing random cubie permutations and orientations and fixing up the
+orientation sums and the permutation parity. randomMoveScrambles applies
+random move sequences instead, as a human scrambler would.
+"""
+
+import argparse
+import time
+from collections.abc import Iterator
+
+import numpy as np
+
+from .batch import CubeBatch
+from .coord import CubeMoveIndex
+from .cube import CubeLabel, RubiksCube
+from .cubie import CornerColors, CornerFacelets, EdgeColors, EdgeFacelets
+
+# Label code of the facelet j of a corner (edge) position holding cubie c with
+# orientation o, i.e. CornerFaceletCodes[c, o, j].
+CornerFaceletCodes: np.ndarray = np.array(
+    [
+        [[colors[(j - ori) % 3].value for j in range(3)] for ori in range(3)]
+        for colors in CornerColors
+    ],
+    dtype=np.uint8,
+)
+EdgeFaceletCodes: np.ndarray = np.array(
+    [
+        [[colors[(j - ori) % 2].value for j in range(2)] for ori in range(2)]
+        for colors in EdgeColors
+    ],
+    dtype=np.uint8,
+)
+
+# CubeMove value of every move index of coord.MoveNames.
+_MoveValues: np.ndarray = np.zeros(len(CubeMoveIndex), dtype=np.intp)
+for _move, _index in CubeMoveIndex.items():
+    _MoveValues[_index] = _move.value
+
+
+def _randomPermutations(rng: np.random.Generator, count: int, n: int) -> np.ndarray:
+    return np.argsort(rng.random((count, n)), axis=1)
+
+
+def _parity(permutations: np.ndarray) -> np.ndarray:
+    n = permutations.shape[1]
+    inversions = np.zeros(permutations.shape[0], dtype=np.int64)
+    for i in range(n - 1):
+        inversions += (permutations[:, i + 1 :] < permutations[:, i : i + 1]).sum(
+            axis=1
+        )
+    return inversions & 1
+
+
+def _randomOrientations(
+    rng: np.random.Generator, count: int, n: int, base: int
+) -> np.ndarray:
+    orientations = rng.integers(0, base, size=(count, n), dtype=np.int64)
+    orientations[:, -1] = -orientations[:, :-1].sum(axis=1) % base
+    return orientations
+
+
+def cubieToCodes(
+    cp: np.ndarray, co: np.ndarray, ep: np.ndarray, eo: np.ndarray
+) -> np.ndarray:
+    """
+    Converts (N, 8) and (N, 12) cubie arrays into an (N, 54) array of label
+    codes as stored in CubeBatch.states.
+    """
+    states = CubeBatch.solved(cp.shape[0]).states
+    for i, facelets in enumerate(CornerFacelets):
+        states[:, facelets] = CornerFaceletCodes[cp[:, i], co[:, i]]
+    for i, facelets in enumerate(EdgeFacelets):
+        states[:, facelets] = EdgeFaceletCodes[ep[:, i], eo[:, i]]
+    return states
+
+
+def randomStates(
+    count: int, seed: int | np.random.Generator | None = None
+) -> CubeBatch:
+    """
+    Returns `count` uniformly random solvable cube states.
+    """
+    rng = np.random.default_rng(seed)
+
+    cp = _randomPermutations(rng, count, 8)
+    ep = _randomPermutations(rng, count, 12)
+    co = _randomOrientations(rng, count, 8, 3)
+    eo = _randomOrientations(rng, count, 12, 2)
+
+    # Swapping two edges makes the edge parity match the corner parity
+    odd = _parity(cp) != _parity(ep)
+    ep[odd, 10], ep[odd, 11] = ep[odd, 11], ep[odd, 10]
+
+    return CubeBatch(cubieToCodes(cp, co, ep, eo))
+
+
+def randomMoves(
+    count: int, length: int, seed: int | np.random.Generator | None = None
+) -> np.ndarray:
+    """
+    Returns a (count, length) array of CubeMove values in which no face is
+    turned twice in a row.
+    """
+    rng = np.random.default_rng(seed)
+    faces = np.empty((count, length), dtype=np.intp)
+    if length:
+        faces[:, 0] = rng.integers(0, 6, size=count)
+    for i in range(1, length):
+        faces[:, i] = (faces[:, i - 1] + rng.integers(1, 6, size=count)) % 6
+    powers = rng.integers(0, 3, size=(count, length))
+    return _MoveValues[3 * faces + powers]
+
+
+def randomMoveScrambles(
+    count: int, length: int, seed: int | np.random.Generator | None = None
+) -> tuple[np.ndarray, CubeBatch]:
+    """
+    Applies `count` random move sequences of `length` moves to solved cubes,
+    returning the moves and the resulting states.
+    """
+    moves = randomMoves(count, length, seed)
+    batch = CubeBatch.solved(count)
+    for i in range(length):
+        batch.applyMove(moves[:, i])
+    return moves, batch
+
+
+def randomCube(seed: int | np.random.Generator | None = None) -> RubiksCube:
+    cube = RubiksCube()
+    cube.state = [CubeLabel(code) for code in randomStates(1, seed).states[0]]
+    return cube
+
+
+def generateCorpus(
+    count: int,
+    seed: int | None = None,
+    length: int | None = None,
+    chunkSize: int = 100_000,
+) -> Iterator[list[str]]:
+    """
+    Yields `count` facelet strings in chunks of at most `chunkSize`: uniformly
+    random states or, if `length` is given, random move scrambles of that
+    length. The corpus only depends on `seed` and `chunkSize`.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, count, chunkSize):
+        size = min(chunkSize, count - start)
+        if length is None:
+            batch = randomStates(size, rng)
+        else:
+            _, batch = randomMoveScrambles(size, length, rng)
+        yield batch.toStrings()
+
+
+def writeCorpus(
+    filename: str,
+    count: int,
+    seed: int | None = None,
+    length: int | None = None,
+    chunkSize: int = 100_000,
+) -> None:
+    """
+    Writes a corpus of facelet strings to `filename`, one per line.
+    """
+    with open(filename, "w") as file:
+        for chunk in generateCorpus(count, seed, length, chunkSize):
+            file.write("\n".join(chunk) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write scrambled cube states as facelet strings, one per line."
+    )
+    parser.add_argument("output", help="File to write the facelet strings to.")
+    parser.add_argument("-n", "--count", type=int, default=1_000_000)
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    parser.add_argument(
+        "-l",
+        "--length",
+        type=int,
+        default=None,
+        help="Scramble with random moves of this length instead of random states.",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    writeCorpus(args.output, args.count, args.seed, args.length)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.count} states to {args.output} in {elapsed:.1f}s")
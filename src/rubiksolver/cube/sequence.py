@@ -0,0 +1,63 @@
+"""
+Simplification of move sequences.
+
+Consecutive turns of the same face are merged (U U -> U2, U U2 -> U') or
+cancelled (U U' -> nothing). Turns of opposite faces commute, so a turn is also
+merged across a single turn of the opposite face (U D U -> U2 D).
+"""
+
+from collections.abc import Iterable
+
+from .cube import CubeFace, CubeMove, MoveTimeline, RubiksCube
+
+OppositeFace: dict[CubeFace, CubeFace] = {
+    CubeFace.UP: CubeFace.DOWN,
+    CubeFace.DOWN: CubeFace.UP,
+    CubeFace.RIGHT: CubeFace.LEFT,
+    CubeFace.LEFT: CubeFace.RIGHT,
+    CubeFace.FRONT: CubeFace.BACK,
+    CubeFace.BACK: CubeFace.FRONT,
+}
+
+_FaceTurnsMove: dict[tuple[CubeFace, int], CubeMove] = {
+    faceTurns: move for move, faceTurns in RubiksCube.MoveTurns.items()
+}
+
+
+def simplifyMoves(moves: Iterable[CubeMove]) -> list[CubeMove]:
+    """
+    Returns an equivalent sequence in which no two turns of the same face are
+    adjacent or separated only by turns of the opposite face.
+
+    The output is kept as a stack that satisfies this invariant, so every
+    incoming move can only ever merge with the top move or the one below it.
+    """
+    faces: list[CubeFace] = []
+    turns: list[int] = []
+
+    for move in moves:
+        face, quarter = RubiksCube.MoveTurns[move]
+
+        i = len(faces) - 1
+        if i >= 0 and faces[i] == OppositeFace[face]:
+            i -= 1
+
+        if i >= 0 and faces[i] == face:
+            merged = (turns[i] + quarter) % 4
+            if merged:
+                turns[i] = merged
+            else:
+                del faces[i]
+                del turns[i]
+        else:
+            faces.append(face)
+            turns.append(quarter)
+
+    return [_FaceTurnsMove[faceTurns] for faceTurns in zip(faces, turns)]
+
+
+def invertMoves(moves: Iterable[CubeMove]) -> list[CubeMove]:
+    """
+    Returns the sequence undoing `moves`.
+    """
+    return [MoveTimeline.MoveReverse[move] for move in reversed(list(moves))]
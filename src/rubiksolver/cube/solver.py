@@ -0,0 +1,531 @@
+"""
+In-process implementation of Kociemba's two-phase algorithm.
+
+Phase 1 brings the cube into the subgroup G1 = <U, D, R2, F2, L2, B2> and
+phase 2 solves it using only moves of G1. The move and pruning tables are
+generated once, stored in a versioned directory of .npy files and loaded as
+read-only memory maps, so that every process shares the same pages.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from os import path
+from typing import ClassVar
+
+import numpy as np
+
+from .coord import (
+    D_EDGES,
+    N_MOVES,
+    N_SLICE,
+    U_EDGES,
+    EdgeGroupPositions,
+    MoveNames,
+    MoveTables,
+    Phase2Moves,
+    decodePermutation,
+    encodeEdgeGroup,
+    encodeOrientation,
+    encodePermutation,
+    encodeSliceSorted,
+)
+from .cube import CubeLabel, RubiksCube
+from .cubie import CubieCube
+from .validation import validate
+
+TablesVersion = 1
+TableDirectory = path.join(
+    path.expanduser("~"),
+    ".local",
+    "share",
+    "rubiksolver",
+    f"tables-v{TablesVersion}",
+)
+ManifestFilename = "manifest.json"
+
+CharLabel: dict[str, CubeLabel] = {
+    char: label for label, char in RubiksCube.StrLabel.items()
+}
+
+
+def buildPruningTable(
+    moveA: np.ndarray,
+    moveB: np.ndarray,
+    moves: list[int],
+    goal: tuple[int, int] = (0, 0),
+    maxDepth: int | None = None,
+    chunkSize: int = 1 << 22,
+) -> np.ndarray:
+    """
+    Breadth-first search over the product of two coordinates, returning the
+    number of moves needed to bring (a, b) to `goal` at index a * len(moveB) + b.
+
+    If `maxDepth` is given the search stops there and every farther entry holds
+    maxDepth + 1, which is still a lower bound. The frontier is expanded in
+    chunks of `chunkSize` to bound the memory used by large tables.
+    """
+    sizeB = moveB.shape[0]
+    table = np.full(moveA.shape[0] * sizeB, -1, dtype=np.int8)
+    frontier = np.array([goal[0] * sizeB + goal[1]], dtype=np.int64)
+    table[frontier] = 0
+    depth = 0
+
+    while frontier.size and (maxDepth is None or depth < maxDepth):
+        for start in range(0, frontier.size, chunkSize):
+            a, b = np.divmod(frontier[start : start + chunkSize], sizeB)
+            for move in moves:
+                neighbours = moveA[a, move].astype(np.int64) * sizeB + moveB[b, move]
+                table[neighbours[table[neighbours] < 0]] = depth + 1
+        depth += 1
+        frontier = np.flatnonzero(table == depth)
+
+    if maxDepth is not None:
+        table[table < 0] = maxDepth + 1
+    return table
+
+
+class TableSet(ABC):
+    """
+    Base of the dataclasses holding solver tables. The tables are stored as a
+    directory of .npy files with a manifest recording their version, shape and
+    dtype. Subclasses define Version, Directory and build().
+    """
+
+    Version: ClassVar[int]
+    Directory: ClassVar[str]
+
+    @classmethod
+    @abstractmethod
+    def build(cls) -> "TableSet":
+        """
+        Generates the tables.
+        """
+
+    def save(self, directory: str | None = None) -> None:
+        """
+        Writes the tables as .npy files followed by a manifest. The directory is
+        populated under a temporary name and renamed into place, so readers
+        never observe a partially written set of tables.
+        """
+        directory = self.Directory if directory is None else directory
+        parent = path.dirname(path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=".tables-")
+
+        manifest: dict = {"version": self.Version, "tables": {}}
+        for table in fields(self):
+            array = getattr(self, table.name)
+            np.save(path.join(staging, f"{table.name}.npy"), array)
+            manifest["tables"][table.name] = {
+                "shape": list(array.shape),
+                "dtype": str(array.dtype),
+            }
+
+        with open(path.join(staging, ManifestFilename), "w") as file:
+            json.dump(manifest, file, indent=2)
+
+        try:
+            os.rename(staging, directory)
+        except OSError:
+            # Another process finished writing the same tables first.
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str | None = None):
+        """
+        Memory maps previously saved tables. Raises FileNotFoundError if the
+        tables are missing and ValueError if they are of another version.
+        """
+        directory = cls.Directory if directory is None else directory
+        with open(path.join(directory, ManifestFilename), "r") as file:
+            manifest = json.load(file)
+
+        if manifest.get("version") != cls.Version:
+            raise ValueError(
+                f"Solver tables at {directory} have version "
+                f"{manifest.get('version')}, expected {cls.Version}"
+            )
+
+        arrays = {}
+        for table in fields(cls):
+            array = np.load(path.join(directory, f"{table.name}.npy"), mmap_mode="r")
+            expected = manifest["tables"][table.name]
+            if list(array.shape) != expected["shape"]:
+                raise ValueError(f"Solver table {table.name} is corrupted")
+            arrays[table.name] = array
+
+        return cls(**arrays)
+
+    @classmethod
+    def loadOrBuild(cls, directory: str | None = None):
+        directory = cls.Directory if directory is None else directory
+        try:
+            return cls.load(directory)
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+        if path.exists(directory):
+            shutil.rmtree(directory, ignore_errors=True)
+
+        cls.build().save(directory)
+        return cls.load(directory)
+
+
+@dataclass
+class SolverTables(TableSet):
+    """
+    The move and pruning tables of the two-phase solver. Pruning tables hold
+    lower bounds on the number of moves needed to solve the coordinate pair.
+
+    attributes:
+    --  twist, flip, sliceSorted, uEdges, dEdges, corners, udEdges: move tables,
+        see MoveTables
+    --  twistSlicePrune: (twist, UD-slice) phase 1 pruning table
+    --  flipSlicePrune: (flip, UD-slice) phase 1 pruning table
+    --  cornersSlicePrune: (corners, sorted UD-slice) phase 2 pruning table
+    --  udEdgesSlicePrune: (U and D edges, sorted UD-slice) phase 2 pruning table
+    """
+
+    twist: np.ndarray
+    flip: np.ndarray
+    sliceSorted: np.ndarray
+    uEdges: np.ndarray
+    dEdges: np.ndarray
+    corners: np.ndarray
+    udEdges: np.ndarray
+    twistSlicePrune: np.ndarray
+    flipSlicePrune: np.ndarray
+    cornersSlicePrune: np.ndarray
+    udEdgesSlicePrune: np.ndarray
+
+    Version = TablesVersion
+    Directory = TableDirectory
+
+    @classmethod
+    def build(cls) -> "SolverTables":
+        moves = MoveTables.build()
+        allMoves = list(range(N_MOVES))
+        udSlice = moves.sliceSorted[::24] // 24
+        phase2Slice = moves.sliceSorted[:24]
+
+        return cls(
+            moves.twist,
+            moves.flip,
+            moves.sliceSorted,
+            moves.uEdges,
+            moves.dEdges,
+            moves.corners,
+            moves.udEdges,
+            buildPruningTable(moves.twist, udSlice, allMoves),
+            buildPruningTable(moves.flip, udSlice, allMoves),
+            buildPruningTable(moves.corners, phase2Slice, Phase2Moves),
+            buildPruningTable(moves.udEdges, phase2Slice, Phase2Moves),
+        )
+
+
+def _flat(array: np.ndarray) -> memoryview:
+    """
+    Returns a flat memoryview of a table. Indexing a memoryview is several
+    times faster than indexing a NumPy array and still reads the mapped pages.
+    """
+    return memoryview(array.reshape(-1))
+
+
+def parseFacelets(facelets: str) -> CubieCube:
+    """
+    Converts a kociemba facelet string into a cubie cube, raising ValueError if
+    the string does not describe a solvable cube.
+    """
+    if len(facelets) != 54:
+        raise ValueError("A facelet string must have 54 characters")
+
+    try:
+        state = [CharLabel[char] for char in facelets]
+    except KeyError as error:
+        raise ValueError(f"Facelet {error} not recognized") from error
+
+    result = validate(state)
+    if not result.isValid:
+        raise ValueError(result.message)
+
+    return CubieCube.fromFacelets(state)
+
+
+class TwoPhaseSolver:
+    """
+    Solves a cube given as a kociemba facelet string, returning a space separated
+    move sequence in the same notation as kociemba.solve.
+    """
+
+    def __init__(
+        self,
+        tables: SolverTables | None = None,
+        maxLength: int = 22,
+        timeout: float = 10.0,
+    ) -> None:
+        self.tables = tables if tables is not None else SolverTables.loadOrBuild()
+        self.maxLength = maxLength
+        self.timeout = timeout
+
+        self._twist = _flat(self.tables.twist)
+        self._flip = _flat(self.tables.flip)
+        self._sliceSorted = _flat(self.tables.sliceSorted)
+        self._uEdges = _flat(self.tables.uEdges)
+        self._dEdges = _flat(self.tables.dEdges)
+        self._corners = _flat(self.tables.corners)
+        self._udEdges = _flat(self.tables.udEdges)
+        self._twistSlicePrune = _flat(self.tables.twistSlicePrune)
+        self._flipSlicePrune = _flat(self.tables.flipSlicePrune)
+        self._cornersSlicePrune = _flat(self.tables.cornersSlicePrune)
+        self._udEdgesSlicePrune = _flat(self.tables.udEdgesSlicePrune)
+
+        self._groupPositions = EdgeGroupPositions.tolist()
+        self._groupOrders = decodePermutation(np.arange(24), 4).tolist()
+        self._phase2Moves = set(Phase2Moves)
+        # Set during solveAnytime, receives every solution found
+        self._onSolution: Callable[[list[int]], None] | None = None
+
+    def __call__(self, facelets: str) -> str:
+        return self.solve(facelets)
+
+    def solve(
+        self,
+        facelets: str,
+        maxLength: int | None = None,
+        timeout: float | None = None,
+        stop: Callable[[], bool] | None = None,
+    ) -> str:
+        """
+        Returns a solution of at most `maxLength` moves. Raises ValueError for an
+        invalid cube and TimeoutError if no such solution is found in time or
+        `stop`, polled every 1024 nodes, returns True first.
+        """
+        moves = self.solveMoves(
+            parseFacelets(facelets),
+            self.maxLength if maxLength is None else maxLength,
+            self.timeout if timeout is None else timeout,
+            stop,
+        )
+        return " ".join(MoveNames[move] for move in moves)
+
+    def solveAnytime(
+        self,
+        facelets: str,
+        onSolution: Callable[[str], None],
+        timeout: float | None = None,
+        improveTime: float | None = None,
+        stop: Callable[[], bool] | None = None,
+    ) -> str:
+        """
+        Anytime solving in a single search: every solution found is passed to
+        `onSolution` right away and the search goes on for shorter ones, with
+        the length bound lowered, instead of starting over. It ends once no
+        shorter solution exists, after `timeout` seconds, `improveTime`
+        seconds after the first solution or when `stop` returns True.
+
+        Returns the shortest solution found. Raises ValueError for an invalid
+        cube and TimeoutError if not even one solution was found.
+        """
+        cube = parseFacelets(facelets)
+        best: list[int] | None = None
+
+        def found(moves: list[int]) -> None:
+            nonlocal best
+            if best is None and improveTime is not None:
+                self._deadline = min(self._deadline, time.perf_counter() + improveTime)
+            best = moves
+            self._maxLength = len(moves) - 1
+            onSolution(" ".join(MoveNames[move] for move in moves))
+
+        self._onSolution = found
+        try:
+            self.solveMoves(
+                cube,
+                self.maxLength,
+                self.timeout if timeout is None else timeout,
+                stop,
+            )
+        except (ValueError, TimeoutError):
+            if best is None:
+                raise
+        finally:
+            self._onSolution = None
+        return " ".join(MoveNames[move] for move in best)
+
+    def solveMoves(
+        self,
+        cube: CubieCube,
+        maxLength: int,
+        timeout: float,
+        stop: Callable[[], bool] | None = None,
+    ) -> list[int]:
+        """
+        Returns the move indices (see MoveNames) of a solution of `cube`.
+        """
+        co = np.array([cube.co], dtype=np.int8)
+        eo = np.array([cube.eo], dtype=np.int8)
+        ep = np.array([cube.ep], dtype=np.intp)
+
+        twist = int(encodeOrientation(co, 3)[0])
+        flip = int(encodeOrientation(eo, 2)[0])
+        sliceSorted = int(encodeSliceSorted(ep)[0])
+
+        self._start = (
+            int(encodePermutation(np.array([cube.cp], dtype=np.intp))[0]),
+            int(encodeEdgeGroup(ep, U_EDGES)[0]),
+            int(encodeEdgeGroup(ep, D_EDGES)[0]),
+        )
+        self._deadline = time.perf_counter() + timeout
+        self._stop = stop
+        self._nodes = 0
+        self._maxLength = maxLength
+        self._path: list[int] = []
+
+        udSlice = sliceSorted // 24
+        depth = max(
+            self._twistSlicePrune[twist * N_SLICE + udSlice],
+            self._flipSlicePrune[flip * N_SLICE + udSlice],
+        )
+        while depth <= self._maxLength:
+            if self._phase1(twist, flip, sliceSorted, depth):
+                return list(self._path)
+            depth += 1
+
+        raise ValueError(f"No solution with at most {maxLength} moves exists")
+
+    def _tick(self) -> None:
+        self._nodes += 1
+        if self._nodes & 1023 == 0:
+            if time.perf_counter() > self._deadline:
+                raise TimeoutError("The two-phase search timed out")
+            if self._stop is not None and self._stop():
+                raise TimeoutError("The two-phase search was cancelled")
+
+    def _phase1(self, twist: int, flip: int, sliceSorted: int, togo: int) -> bool:
+        if togo == 0:
+            return self._startPhase2(sliceSorted)
+
+        self._tick()
+        path = self._path
+        lastFace = path[-1] // 3 if path else -1
+
+        for move in range(N_MOVES):
+            face = move // 3
+            if face == lastFace or lastFace - face == 3:
+                continue
+            if togo == 1 and move in self._phase2Moves:
+                # The parent is already in G1 and was tried with one move less.
+                continue
+
+            newTwist = self._twist[twist * N_MOVES + move]
+            newFlip = self._flip[flip * N_MOVES + move]
+            newSliceSorted = self._sliceSorted[sliceSorted * N_MOVES + move]
+            udSlice = newSliceSorted // 24
+
+            if self._twistSlicePrune[newTwist * N_SLICE + udSlice] >= togo:
+                continue
+            if self._flipSlicePrune[newFlip * N_SLICE + udSlice] >= togo:
+                continue
+
+            path.append(move)
+            if self._phase1(newTwist, newFlip, newSliceSorted, togo - 1):
+                return True
+            path.pop()
+
+        return False
+
+    def _startPhase2(self, sliceSorted: int) -> bool:
+        corners, uEdges, dEdges = self._start
+        for move in self._path:
+            corners = self._corners[corners * N_MOVES + move]
+            uEdges = self._uEdges[uEdges * N_MOVES + move]
+            dEdges = self._dEdges[dEdges * N_MOVES + move]
+
+        maxDepth = self._maxLength - len(self._path)
+        if self._cornersSlicePrune[corners * 24 + sliceSorted] > maxDepth:
+            return False
+
+        udEdges = self._udEdgesCoordinate(uEdges, dEdges)
+        depth = max(
+            self._cornersSlicePrune[corners * 24 + sliceSorted],
+            self._udEdgesSlicePrune[udEdges * 24 + sliceSorted],
+        )
+        phase1Length = len(self._path)
+        while depth <= maxDepth:
+            if self._phase2(corners, udEdges, sliceSorted, depth):
+                if self._onSolution is None:
+                    return True
+                # Shorter solutions through this phase 1 path would need fewer
+                # phase 2 moves, which the iterative deepening already ruled out
+                self._onSolution(list(self._path))
+                del self._path[phase1Length:]
+                return False
+            depth += 1
+
+        return False
+
+    def _udEdgesCoordinate(self, uEdges: int, dEdges: int) -> int:
+        ep = [0] * 8
+        for first, group in ((0, uEdges), (4, dEdges)):
+            positions = self._groupPositions[group // 24]
+            order = self._groupOrders[group % 24]
+            for position, edge in zip(positions, order):
+                ep[position] = edge + first
+
+        index = 0
+        for i in range(7):
+            smaller = 0
+            for j in range(i + 1, 8):
+                if ep[j] < ep[i]:
+                    smaller += 1
+            index = index * (8 - i) + smaller
+        return index
+
+    def _phase2(self, corners: int, udEdges: int, sliceSorted: int, togo: int) -> bool:
+        if togo == 0:
+            return corners == 0 and udEdges == 0 and sliceSorted == 0
+
+        self._tick()
+        path = self._path
+        lastFace = path[-1] // 3 if path else -1
+
+        for move in Phase2Moves:
+            face = move // 3
+            if face == lastFace or lastFace - face == 3:
+                continue
+
+            newCorners = self._corners[corners * N_MOVES + move]
+            newUdEdges = self._udEdges[udEdges * N_MOVES + move]
+            newSliceSorted = self._sliceSorted[sliceSorted * N_MOVES + move]
+
+            if self._cornersSlicePrune[newCorners * 24 + newSliceSorted] >= togo:
+                continue
+            if self._udEdgesSlicePrune[newUdEdges * 24 + newSliceSorted] >= togo:
+                continue
+
+            path.append(move)
+            if self._phase2(newCorners, newUdEdges, newSliceSorted, togo - 1):
+                return True
+            path.pop()
+
+        return False
+
+
+_defaultSolver: TwoPhaseSolver | None = None
+
+
+def solve(facelets: str, maxLength: int = 22, timeout: float = 10.0) -> str:
+    """
+    Solves a facelet string with a process-wide TwoPhaseSolver whose tables are
+    loaded (or generated) on first use. Drop-in replacement for kociemba.solve.
+    """
+    global _defaultSolver
+    if _defaultSolver is None:
+        _defaultSolver = TwoPhaseSolver()
+    return _defaultSolver.solve(facelets, maxLength, timeout)
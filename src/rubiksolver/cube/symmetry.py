@@ -0,0 +1,199 @@
+"""
+The 48 symmetries of the cube (24 rotations, each optionally mirrored) acting
+on facelet strings, and the symmetry reduced canonical form of a cube state.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import CubeBatch
+from .cube import CubeFace, CubeMove, RubiksCube
+
+# Outward normal, column direction and row direction of every face in the
+# facelet layout of RubiksCube, in a right-handed frame with x pointing to the
+# R face, y to the U face and z to the F face.
+FaceFrames: dict[CubeFace, tuple[tuple[int, ...], ...]] = {
+    CubeFace.UP: ((0, 1, 0), (1, 0, 0), (0, 0, 1)),
+    CubeFace.RIGHT: ((1, 0, 0), (0, 0, -1), (0, -1, 0)),
+    CubeFace.FRONT: ((0, 0, 1), (1, 0, 0), (0, -1, 0)),
+    CubeFace.DOWN: ((0, -1, 0), (1, 0, 0), (0, 0, -1)),
+    CubeFace.LEFT: ((-1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    CubeFace.BACK: ((0, 0, -1), (-1, 0, 0), (0, -1, 0)),
+}
+
+
+def _buildFaceletPositions() -> np.ndarray:
+    """
+    Returns the (54, 3) integer coordinates of the sticker centers of a cube
+    whose cubies have edge length 2.
+    """
+    positions = np.zeros((54, 3), dtype=np.int64)
+    for face, (normal, column, row) in FaceFrames.items():
+        for i in range(9):
+            r, c = divmod(i, 3)
+            positions[face.value * 9 + i] = (
+                3 * np.array(normal)
+                + 2 * (c - 1) * np.array(column)
+                + 2 * (r - 1) * np.array(row)
+            )
+    return positions
+
+
+FaceletPositions: np.ndarray = _buildFaceletPositions()
+
+
+def faceletPermutation(matrix: np.ndarray) -> np.ndarray:
+    """
+    Returns the gather permutation that moves every sticker from p to
+    matrix @ p, i.e. new[j] = old[permutation[j]].
+    """
+    index = {tuple(p): i for i, p in enumerate(FaceletPositions.tolist())}
+    # Symmetry matrices are orthogonal, so p @ matrix == inverse(matrix) @ p.
+    source = FaceletPositions @ matrix
+    return np.array([index[tuple(p)] for p in source.tolist()], dtype=np.intp)
+
+
+def faceMapping(matrix: np.ndarray) -> list[CubeFace]:
+    """
+    Returns the face every face is carried to by `matrix`.
+    """
+    normals = {normal: face for face, (normal, _, _) in FaceFrames.items()}
+    return [
+        normals[tuple((matrix @ np.array(FaceFrames[face][0])).tolist())]
+        for face in CubeFace
+    ]
+
+
+@dataclass(frozen=True)
+class Symmetry:
+    """
+    A symmetry of the cube acting on cube states by conjugation: every sticker
+    is moved by the rotation/reflection and recolored with the color of the face
+    its old face is carried to, so centers stay in place.
+
+    attributes:
+    --  index: position of the symmetry in Symmetries, 0 being the identity
+    --  matrix: the 3x3 orthogonal integer matrix of the symmetry
+    --  faces: faces[f] is the face that face f is carried to
+    --  isReflection: whether the symmetry reverses handedness
+    """
+
+    index: int
+    matrix: tuple[tuple[int, ...], ...]
+    faces: tuple[CubeFace, ...]
+    isReflection: bool
+
+    @property
+    def inverse(self) -> "Symmetry":
+        return Symmetries[InverseSymmetry[self.index]]
+
+    def apply(self, facelets: str) -> str:
+        """
+        Returns the facelet string of the transformed cube state.
+        """
+        codes = _codes(facelets)
+        transformed = SymmetryLabels[self.index][codes[SymmetryGather[self.index]]]
+        return CubeBatch.CodeToChar[transformed].tobytes().decode("ascii")
+
+    def mapMove(self, move: str) -> str:
+        """
+        Maps a move in kociemba notation so that applying it to a transformed
+        state matches transforming the state after the original move.
+        """
+        face = self.faces["URFDLB".index(move[0])]
+        suffix = move[1:]
+        if self.isReflection and suffix != "2":
+            suffix = "" if suffix == "'" else "'"
+        return "URFDLB"[face.value] + suffix
+
+    def mapSolution(self, solution: str) -> str:
+        return " ".join(self.mapMove(move) for move in solution.split())
+
+    def mapCubeMove(self, move: CubeMove) -> CubeMove:
+        face, turns = RubiksCube.MoveTurns[move]
+        if self.isReflection:
+            turns = 4 - turns
+        return _FaceMove[(self.faces[face.value], turns)]
+
+
+def _generateMatrices() -> list[np.ndarray]:
+    """
+    Generates the 48 symmetry matrices breadth-first from a quarter turn about
+    the y axis, a quarter turn about the x axis and the mirror x -> -x.
+    """
+    generators = [
+        np.array([[0, 0, 1], [0, 1, 0], [-1, 0, 0]]),
+        np.array([[1, 0, 0], [0, 0, -1], [0, 1, 0]]),
+        np.array([[-1, 0, 0], [0, 1, 0], [0, 0, 1]]),
+    ]
+    matrices = [np.eye(3, dtype=np.int64)]
+    seen = {matrices[0].tobytes()}
+    for matrix in matrices:
+        for generator in generators:
+            product = generator @ matrix
+            if product.tobytes() not in seen:
+                seen.add(product.tobytes())
+                matrices.append(product)
+    return matrices
+
+
+def _codes(facelets: str) -> np.ndarray:
+    if len(facelets) != 54:
+        raise ValueError("A facelet string must have 54 characters")
+    codes = CubeBatch.CharToCode[np.frombuffer(facelets.encode("ascii"), np.uint8)]
+    if np.any(codes == 255):
+        raise ValueError("Facelet strings may only contain the characters URFDLBX")
+    return codes
+
+
+_FaceMove = {
+    (face, turns): move for move, (face, turns) in RubiksCube.MoveTurns.items()
+}
+
+_matrices = _generateMatrices()
+
+Symmetries: list[Symmetry] = [
+    Symmetry(
+        i,
+        tuple(tuple(row) for row in matrix.tolist()),
+        tuple(faceMapping(matrix)),
+        bool(round(np.linalg.det(matrix)) < 0),
+    )
+    for i, matrix in enumerate(_matrices)
+]
+
+InverseSymmetry: list[int] = [
+    next(j for j, other in enumerate(_matrices) if (other @ matrix == np.eye(3)).all())
+    for matrix in _matrices
+]
+
+# SymmetryGather[s] gathers the stickers of a state transformed by symmetry s and
+# SymmetryLabels[s] recolors them. Unlabeled facelets stay unlabeled.
+SymmetryGather: np.ndarray = np.array(
+    [faceletPermutation(matrix) for matrix in _matrices], dtype=np.intp
+)
+SymmetryLabels: np.ndarray = np.array(
+    [
+        [face.value for face in symmetry.faces] + [CubeBatch.Unlabeled]
+        for symmetry in Symmetries
+    ],
+    dtype=np.uint8,
+)
+
+
+def canonicalize(facelets: str) -> tuple[str, Symmetry]:
+    """
+    Returns the lexicographically smallest facelet string among the 48
+    symmetric variants of `facelets`, together with the symmetry S that maps
+    `facelets` onto it. A solution of the canonical state is turned into a
+    solution of `facelets` with S.inverse.mapSolution.
+    """
+    codes = _codes(facelets)
+    variants = SymmetryLabels[
+        np.arange(len(Symmetries))[:, None], codes[SymmetryGather]
+    ]
+    raw = CubeBatch.CodeToChar[variants].tobytes()
+
+    best = min(range(len(Symmetries)), key=lambda s: raw[s * 54 : (s + 1) * 54])
+    return raw[best * 54 : (best + 1) * 54].decode("ascii"), Symmetries[best]
@@ -0,0 +1,178 @@
+"""
+Fast solvability check of a scanned cube state.
+
+The checks run from the cheapest to the most expensive and stop at the first
+failure, reporting why the state cannot be solved and which facelets are the
+likely culprits, so that they can be rescanned.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import Enum
+
+from .cube import CubeFace, CubeLabel, CubePosition, Facelet
+from .cubie import CornerColors, CornerFacelets, EdgeColors, EdgeFacelets
+
+
+class ValidationStatus(Enum):
+    VALID = 0
+    INCOMPLETE = 1
+    CENTER = 2
+    COLOR_COUNT = 3
+    CORNER = 4
+    EDGE = 5
+    CORNER_TWIST = 6
+    EDGE_FLIP = 7
+    PARITY = 8
+
+
+@dataclass
+class ValidationResult:
+    """
+    The outcome of validating a cube state.
+
+    attributes:
+    --  status: VALID or the first check that failed
+    --  message: a human readable description of the failure
+    --  suspectFacelets: the facelets that should be rescanned
+    """
+
+    status: ValidationStatus
+    message: str = ""
+    suspectFacelets: list[Facelet] = field(default_factory=list)
+
+    @property
+    def isValid(self) -> bool:
+        return self.status == ValidationStatus.VALID
+
+
+# (cubie, orientation) of every ordered tuple of colors that a corner or edge
+# position can show, read in the order of CornerFacelets / EdgeFacelets.
+CornerLookup: dict[tuple[CubeLabel, ...], tuple[int, int]] = {
+    colors[-ori:] + colors[:-ori] if ori else colors: (cubie, ori)
+    for cubie, colors in enumerate(CornerColors)
+    for ori in range(3)
+}
+EdgeLookup: dict[tuple[CubeLabel, ...], tuple[int, int]] = {
+    colors[-ori:] + colors[:-ori] if ori else colors: (cubie, ori)
+    for cubie, colors in enumerate(EdgeColors)
+    for ori in range(2)
+}
+
+CornerIndices = [i for facelets in CornerFacelets for i in facelets]
+EdgeIndices = [i for facelets in EdgeFacelets for i in facelets]
+
+
+def _facelets(indices) -> list[Facelet]:
+    return [Facelet(CubeFace(i // 9), CubePosition(i % 9)) for i in indices]
+
+
+def _cycleParity(permutation: list[int]) -> int:
+    seen = [False] * len(permutation)
+    parity = 0
+    for start in range(len(permutation)):
+        length = 0
+        i = start
+        while not seen[i]:
+            seen[i] = True
+            i = permutation[i]
+            length += 1
+        if length:
+            parity ^= (length - 1) & 1
+    return parity
+
+
+def _identify(
+    state: list[CubeLabel],
+    positions: list[tuple[int, ...]],
+    lookup: dict[tuple[CubeLabel, ...], tuple[int, int]],
+) -> tuple[list[int], list[int], list[int]]:
+    """
+    Returns the cubie and orientation at every position, along with the facelet
+    indices of the positions that do not hold a valid and unique cubie.
+    """
+    cubies, orientations, suspects = [], [], []
+    for facelets in positions:
+        cubie, ori = lookup.get(tuple(state[i] for i in facelets), (-1, 0))
+        cubies.append(cubie)
+        orientations.append(ori)
+
+    counts = Counter(cubies)
+    for facelets, cubie in zip(positions, cubies):
+        if cubie < 0 or counts[cubie] > 1:
+            suspects.extend(facelets)
+
+    return cubies, orientations, suspects
+
+
+def validate(state: list[CubeLabel]) -> ValidationResult:
+    """
+    Checks that a facelet state (as in RubiksCube.state) can be solved.
+    """
+    unlabeled = [i for i, label in enumerate(state) if label == CubeLabel.UNLABELD]
+    if unlabeled:
+        return ValidationResult(
+            ValidationStatus.INCOMPLETE,
+            f"{len(unlabeled)} facelets are unlabeled",
+            _facelets(unlabeled),
+        )
+
+    centers = [face.value * 9 + CubePosition.FIVE.value for face in CubeFace]
+    misplaced = [i for i in centers if state[i] != CubeLabel(i // 9)]
+    if misplaced:
+        return ValidationResult(
+            ValidationStatus.CENTER,
+            "Center facelets do not match their faces",
+            _facelets(misplaced),
+        )
+
+    counts = Counter(state)
+    excess = [label for label in counts if counts[label] > 9]
+    if excess:
+        names = ", ".join(label.name for label in excess)
+        return ValidationResult(
+            ValidationStatus.COLOR_COUNT,
+            f"Too many facelets of color {names}",
+            _facelets(
+                i for i, label in enumerate(state) if label in excess and i % 9 != 4
+            ),
+        )
+
+    cp, co, suspects = _identify(state, CornerFacelets, CornerLookup)
+    if suspects:
+        return ValidationResult(
+            ValidationStatus.CORNER,
+            "Some corners do not match a unique corner cubie",
+            _facelets(suspects),
+        )
+
+    ep, eo, suspects = _identify(state, EdgeFacelets, EdgeLookup)
+    if suspects:
+        return ValidationResult(
+            ValidationStatus.EDGE,
+            "Some edges do not match a unique edge cubie",
+            _facelets(suspects),
+        )
+
+    if sum(co) % 3:
+        return ValidationResult(
+            ValidationStatus.CORNER_TWIST,
+            "A corner is twisted",
+            _facelets(CornerIndices),
+        )
+
+    if sum(eo) % 2:
+        return ValidationResult(
+            ValidationStatus.EDGE_FLIP,
+            "An edge is flipped",
+            _facelets(EdgeIndices),
+        )
+
+    if _cycleParity(cp) != _cycleParity(ep):
+        return ValidationResult(
+            ValidationStatus.PARITY,
+            "Two pieces are swapped",
+            _facelets(CornerIndices + EdgeIndices),
+        )
+
+    return ValidationResult(ValidationStatus.VALID)
@@ -0,0 +1,86 @@
+"""
+Equivalent formulations of a solve: the cube seen in another orientation and
+the inverse cube state.
+
+The two-phase algorithm first brings the cube into a subgroup defined by the
+UD axis, so its solution length depends on the orientation of the cube and on
+whether the state or its inverse is solved. Solving several variants and
+mapping their solutions back often yields a shorter solution.
+"""
+
+from dataclasses import dataclass
+
+from .cube import CubeFace
+from .solver import parseFacelets
+from .symmetry import Symmetries, Symmetry
+
+
+def invertFacelets(facelets: str) -> str:
+    """
+    Returns the facelet string of the inverse state, i.e. the state reached by
+    applying the solution of `facelets` to a solved cube. Raises ValueError if
+    `facelets` is not a solvable cube.
+    """
+    return str(parseFacelets(facelets).inverse().toCube())
+
+
+def invertSolution(solution: str) -> str:
+    """
+    Returns the move sequence undoing `solution`, in kociemba notation.
+    """
+    inverted = {"": "'", "'": "", "2": "2"}
+    return " ".join(move[0] + inverted[move[1:]] for move in reversed(solution.split()))
+
+
+# The rotations by 0, 120 and 240 degrees about the URF-DBL diagonal. They cycle
+# the UD, RL and FB axes, so each orientation starts phase 1 on another axis.
+AxisRotations: list[Symmetry] = [
+    next(
+        symmetry
+        for symmetry in Symmetries
+        if not symmetry.isReflection
+        and symmetry.faces[CubeFace.UP.value] == up
+        and symmetry.faces[CubeFace.RIGHT.value] == right
+    )
+    for up, right in (
+        (CubeFace.UP, CubeFace.RIGHT),
+        (CubeFace.RIGHT, CubeFace.FRONT),
+        (CubeFace.FRONT, CubeFace.UP),
+    )
+]
+
+
+@dataclass(frozen=True)
+class SolveVariant:
+    """
+    A transformation of the cube to solve instead of the original one.
+
+    attributes:
+    --  symmetry: the symmetry applied to the cube
+    --  inverse: whether the inverse state is solved
+    """
+
+    symmetry: Symmetry
+    inverse: bool
+
+    def apply(self, facelets: str) -> str:
+        """
+        Returns the facelet string of the variant of `facelets`.
+        """
+        if self.inverse:
+            facelets = invertFacelets(facelets)
+        return self.symmetry.apply(facelets)
+
+    def mapSolution(self, solution: str) -> str:
+        """
+        Turns a solution of the variant into a solution of the original cube.
+        """
+        solution = self.symmetry.inverse.mapSolution(solution)
+        return invertSolution(solution) if self.inverse else solution
+
+
+SolveVariants: list[SolveVariant] = [
+    SolveVariant(symmetry, inverse)
+    for inverse in (False, True)
+    for symmetry in AxisRotations
+]
@@ -1,6 +1,8 @@
+import sqlite3
 from os import makedirs, path
 
 import cv2 as cv
+import kociemba
 import numpy as np
 from PySide6.QtCore import QSize, QThread, Signal, Slot
 from PySide6.QtGui import QImage, QPixmap, Qt
@@ -14,27 +16,45 @@ from rubiksolver.cube import (
     Facelet,
     MoveTimeline,
     RubiksCube,
+    SolutionCache,
+    validate,
 )
+from rubiksolver.cube.cache import CacheFile
 from rubiksolver.vision import CubeDetectionResult, PlanarCubeVisualizer
 from rubiksolver.vision.vision import HSV
 
 from .widgets import Cube3DViewerWidget, CubeDetectionControlPanel
-from .workers import CubeDectionWorker
+from .workers import CubeDectionWorker, CubeSolveWorker
 
 
 class CubeDetectionAppWindow(QMainWindow):
     PauseSignal = Signal()
     ResumeSignal = Signal()
+    SolveSignal = Signal(int, str)
+    MinLabelConfidence = 0.8
 
-    def __init__(self, debug: bool):
+    def __init__(self, debug: bool, twoPhase: bool = False):
         super().__init__()
         self.debug = debug
-        self.cube = RubiksCube()
+        try:
+            self.solutionCache = SolutionCache(filename=CacheFile)
+        except (OSError, sqlite3.Error):
+            # Solutions are still cached for this session, just not persisted
+            self.solutionCache = SolutionCache()
+        self.cube = RubiksCube(self.solutionCache)
         self.visualizer = PlanarCubeVisualizer()
         self.videoSize = QSize(752, 450)
         self.cubeDetectionThread = QThread()
         self.detectionStarted = False
         self.cubeDetectionWorker = CubeDectionWorker()
+        self.cubeSolveThread = QThread()
+        # None selects the TwoPhaseSolver process with streamed improvements
+        self.cubeSolveWorker = CubeSolveWorker(
+            self.solutionCache, None if twoPhase else kociemba.solve
+        )
+        self.solveRequestId = 0
+        self.pendingSolve: str | None = None
+        self.failedSolve: str | None = None
         self.animTimeline: MoveTimeline | None = None
         self.nextMoveTimer: QTimer = QTimer(self, interval=2000)
         self.nextMoveTimer.timeout.connect(self.nextPressed)
@@ -46,6 +66,13 @@ class CubeDetectionAppWindow(QMainWindow):
         self.PauseSignal.connect(self.cubeDetectionWorker.pause)
         self.ResumeSignal.connect(self.cubeDetectionWorker.resume)
 
+        self.cubeSolveWorker.moveToThread(self.cubeSolveThread)
+        self.cubeSolveThread.started.connect(self.cubeSolveWorker.start)
+        self.SolveSignal.connect(self.cubeSolveWorker.solve)
+        self.cubeSolveWorker.solutionReady.connect(self.onSolutionReady)
+        self.cubeSolveWorker.solutionImproved.connect(self.onSolutionImproved)
+        self.cubeSolveWorker.solveFailed.connect(self.onSolveFailed)
+
     def setup(self):
         self.photoLabel1 = QLabel()
         self.photoLabel1.setMinimumSize(self.videoSize)
@@ -129,6 +156,7 @@ class CubeDetectionAppWindow(QMainWindow):
         self.cubeViewer.nextButton.pressed.connect(self.nextPressed)
         self.cubeViewer.prevButton.pressed.connect(self.prevPressed)
         self.cubeViewer.resetButton.pressed.connect(self.resetPressed)
+        self.cubeViewer.timelineSlider.valueChanged.connect(self.seekTimeline)
 
         container = QWidget(self)
         self.setCentralWidget(container)
@@ -143,6 +171,7 @@ class CubeDetectionAppWindow(QMainWindow):
         super().showEvent(event)
         if not self.detectionStarted:
             self.cubeDetectionThread.start()
+            self.cubeSolveThread.start()
             self.detectionStarted = True
 
     def closeEvent(self, event) -> None:
@@ -153,7 +182,17 @@ class CubeDetectionAppWindow(QMainWindow):
         self.cubeDetectionThread.wait()
         self.detectionStarted = False
 
+        self.cubeSolveWorker.cancel(self.solveRequestId)
+        self.cubeSolveThread.quit()
+        self.cubeSolveThread.wait()
+        self.cubeSolveWorker.stop()
+
         self.cubeViewer.cleanup()
+        if self.debug:
+            print(self.solutionCache.statistics())
+            for stage, latency in self.cubeDetectionWorker.timingStatistics().items():
+                print(f"{stage}: {latency}")
+        self.solutionCache.close()
         event.accept()
 
     def showResults(self, result: CubeDetectionResult):
@@ -206,11 +245,67 @@ class CubeDetectionAppWindow(QMainWindow):
         for i in range(9):
             if result.labels[i] == CubeLabel.UNLABELD or i == 4:
                 continue
+            # Uncertain facelets are left for a later frame
+            if (
+                result.faceletConfidence
+                and result.faceletConfidence[i] < self.MinLabelConfidence
+            ):
+                continue
             positon = CubePosition(i)
             self.cube.setFaceletLabel(Facelet(face, positon), result.labels[i])
 
-            if self.cube.isComplete():
-                self.onScanComplete()
+        if self.cube.isLabeled() and self.cube.solution is None:
+            self.requestSolve()
+
+    def requestSolve(self):
+        facelets = str(self.cube)
+        if facelets in (self.pendingSolve, self.failedSolve):
+            return
+
+        validation = validate(self.cube.state)
+        if not validation.isValid:
+            # Drop the suspect facelets so that they get rescanned
+            if self.debug:
+                print(f"Invalid scan: {validation.message}")
+            for facelet in validation.suspectFacelets:
+                self.cube.setFaceletLabel(facelet, CubeLabel.UNLABELD)
+            return
+
+        # Supersedes a solve still in flight for an earlier scan
+        self.cubeSolveWorker.cancel(self.solveRequestId)
+        self.solveRequestId += 1
+        self.pendingSolve = facelets
+        self.SolveSignal.emit(self.solveRequestId, facelets)
+
+    @Slot(int, str)
+    def onSolutionReady(self, requestId: int, solution: str):
+        if requestId != self.solveRequestId or self.pendingSolve != str(self.cube):
+            return
+        self.pendingSolve = None
+        self.cube.setSolution(solution)
+        self.onScanComplete()
+
+    @Slot(int, str)
+    def onSolutionImproved(self, requestId: int, solution: str):
+        # Only swap the solution while playback has not started yet
+        if (
+            requestId != self.solveRequestId
+            or self.animTimeline is None
+            or self.animTimeline.currentPosition != 0
+            or self.nextMoveTimer.isActive()
+        ):
+            return
+        self.cube.setSolution(solution)
+        self.onScanComplete()
+
+    @Slot(int, str)
+    def onSolveFailed(self, requestId: int, message: str):
+        if requestId != self.solveRequestId:
+            return
+        if self.debug:
+            print(f"Solve failed: {message}")
+        self.failedSolve = self.pendingSolve
+        self.pendingSolve = None
 
     def saveMeanColors(self, mean_colors: list[HSV]):
         homedir = path.expanduser("~")
@@ -237,6 +332,12 @@ class CubeDetectionAppWindow(QMainWindow):
     def onScanComplete(self):
         self.PauseSignal.emit()
         self.animTimeline = self.cube.solution
+        # A new range or value must not seek the timeline that was just set
+        self.cubeViewer.timelineSlider.blockSignals(True)
+        self.cubeViewer.timelineSlider.setRange(0, self.animTimeline.numMoves)
+        self.cubeViewer.timelineSlider.setValue(0)
+        self.cubeViewer.timelineSlider.blockSignals(False)
+        self.cubeViewer.timelineSlider.setEnabled(True)
         self.cubeViewer.playButton.setEnabled(True)
         self.cubeViewer.nextButton.setEnabled(True)
         self.cubeViewer.prevButton.setEnabled(True)
@@ -273,6 +374,8 @@ class CubeDetectionAppWindow(QMainWindow):
     def nextPressed(self):
         if self.animTimeline is None:
             return
+        # Playback started, a shorter solution would come too late
+        self.cubeSolveWorker.cancel(self.solveRequestId)
         move = self.animTimeline.next()
         if move is None:
             self.nextMoveTimer.stop()
@@ -285,6 +388,7 @@ class CubeDetectionAppWindow(QMainWindow):
         self.cubeViewer.prevButton.setDisabled(False)
         self.cube.applyMove(move)
         self.cubeViewer.playMove(move, self.cube.state)
+        self.syncTimelineSlider()
 
     @Slot()
     def prevPressed(self):
@@ -296,13 +400,40 @@ class CubeDetectionAppWindow(QMainWindow):
         self.cubeViewer.nextButton.setDisabled(False)
         self.cube.applyMove(move)
         self.cubeViewer.playMove(move, self.cube.state)
+        self.syncTimelineSlider()
+
+    @Slot(int)
+    def seekTimeline(self, position: int):
+        if self.animTimeline is None or position == self.animTimeline.currentPosition:
+            return
+        self.cubeSolveWorker.cancel(self.solveRequestId)
+        self.cube.state = self.animTimeline.seek(position)
+        self.cubeViewer.cubeWidget.setCubeLabels(self.cube.state)
+
+        if not self.nextMoveTimer.isActive():
+            atEnd = position == self.animTimeline.numMoves
+            self.cubeViewer.playButton.setDisabled(atEnd)
+            self.cubeViewer.nextButton.setDisabled(atEnd)
+            self.cubeViewer.prevButton.setDisabled(position == 0)
+
+    def syncTimelineSlider(self):
+        self.cubeViewer.timelineSlider.blockSignals(True)
+        self.cubeViewer.timelineSlider.setValue(self.animTimeline.currentPosition)
+        self.cubeViewer.timelineSlider.blockSignals(False)
 
     @Slot()
     def resetPressed(self):
+        self.cubeSolveWorker.cancel(self.solveRequestId)
+        self.pendingSolve = None
+        self.failedSolve = None
         self.ResumeSignal.emit()
         self.animTimeline = None
         self.cubeViewer.playButton.setDisabled(True)
         self.cubeViewer.pauseButton.setDisabled(True)
         self.cubeViewer.nextButton.setDisabled(True)
         self.cubeViewer.prevButton.setDisabled(True)
+        self.cubeViewer.timelineSlider.blockSignals(True)
+        self.cubeViewer.timelineSlider.setValue(0)
+        self.cubeViewer.timelineSlider.blockSignals(False)
+        self.cubeViewer.timelineSlider.setDisabled(True)
         self.cube.reset()
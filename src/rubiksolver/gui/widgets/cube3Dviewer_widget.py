@@ -16,33 +16,58 @@ class Cube3DViewerWidget(QWidget):
     MoveFaceToRotate = {
         CubeMove.U: CubeFace.UP,
         CubeMove.UPRIME: CubeFace.UP,
+        CubeMove.U2: CubeFace.UP,
         CubeMove.R: CubeFace.RIGHT,
         CubeMove.RPRIME: CubeFace.RIGHT,
+        CubeMove.R2: CubeFace.RIGHT,
         CubeMove.F: CubeFace.FRONT,
         CubeMove.FPRIME: CubeFace.FRONT,
+        CubeMove.F2: CubeFace.FRONT,
         CubeMove.D: CubeFace.DOWN,
         CubeMove.DPRIME: CubeFace.DOWN,
+        CubeMove.D2: CubeFace.DOWN,
         CubeMove.L: CubeFace.LEFT,
         CubeMove.LPRIME: CubeFace.LEFT,
+        CubeMove.L2: CubeFace.LEFT,
         CubeMove.B: CubeFace.BACK,
         CubeMove.BPRIME: CubeFace.BACK,
+        CubeMove.B2: CubeFace.BACK,
     }
 
+    # Half turns rotate in the clockwise direction of their face.
     MoveAngleDir = {
         CubeMove.U: 1,
         CubeMove.UPRIME: -1,
+        CubeMove.U2: 1,
         CubeMove.R: 1,
         CubeMove.RPRIME: -1,
+        CubeMove.R2: 1,
         CubeMove.F: 1,
         CubeMove.FPRIME: -1,
+        CubeMove.F2: 1,
         CubeMove.D: -1,
         CubeMove.DPRIME: 1,
+        CubeMove.D2: -1,
         CubeMove.L: -1,
         CubeMove.LPRIME: 1,
+        CubeMove.L2: -1,
         CubeMove.B: -1,
         CubeMove.BPRIME: 1,
+        CubeMove.B2: -1,
     }
 
+    HalfTurns = {
+        CubeMove.U2,
+        CubeMove.R2,
+        CubeMove.F2,
+        CubeMove.D2,
+        CubeMove.L2,
+        CubeMove.B2,
+    }
+
+    # Every move is animated over the same duration, in seconds.
+    MoveDuration = 1.5
+
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
 
@@ -81,6 +106,10 @@ class Cube3DViewerWidget(QWidget):
         self.pauseButton.setDisabled(True)
         self.playButton.setDisabled(True)
 
+        self.timelineSlider = QSlider(Qt.Orientation.Horizontal)
+        self.timelineSlider.setRange(0, 0)
+        self.timelineSlider.setDisabled(True)
+
         buttonContainer = QWidget()
         self.buttonLayout = QHBoxLayout(buttonContainer)
 
@@ -96,11 +125,14 @@ class Cube3DViewerWidget(QWidget):
         layout.addWidget(self.cameraYawSlider, 2, 1)
         layout.addWidget(self.cubeWidget, 1, 1)
         layout.addWidget(buttonContainer, 3, 0, 1, 2)
+        layout.addWidget(self.timelineSlider, 4, 0, 1, 2)
 
     def playMove(self, move: CubeMove, labels: list[CubeLabel]):
         self.cubeWidget.cubeFaceToRotate = self.MoveFaceToRotate[move]
         self.cubeWidget.faceRotateDir = self.MoveAngleDir[move]
-        self.cubeWidget.angle = -90.0 * self.cubeWidget.faceRotateDir
+        angle = 180.0 if move in self.HalfTurns else 90.0
+        self.cubeWidget.angle = -angle * self.cubeWidget.faceRotateDir
+        self.cubeWidget.rotateSpeed = angle / self.MoveDuration
         self.cubeWidget.setCubeLabels(labels)
 
     def cleanup(self):
@@ -127,6 +159,7 @@ class CubeGLWidget(QOpenGLWidget):
         self.angle = 0.0
         self.cubeFaceToRotate: CubeFace | None = None
         self.faceRotateDir: int = 0
+        self.rotateSpeed = 90 / 1.5
 
         self.deltaTime = 0.0
         self.elapsed = QElapsedTimer()
@@ -296,7 +329,7 @@ class CubeGLWidget(QOpenGLWidget):
 
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.rotationVBO)
 
-        self.angle += (90 / 1.5) * self.deltaTime * self.faceRotateDir
+        self.angle += self.rotateSpeed * self.deltaTime * self.faceRotateDir
         if (self.angle < 0 and self.faceRotateDir < 0) or (
             self.angle >= 0 and self.faceRotateDir > 0
         ):
@@ -1,3 +1,4 @@
 from .cube_detection_worker import CubeDectionWorker
+from .cube_solve_worker import CubeSolveWorker
 
-__all__ = ["CubeDectionWorker"]
+__all__ = ["CubeDectionWorker", "CubeSolveWorker"]
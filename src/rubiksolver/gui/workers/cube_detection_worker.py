@@ -9,7 +9,9 @@ from rubiksolver.vision import (
     CubeDetectionParameters,
     CubeDetectionPipeline,
     CubeDetectionResult,
-    FixedColorClassificationModel,
+    DetectionTimings,
+    StageLatency,
+    defaultColorModel,
 )
 
 
@@ -21,9 +23,8 @@ class CubeDectionWorker(QObject):
         self.running = False
         self.pausePipeline = False
         self.parameters = CubeDetectionParameters()
-        self.pipeline = CubeDetectionPipeline(
-            FixedColorClassificationModel(), self.parameters
-        )
+        self.pipeline = CubeDetectionPipeline(defaultColorModel(), self.parameters)
+        self.timings = DetectionTimings()
 
     def run(self):
         cap = cv.VideoCapture(0)
@@ -58,6 +59,7 @@ class CubeDectionWorker(QObject):
             else:
                 self.pipeline.forward(frame)
                 result = self.pipeline.result()
+                self.timings.add(result.stageTimings)
 
             self.dataReady.emit(result)
             QApplication.processEvents()
@@ -74,6 +76,12 @@ class CubeDectionWorker(QObject):
     def resume(self):
         self.pausePipeline = False
 
+    def timingStatistics(self) -> dict[str, StageLatency]:
+        """
+        Per-stage latency percentiles over the recently processed frames.
+        """
+        return self.timings.statistics()
+
     @Slot(int)
     def setDenoiseDiameter(self, value: int) -> None:
         self.parameters.denoiseDiameter = value
@@ -0,0 +1,108 @@
+from collections.abc import Callable
+
+import kociemba
+from PySide6.QtCore import QObject, Signal, Slot
+
+from rubiksolver.cube import SolutionCache, SolverPool
+
+
+class CubeSolveWorker(QObject):
+    """
+    Solves scanned cubes off the GUI thread.
+
+    By default `solver` (kociemba.solve) is called on this worker's thread.
+    With `solver` None, solves run the in-process TwoPhaseSolver in a
+    pre-warmed solver process instead, so that a slow solve neither blocks
+    frame display nor holds the GIL. Every request carries an id; results of
+    cancelled or superseded requests are never emitted, and cancelling stops
+    the solver process working on them.
+
+    The first solution found is emitted through solutionReady right away. With
+    the two-phase solver, the same search then goes on for `improveTime`
+    seconds and every shorter solution it finds is emitted through
+    solutionImproved, until the request gets cancelled.
+    """
+
+    solutionReady = Signal(int, str)
+    solutionImproved = Signal(int, str)
+    solveFailed = Signal(int, str)
+
+    def __init__(
+        self,
+        cache: SolutionCache,
+        solver: Callable[[str], str] | None = kociemba.solve,
+        timeout: float = 10.0,
+        improveTime: float = 2.0,
+    ):
+        super().__init__()
+        self.cache = cache
+        self.solver = solver
+        self.timeout = timeout
+        self.improveTime = improveTime
+        self.pool: SolverPool | None = None
+        self.cancelledId = -1
+
+    @Slot()
+    def start(self) -> None:
+        if self.solver is not None:
+            return
+        self.pool = SolverPool(workers=1, timeout=self.timeout, context="spawn")
+        # Starts the worker process and loads the tables before the first scan
+        self.pool.warmUp()
+
+    def stop(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+    def cancel(self, requestId: int) -> None:
+        """
+        Cancels every request up to `requestId`. Called from the GUI thread,
+        while this worker may be busy waiting on a solve.
+        """
+        self.cancelledId = max(self.cancelledId, requestId)
+        pool = self.pool
+        if pool is not None:
+            pool.cancel(requestId)
+
+    @Slot(int, str)
+    def solve(self, requestId: int, facelets: str) -> None:
+        if requestId <= self.cancelledId:
+            return
+        if self.solver is None and self.pool is None:
+            return
+
+        solution = self.cache.get(facelets)
+        if solution is not None:
+            self.solutionReady.emit(requestId, solution)
+            return
+
+        if self.solver is not None:
+            try:
+                solution = self.solver(facelets)
+            except ValueError as error:
+                self.solveFailed.emit(requestId, str(error))
+                return
+            if requestId > self.cancelledId:
+                self.cache.put(facelets, solution)
+                self.solutionReady.emit(requestId, solution)
+            return
+
+        # One anytime search streams the first and every shorter solution. It
+        # stops itself at the deadline, after improveTime or once cancelled.
+        first = True
+        for result in self.pool.solutions(
+            facelets, requestId, self.timeout, self.improveTime
+        ):
+            if requestId <= self.cancelledId:
+                return
+            if not result.ok:
+                self.solveFailed.emit(requestId, result.error)
+                return
+
+            self.cache.put(facelets, result.solution)
+            if first:
+                self.solutionReady.emit(requestId, result.solution)
+                first = False
+            else:
+                self.solutionImproved.emit(requestId, result.solution)
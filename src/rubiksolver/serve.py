@@ -0,0 +1,285 @@
+"""
+Headless solve server speaking JSON lines over stdin/stdout or a Unix socket.
+
+Every request is a line holding either a facelet string or an object
+{"id": ..., "facelets": "..."}. Every response is a line
+{"id": ..., "solution": ..., "error": ..., "latency": ..., "cached": ...,
+"final": ...} written as soon as the solve completes, so responses to requests
+that are in flight at the same time may arrive out of order. Latencies are
+measured from receiving the request to writing the response.
+
+A request holding "improve": seconds is solved anytime: every solution the
+search finds is answered right away with "final" false, and the search keeps
+looking for shorter ones for that many seconds. The last response of such a
+request repeats the shortest solution with "final" true.
+
+The server only depends on the cube package, not on Qt or OpenCV.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import CancelledError, Future
+from concurrent.futures.process import BrokenProcessPool
+
+from rubiksolver.cube import SolutionCache, SolverPool
+from rubiksolver.cube.solver import TableDirectory
+
+
+class SolveServer:
+    """
+    Answers solve requests from a SolutionCache or, on a miss, a SolverPool.
+
+    At most `maxPending` solves are in flight at once. Reading further requests
+    blocks until a slot frees up, which pushes back on fast clients.
+
+    Once the pool breaks, e.g. because a worker process died, requests that
+    miss the cache are answered with a solver failure instead of being solved.
+    """
+
+    def __init__(
+        self, pool: SolverPool, cache: SolutionCache, maxPending: int = 256
+    ) -> None:
+        self.pool = pool
+        self.cache = cache
+        self._slots = threading.BoundedSemaphore(maxPending)
+        self._failure: str | None = None
+
+    def serveLines(self, lines: Iterable[str], write: Callable[[str], None]) -> None:
+        """
+        Handles every request of `lines` and returns once all responses have
+        been passed to `write`. Calls of `write` never overlap.
+        """
+        lock = threading.Lock()
+        done = threading.Condition()
+        outstanding = 0
+
+        def respond(response: dict) -> None:
+            with lock:
+                write(json.dumps(response) + "\n")
+
+        def finished() -> None:
+            nonlocal outstanding
+            with done:
+                outstanding -= 1
+                done.notify_all()
+
+        for line in lines:
+            if not line.strip():
+                continue
+            with done:
+                outstanding += 1
+            self.handle(line, respond, finished)
+
+        with done:
+            done.wait_for(lambda: outstanding == 0)
+
+    def handle(
+        self,
+        line: str,
+        respond: Callable[[dict], None],
+        finished: Callable[[], None] = lambda: None,
+    ) -> None:
+        """
+        Handles a single request line. `respond` receives the response and
+        `finished` is called afterwards, possibly from another thread.
+        """
+        start = time.perf_counter()
+        requestId = None
+        try:
+            request = json.loads(line)
+            if isinstance(request, str):
+                request = {"facelets": request}
+            if isinstance(request, dict):
+                requestId = request.get("id")
+            facelets = request["facelets"]
+            if not isinstance(facelets, str):
+                raise TypeError("facelets must be a string")
+            improveTime = request.get("improve")
+            if improveTime is not None and (
+                isinstance(improveTime, bool)
+                or not isinstance(improveTime, (int, float))
+            ):
+                raise TypeError("improve must be a number of seconds")
+        except (ValueError, KeyError, TypeError) as error:
+            respond(_response(requestId, None, f"Malformed request: {error}", start))
+            finished()
+            return
+
+        solution = self.cache.get(facelets)
+        if solution is not None:
+            respond(_response(requestId, solution, None, start, cached=True))
+            finished()
+            return
+
+        if self._failure is not None:
+            respond(_response(requestId, None, self._failure, start))
+            finished()
+            return
+
+        self._slots.acquire()
+
+        if improveTime is not None:
+            thread = threading.Thread(
+                target=self._stream,
+                args=(requestId, facelets, improveTime, start, respond, finished),
+                daemon=True,
+            )
+            thread.start()
+            return
+
+        def complete(future: Future) -> None:
+            try:
+                result = future.result()
+                solution, error = result.solution, result.error
+            except (BrokenProcessPool, CancelledError) as exception:
+                solution, error = None, f"Solver failure: {exception!r}"
+            finally:
+                self._slots.release()
+
+            if solution is not None:
+                self.cache.put(facelets, solution)
+            respond(_response(requestId, solution, error, start))
+            finished()
+
+        try:
+            future = self.pool.submit(facelets)
+        except (BrokenProcessPool, RuntimeError) as exception:
+            # The pool is unusable from now on, later misses are refused
+            self._failure = f"Solver failure: {exception!r}"
+            self._slots.release()
+            respond(_response(requestId, None, self._failure, start))
+            finished()
+            return
+        future.add_done_callback(complete)
+
+    def _stream(
+        self,
+        requestId,
+        facelets: str,
+        improveTime: float,
+        start: float,
+        respond: Callable[[dict], None],
+        finished: Callable[[], None],
+    ) -> None:
+        """
+        Answers an anytime request from SolverPool.solutions while holding one
+        of the slots.
+        """
+        solution = error = None
+        try:
+            for result in self.pool.solutions(facelets, improveTime=improveTime):
+                if not result.ok:
+                    error = result.error
+                    break
+                solution = result.solution
+                respond(_response(requestId, solution, None, start, final=False))
+        except (BrokenProcessPool, RuntimeError) as exception:
+            self._failure = f"Solver failure: {exception!r}"
+            solution, error = None, self._failure
+        finally:
+            self._slots.release()
+
+        if solution is not None:
+            self.cache.put(facelets, solution)
+        respond(_response(requestId, solution, error, start))
+        finished()
+
+
+def _response(
+    requestId,
+    solution: str | None,
+    error: str | None,
+    start: float,
+    cached: bool = False,
+    final: bool = True,
+) -> dict:
+    return {
+        "id": requestId,
+        "solution": solution,
+        "error": error,
+        "latency": time.perf_counter() - start,
+        "cached": cached,
+        "final": final,
+    }
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        lines = (line.decode("utf-8", errors="replace") for line in self.rfile)
+
+        def write(text: str) -> None:
+            self.wfile.write(text.encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            self.server.solveServer.serveLines(lines, write)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class UnixSolveServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Serves every client connecting to the Unix socket at `address` on its own
+    thread, all sharing one SolveServer.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: str, solveServer: SolveServer) -> None:
+        if os.path.exists(address):
+            os.unlink(address)
+        self.solveServer = solveServer
+        super().__init__(address, _ConnectionHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def serveStdio(server: SolveServer) -> None:
+    def write(text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    server.serveLines(sys.stdin, write)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve cubes given as JSON lines on stdin or a Unix socket."
+    )
+    parser.add_argument(
+        "--socket", help="Listen on this Unix socket path instead of stdin."
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--max-length", type=int, default=22)
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--tables", default=TableDirectory)
+    parser.add_argument("--cache", help="SQLite file persisting solutions.")
+    parser.add_argument("--cache-capacity", type=int, default=65536)
+    args = parser.parse_args()
+
+    cache = SolutionCache(capacity=args.cache_capacity, filename=args.cache)
+    with SolverPool(args.workers, args.max_length, args.timeout, args.tables) as pool:
+        pool.warmUp()
+        server = SolveServer(pool, cache, args.max_pending)
+
+        if args.socket is None:
+            serveStdio(server)
+        else:
+            with UnixSolveServer(args.socket, server) as socketServer:
+                print(f"Listening on {args.socket}", file=sys.stderr)
+                try:
+                    socketServer.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+
+    cache.close()
@@ -1,19 +1,31 @@
 from .cubeviz import PlanarCubeVisualizer
 from .vision import (
     HSV,
+    CalibratedColorClassificationModel,
     CubeDetectionParameters,
     CubeDetectionPipeline,
     CubeDetectionResult,
+    DetectionStages,
+    DetectionTimings,
     FixedColorClassificationModel,
     HSV_Range,
+    LookupColorClassificationModel,
+    StageLatency,
+    defaultColorModel,
 )
 
 __all__ = [
     "HSV",
+    "CalibratedColorClassificationModel",
     "CubeDetectionParameters",
     "CubeDetectionPipeline",
     "CubeDetectionResult",
+    "DetectionStages",
+    "DetectionTimings",
     "FixedColorClassificationModel",
     "HSV_Range",
+    "LookupColorClassificationModel",
     "PlanarCubeVisualizer",
+    "StageLatency",
+    "defaultColorModel",
 ]
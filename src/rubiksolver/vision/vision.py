@@ -2,8 +2,17 @@
 This module contains the core logic for the computer vision pipeline
 """
 
+import hashlib
+import itertools
+import os
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from os import path
 
 import cv2 as cv
 import numpy as np
@@ -11,6 +20,13 @@ from cv2.typing import MatLike, Rect, RotatedRect
 
 from rubiksolver.cube import CubeLabel
 
+ColorTableDirectory = path.join(
+    path.expanduser("~"), ".local", "share", "rubiksolver", "colortables"
+)
+ColorModelFile = path.join(
+    path.expanduser("~"), ".local", "share", "rubiksolver", "colormodel.npz"
+)
+
 
 @dataclass
 class HSV:
@@ -62,6 +78,9 @@ class CubeDetectionResult:
         detected facelets in point format
     --  labels: the cube face label of the detected facelets
     --  meanFaceletColor: the aggregate mean color of each detected facelet
+    --  faceletConfidence: the confidence in [0, 1] of each facelet label
+    --  stageTimings: the duration in nanoseconds of each of the DetectionStages
+        and of the whole pipeline ("total")
     """
 
     frame: MatLike
@@ -73,6 +92,66 @@ class CubeDetectionResult:
     faceletContourRotatedBoundingBoxPoints: list[MatLike]
     labels: list[CubeLabel]
     meanFaceletColor: list[HSV]
+    faceletConfidence: list[float] = field(default_factory=list)
+    stageTimings: dict[str, int] = field(default_factory=dict)
+
+
+# The stages of CubeDetectionPipeline.result() in the order they run
+DetectionStages = ("preprocess", "edges", "contours", "ransac", "labels")
+
+
+@dataclass
+class StageLatency:
+    """
+    Latency percentiles of a pipeline stage over the recent frames.
+
+    attributes:
+    --  p50: median latency in milliseconds
+    --  p95: 95th percentile latency in milliseconds
+    --  p99: 99th percentile latency in milliseconds
+    --  frames: number of frames the percentiles are computed over
+    """
+
+    p50: float
+    p95: float
+    p99: float
+    frames: int
+
+
+class DetectionTimings:
+    """
+    Rolling per-stage latencies of the last `window` frames of a
+    CubeDetectionPipeline. Frames are added and statistics read from any
+    thread.
+    """
+
+    def __init__(self, window: int = 300):
+        self.window = window
+        self._lock = threading.Lock()
+        self._timings: dict[str, deque[int]] = {}
+
+    def add(self, stageTimings: dict[str, int]) -> None:
+        with self._lock:
+            for stage, duration in stageTimings.items():
+                if stage not in self._timings:
+                    self._timings[stage] = deque(maxlen=self.window)
+                self._timings[stage].append(duration)
+
+    def statistics(self) -> dict[str, StageLatency]:
+        with self._lock:
+            timings = {stage: list(values) for stage, values in self._timings.items()}
+
+        statistics = {}
+        for stage, values in timings.items():
+            p50, p95, p99 = np.percentile(np.array(values) / 1e6, [50, 95, 99])
+            statistics[stage] = StageLatency(
+                float(p50), float(p95), float(p99), len(values)
+            )
+        return statistics
+
+    def clear(self) -> None:
+        with self._lock:
+            self._timings.clear()
 
 
 @dataclass
@@ -215,6 +294,43 @@ class ColorClassificationModel(ABC):
         """
         pass
 
+    def classifyMany(self, hsv: np.ndarray) -> np.ndarray:
+        """
+        Classifies an array of HSV values of shape (..., 3), e.g. the medians
+        of all facelets or a whole HSV frame.
+
+        The default implementation calls classify for every value, models
+        should override it with a vectorized version.
+
+        parameters:
+        hsv - array of HSV values
+
+        returns:
+        np.ndarray - int8 array of shape (...) holding CubeLabel values
+        """
+        hsv = np.asarray(hsv)
+        labels = [
+            self.classify(HSV(*color)).value for color in hsv.reshape(-1, 3).tolist()
+        ]
+        return np.array(labels, dtype=np.int8).reshape(hsv.shape[:-1])
+
+    def classifyWithConfidence(self, hsv: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Like classifyMany, additionally returning the confidence in [0, 1] of
+        every label. The default confidence is 1 for labeled and 0 for
+        unlabeled values.
+        """
+        labels = self.classifyMany(hsv)
+        return labels, (labels != CubeLabel.UNLABELD.value).astype(np.float64)
+
+    def fingerprint(self) -> str | None:
+        """
+        Returns a string that changes whenever the classification changes,
+        used to cache lookup tables of the model on disk. None disables the
+        caching.
+        """
+        return None
+
 
 class FixedColorClassificationModel(ColorClassificationModel):
     """
@@ -240,6 +356,35 @@ class FixedColorClassificationModel(ColorClassificationModel):
         print(hsv)
         return CubeLabel.UNLABELD
 
+    def classifyMany(self, hsv: np.ndarray) -> np.ndarray:
+        hsv = np.asarray(hsv)
+        hue, saturation, value = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+        labels = np.full(hsv.shape[:-1], CubeLabel.UNLABELD.value, dtype=np.int8)
+        unlabeled = np.ones(hsv.shape[:-1], dtype=bool)
+
+        # The first matching range wins, like in classify
+        for label, range in FixedColorClassificationModel.ColorLabelMap.items():
+            lower, upper = range.lower, range.upper
+            match = (
+                unlabeled
+                & (lower.saturation <= saturation)
+                & (saturation <= upper.saturation)
+                & (lower.value <= value)
+                & (value <= upper.value)
+            )
+            if lower.hue <= upper.hue:
+                match &= (lower.hue <= hue) & (hue <= upper.hue)
+            else:
+                match &= (hue <= upper.hue) | (hue >= lower.hue)
+
+            labels[match] = label.value
+            unlabeled &= ~match
+
+        return labels
+
+    def fingerprint(self) -> str | None:
+        return repr(list(FixedColorClassificationModel.ColorLabelMap.items()))
+
     @staticmethod
     def _hsvInRange(color: HSV, lower: HSV, upper: HSV) -> bool:
         if not (
@@ -254,6 +399,243 @@ class FixedColorClassificationModel(ColorClassificationModel):
             return color.hue <= upper.hue or color.hue >= lower.hue
 
 
+def hsvFeatures(hsv: np.ndarray) -> np.ndarray:
+    """
+    Maps OpenCV HSV values of shape (..., 3) to points (s cos h, s sin h, v) of
+    the HSV cone, in which hues close to 0 and 180 are close to each other.
+    """
+    hsv = np.asarray(hsv, dtype=np.float64)
+    angle = hsv[..., 0] * (np.pi / 90.0)
+    saturation = hsv[..., 1]
+    return np.stack(
+        [saturation * np.cos(angle), saturation * np.sin(angle), hsv[..., 2]], -1
+    )
+
+
+class CalibratedColorClassificationModel(ColorClassificationModel):
+    """
+    A classifier with one Gaussian per cube color in the space of hsvFeatures,
+    fitted to facelet colors collected in debug mode.
+
+    A value gets the label of the most likely Gaussian and the posterior
+    probability of that label as confidence. Values farther than
+    `rejectDistance` (in standard deviations) from every mean stay unlabeled.
+    A "centroid" model shares one isotropic covariance between all colors,
+    which makes it a nearest centroid classifier.
+    """
+
+    Kinds = ("gaussian", "centroid")
+
+    def __init__(
+        self,
+        means: np.ndarray,
+        covariances: np.ndarray,
+        kind: str = "gaussian",
+        rejectDistance: float = 5.0,
+    ):
+        if kind not in CalibratedColorClassificationModel.Kinds:
+            raise ValueError(f"Unknown color model kind {kind!r}")
+        self.means = np.asarray(means, dtype=np.float64).reshape(6, 3)
+        self.covariances = np.asarray(covariances, dtype=np.float64).reshape(6, 3, 3)
+        self.kind = kind
+        self.rejectDistance = rejectDistance
+
+        self._precisions = np.linalg.inv(self.covariances)
+        self._logDeterminants = np.linalg.slogdet(self.covariances)[1]
+
+    @classmethod
+    def fit(
+        cls,
+        samples: np.ndarray,
+        labels: np.ndarray | None = None,
+        kind: str = "gaussian",
+        iterations: int = 20,
+        rejectDistance: float = 5.0,
+    ) -> "CalibratedColorClassificationModel":
+        """
+        Fit a model to (N, 3) HSV samples. Without `labels` the samples are
+        first labeled by FixedColorClassificationModel, then relabeled by the
+        fitted model until the labels no longer change (hard EM). Samples the
+        fitted model rejects are left out of the next fit.
+
+        Raises ValueError if some color has fewer than 4 samples.
+        """
+        samples = np.asarray(samples).reshape(-1, 3)
+        refine = labels is None
+        if refine:
+            labels = FixedColorClassificationModel().classifyMany(samples)
+        labels = np.asarray(labels)
+        features = hsvFeatures(samples)
+
+        for _ in range(iterations if refine else 1):
+            model = cls._fitLabeled(features, labels, kind, rejectDistance)
+            # Outliers stay unlabeled and are left out of the next fit
+            relabeled = model.classifyMany(samples).astype(labels.dtype)
+            if np.array_equal(relabeled, labels):
+                break
+            labels = relabeled
+
+        return model
+
+    @classmethod
+    def _fitLabeled(
+        cls, features: np.ndarray, labels: np.ndarray, kind: str, rejectDistance: float
+    ) -> "CalibratedColorClassificationModel":
+        means = np.zeros((6, 3))
+        covariances = np.zeros((6, 3, 3))
+        for label in range(6):
+            points = features[labels == label]
+            if len(points) < 4:
+                raise ValueError(
+                    f"Need at least 4 samples of {CubeLabel(label).name}, "
+                    f"got {len(points)}"
+                )
+            means[label] = points.mean(axis=0)
+            covariances[label] = np.cov(points, rowvar=False)
+
+        if kind == "centroid":
+            deviations = features[labels >= 0] - means[labels[labels >= 0]]
+            covariances[:] = np.eye(3) * np.mean(deviations**2)
+
+        # Keeps the covariances invertible when a color barely varies
+        covariances += np.eye(3)
+        return cls(means, covariances, kind, rejectDistance)
+
+    @classmethod
+    def load(
+        cls, filename: str = ColorModelFile
+    ) -> "CalibratedColorClassificationModel":
+        with np.load(filename) as data:
+            return cls(
+                data["means"],
+                data["covariances"],
+                str(data["kind"]),
+                float(data["rejectDistance"]),
+            )
+
+    def save(self, filename: str = ColorModelFile) -> None:
+        os.makedirs(path.dirname(path.abspath(filename)), exist_ok=True)
+        np.savez(
+            filename,
+            means=self.means,
+            covariances=self.covariances,
+            kind=self.kind,
+            rejectDistance=self.rejectDistance,
+        )
+
+    def classify(self, hsv: HSV) -> CubeLabel:
+        label = self.classifyMany(np.array([hsv.hue, hsv.saturation, hsv.value]))
+        return CubeLabel(int(label))
+
+    def classifyMany(self, hsv: np.ndarray) -> np.ndarray:
+        return self.classifyWithConfidence(hsv)[0]
+
+    def classifyWithConfidence(self, hsv: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        hsv = np.asarray(hsv)
+        distances = self._distances(hsvFeatures(hsv).reshape(-1, 3))
+        logLikelihoods = -0.5 * (distances + self._logDeterminants)
+
+        best = logLikelihoods.argmax(axis=1)
+        rows = np.arange(len(best))
+        likelihoods = np.exp(logLikelihoods - logLikelihoods[rows, best][:, None])
+        confidence = 1.0 / likelihoods.sum(axis=1)
+
+        rejected = distances[rows, best] > self.rejectDistance**2
+        labels = np.where(rejected, CubeLabel.UNLABELD.value, best).astype(np.int8)
+        confidence[rejected] = 0.0
+        return labels.reshape(hsv.shape[:-1]), confidence.reshape(hsv.shape[:-1])
+
+    def fingerprint(self) -> str | None:
+        parameters = np.concatenate(
+            [self.means.ravel(), self.covariances.ravel(), [self.rejectDistance]]
+        )
+        return f"{self.kind}:{hashlib.sha1(parameters.tobytes()).hexdigest()}"
+
+    def _distances(self, features: np.ndarray) -> np.ndarray:
+        """
+        Squared Mahalanobis distances of (N, 3) features to the 6 means.
+        """
+        deviations = features[:, None, :] - self.means[None]
+        return np.einsum("nki,kij,nkj->nk", deviations, self._precisions, deviations)
+
+
+class LookupColorClassificationModel(ColorClassificationModel):
+    """
+    A classifier that looks labels up in a (256, 256, 256) table holding the
+    label of every 8-bit HSV value, so classifying any number of values is a
+    single array index.
+
+    The table is built once from another model and, if that model has a
+    fingerprint, cached on disk and memory mapped on later runs.
+    """
+
+    def __init__(
+        self, model: ColorClassificationModel, directory: str = ColorTableDirectory
+    ):
+        self.model = model
+        self.table = LookupColorClassificationModel.loadOrBuild(model, directory)
+
+    def classify(self, hsv: HSV) -> CubeLabel:
+        return CubeLabel(int(self.table[hsv.hue, hsv.saturation, hsv.value]))
+
+    def classifyMany(self, hsv: np.ndarray) -> np.ndarray:
+        hsv = np.asarray(hsv)
+        return self.table[hsv[..., 0], hsv[..., 1], hsv[..., 2]]
+
+    def fingerprint(self) -> str | None:
+        return self.model.fingerprint()
+
+    @staticmethod
+    def buildTable(model: ColorClassificationModel) -> np.ndarray:
+        """
+        Classify every 8-bit HSV value with `model`, one hue at a time.
+        """
+        table = np.empty((256, 256, 256), dtype=np.int8)
+        saturation, value = np.meshgrid(np.arange(256), np.arange(256), indexing="ij")
+        for hue in range(256):
+            grid = np.stack([np.full_like(saturation, hue), saturation, value], -1)
+            table[hue] = model.classifyMany(grid)
+        return table
+
+    @staticmethod
+    def loadOrBuild(model: ColorClassificationModel, directory: str) -> np.ndarray:
+        fingerprint = model.fingerprint()
+        if fingerprint is None:
+            return LookupColorClassificationModel.buildTable(model)
+
+        digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+        filename = path.join(directory, f"{digest}.npy")
+        try:
+            return np.load(filename, mmap_mode="r")
+        except (OSError, ValueError):
+            pass
+
+        table = LookupColorClassificationModel.buildTable(model)
+        # Written under a temporary name so readers never see a partial table.
+        # A table that cannot be cached is still used, from memory.
+        staging = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            descriptor, staging = tempfile.mkstemp(dir=directory, suffix=".npy")
+            with os.fdopen(descriptor, "wb") as file:
+                np.save(file, table)
+            os.replace(staging, filename)
+        except OSError:
+            if staging is not None and path.exists(staging):
+                os.unlink(staging)
+        return table
+
+
+def defaultColorModel(filename: str = ColorModelFile) -> ColorClassificationModel:
+    """
+    Returns the calibrated model saved by `calibrate --fit`, or the fixed
+    ranges behind a lookup table if there is none.
+    """
+    if path.exists(filename):
+        return CalibratedColorClassificationModel.load(filename)
+    return LookupColorClassificationModel(FixedColorClassificationModel())
+
+
 class CubeDetectionPipeline:
     """
     The main Rubik's cube detection pipeline.
@@ -261,16 +643,25 @@ class CubeDetectionPipeline:
     This class performs preprocessing, edge detection, contour
     filtering, RANSAC grid fitting, and color labeling of detected
     facelets in a given image frame.
+
+    The grid fitting is seeded, so the same frame always yields the same
+    facelets.
     """
 
+    RANSACMaxIterations = 100
+    RANSACBatchSize = 20
+    RANSACConfidence = 0.99
+
     def __init__(
         self,
         faceletColorClassifier: ColorClassificationModel,
         detectionParameters: CubeDetectionParameters,
+        seed: int = 0,
     ):
         self.faceletColorClassifier = faceletColorClassifier
         self.frame: MatLike | None = None
         self.detectionParameters: CubeDetectionParameters = detectionParameters
+        self.seed = seed
 
     def forward(self, frame: MatLike) -> None:
         """
@@ -282,7 +673,8 @@ class CubeDetectionPipeline:
         """
         Executes the full pipeline: preprocessing → edge detection →
         contour extraction → RANSAC filtering → color labeling.
-        Returns a CubeDetectionResult with all extracted information.
+        Returns a CubeDetectionResult with all extracted information and the
+        time spent in each stage.
         """
 
         if self.frame is None:
@@ -291,11 +683,25 @@ class CubeDetectionPipeline:
                 "Use forward(frame) to set the frame."
             )
 
+        timings: dict[str, int] = {}
+        start = stage_start = time.perf_counter_ns()
+
+        def lap(stage: str) -> None:
+            nonlocal stage_start
+            now = time.perf_counter_ns()
+            timings[stage] = now - stage_start
+            stage_start = now
+
         frame_preprocessed = self.preprocessFrame(self.frame)
+        lap("preprocess")
         frame_edges = self.getCannyEdges(frame_preprocessed)
+        lap("edges")
         candidates = self.findCandidateFacelets(frame_edges)
+        lap("contours")
         facelets = self.faceletCandidateRANSAC(candidates)
-        labels, mean_colors = self.labelFacelets(self.frame, facelets)
+        lap("ransac")
+        labels, mean_colors, confidences = self.labelFacelets(self.frame, facelets)
+        lap("labels")
 
         rects: list[Rect] = [cv.boundingRect(facelet) for facelet in facelets]
         rects_rotated: list[RotatedRect] = [
@@ -307,6 +713,7 @@ class CubeDetectionPipeline:
         ]
 
         frame_edges = cv.cvtColor(frame_edges, cv.COLOR_GRAY2BGR)
+        timings["total"] = time.perf_counter_ns() - start
 
         return CubeDetectionResult(
             self.frame,
@@ -318,6 +725,8 @@ class CubeDetectionPipeline:
             rects_rotated_points,
             labels,
             mean_colors,
+            confidences,
+            timings,
         )
 
     def preprocessFrame(self, frame: MatLike) -> MatLike:
@@ -403,10 +812,18 @@ class CubeDetectionPipeline:
 
         return list(candidates)
 
-    def faceletCandidateRANSAC(self, candidates: list[MatLike]) -> list[MatLike]:
+    def faceletCandidateRANSAC(
+        self, candidates: list[MatLike], seed: int | None = None
+    ) -> list[MatLike]:
         """
         Apply RANSAC to fit detected facelet centroids into a
         3x3 grid pattern consistent with a cube face layout.
+
+        Every hypothesis maps 4 grid points, no three of them collinear, onto
+        4 random centroids. Hypotheses are drawn and scored in batches, and
+        the search stops as soon as the best inlier ratio makes finding a
+        better grid unlikely. The same candidates and seed always give the
+        same facelets; `seed` defaults to the seed of the pipeline.
         """
         if len(candidates) <= 4:
             return candidates
@@ -421,33 +838,12 @@ class CubeDetectionPipeline:
         centroids = np.array(
             [centroid(candidate) for candidate in candidates], dtype=np.float32
         )
-
-        best_inliers: list[int] = []
-        grid = CubeDetectionPipeline.homographyGrid()
-        for _ in range(100):
-            indices = np.random.choice(len(centroids), 4, replace=False)
-            H, _ = cv.findHomography(grid[:4], centroids[indices], cv.RANSAC, 5.0)
-
-            if H is None:
-                continue
-
-            projected = cv.perspectiveTransform(grid.reshape(-1, 1, 2), H).reshape(
-                -1, 2
-            )
-
-            errors = np.linalg.norm(centroids[:, None] - projected[None, :], axis=2)
-            min_err = np.min(errors, axis=1)
-
-            inliers = [
-                i
-                for i, e in enumerate(min_err)
-                if e < self.detectionParameters.homographyRANSACMaxError
-            ]
-            if len(inliers) > len(best_inliers):
-                best_inliers = inliers
-
-                if len(inliers) == 9:
-                    break
+        inliers = CubeDetectionPipeline.fitGrid(
+            centroids,
+            self.detectionParameters.homographyRANSACMaxError,
+            np.random.default_rng(self.seed if seed is None else seed),
+        )
+        best_inliers: list[int] = np.flatnonzero(inliers).tolist()
 
         num_inliers = len(best_inliers)
 
@@ -466,31 +862,141 @@ class CubeDetectionPipeline:
 
         return [candidates[i] for i in best_inliers]
 
+    @staticmethod
+    def fitGrid(
+        centroids: np.ndarray, maxError: float, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Returns the inlier mask of the (N, 2) centroids, N > 4, for the grid
+        hypothesis best fitting the centroids within `maxError` of one of its
+        points.
+
+        Every sample of 4 centroids, in angular order, is matched with every
+        quadruple of grid points it could be the image of. All hypotheses of a
+        batch of samples are projected and scored as one array.
+        """
+        count = len(centroids)
+        frames = _gridFrames()
+        quadruples = len(frames) // 9
+        square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+        squared_norms = (centroids**2).sum(axis=1)
+
+        best = np.zeros(count, dtype=bool)
+        best_score = 0.0
+        required = CubeDetectionPipeline.RANSACMaxIterations
+        iterations = 0
+        while iterations < required:
+            size = CubeDetectionPipeline.RANSACBatchSize
+            samples = centroids[np.argsort(rng.random((size, count)), axis=1)[:, :4]]
+            iterations += size
+
+            # Samples with three (nearly) collinear centroids give rank deficient
+            # homographies, which squash the grid onto a line or a point that
+            # every centroid on it would fit
+            samples = samples[~_hasCollinearTriple(samples)]
+            size = len(samples)
+            if size == 0:
+                continue
+            samples = np.take_along_axis(samples, _angularOrder(samples)[..., None], 1)
+            homographies = np.array(
+                [cv.getPerspectiveTransform(square, sample) for sample in samples],
+                dtype=np.float32,
+            )
+
+            # All grid points of all hypotheses projected by a single product,
+            # (quadruples * 9, batch, 2), and their squared distances to every
+            # centroid, (quadruples * 9, batch, N). Points mapped to infinity
+            # by a hypothesis are moved far away instead.
+            projected = frames @ homographies.transpose(2, 0, 1).reshape(3, -1)
+            projected = projected.reshape(-1, size, 3)
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                projected = projected[..., :2] / projected[..., 2:]
+            np.nan_to_num(projected, copy=False, nan=1e9, posinf=1e9, neginf=-1e9)
+            distances = projected @ (-2.0 * centroids.T)
+            distances += (projected**2).sum(axis=2)[..., None]
+            distances += squared_norms
+
+            # (batch * quadruples, N) distances to the nearest grid point
+            errors = distances.reshape(quadruples, 9, size, count).min(axis=1)
+            errors = errors.transpose(1, 0, 2).reshape(-1, count)
+            inliers = errors < maxError**2
+
+            # Inliers score by how well they fit, so that among hypotheses with
+            # as many inliers the tightest grid wins
+            scores = np.where(inliers, 1.0 - errors / maxError**2, 0.0).sum(axis=1)
+            candidate = int(scores.argmax())
+            if scores[candidate] <= best_score:
+                continue
+            best, best_score = inliers[candidate], scores[candidate]
+
+            # The number of samples needed to draw 4 inliers at least once with
+            # the configured confidence
+            all_inliers = (best.sum() / count) ** 4
+            if all_inliers >= 1.0:
+                break
+            needed = np.log(1.0 - CubeDetectionPipeline.RANSACConfidence) / np.log(
+                1.0 - all_inliers
+            )
+            required = min(required, int(np.ceil(needed)))
+
+        return best
+
     def labelFacelets(
         self, frame: MatLike, facelets: list[MatLike]
-    ) -> tuple[list[CubeLabel], list[HSV]]:
+    ) -> tuple[list[CubeLabel], list[HSV], list[float]]:
         """
         Compute the median HSV color for each facelet region and
-        classify it using the provided color classifier.
+        classify it using the provided color classifier, together with the
+        confidence of each label.
         """
-        frame_hsv = cv.cvtColor(frame, cv.COLOR_BGR2HSV)
+        if len(facelets) == 0:
+            return [], [], []
 
-        labels: list[CubeLabel] = []
-        mean_colors: list[HSV] = []
+        medians = CubeDetectionPipeline.faceletMedians(frame, facelets).astype(np.int64)
+        mean_colors = [HSV(*median) for median in medians.tolist()]
+        codes, confidences = self.faceletColorClassifier.classifyWithConfidence(medians)
+        labels = [CubeLabel(int(code)) for code in codes]
 
-        for facelet in facelets:
-            mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-            cv.drawContours(mask, [facelet], -1, (255,), -1)
+        return labels, mean_colors, confidences.tolist()
+
+    @staticmethod
+    def faceletMedians(frame: MatLike, facelets: list[MatLike]) -> np.ndarray:
+        """
+        Compute the (N, 3) median HSV colors of the pixels inside each facelet
+        contour of an 8-bit BGR frame.
 
-            pixels = frame_hsv[mask == 255]
+        Only the bounding rectangle of all facelets is converted to HSV. The
+        facelets are drawn into one label image of that rectangle, each with
+        its own index, and the medians are read off per-facelet histograms
+        built with a single bincount.
+        """
+        x, y, w, h = cv.boundingRect(np.concatenate(facelets))
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame.shape[1]), min(y + h, frame.shape[0])
+
+        roi_hsv = cv.cvtColor(frame[y0:y1, x0:x1], cv.COLOR_BGR2HSV)
+        label_image = np.zeros(roi_hsv.shape[:2], dtype=np.int32)
+        for i, facelet in enumerate(facelets):
+            cv.drawContours(
+                label_image, [facelet], -1, (i + 1,), cv.FILLED, offset=(-x0, -y0)
+            )
 
-            med = np.median(pixels, axis=0)
-            hsv = HSV(*(tuple(map(int, med))))
+        inside = label_image > 0
+        index = label_image[inside].astype(np.int64) - 1
+        pixels = roi_hsv[inside]
 
-            labels.append(self.faceletColorClassifier.classify(hsv))
-            mean_colors.append(hsv)
+        # One 256 bin histogram per channel and facelet
+        count = len(facelets)
+        keys = (np.arange(3) * count + index[:, None]) * 256 + pixels
+        histograms = np.bincount(keys.ravel(), minlength=3 * count * 256).reshape(
+            3, count, 256
+        )
 
-        return labels, mean_colors
+        cumulative = histograms.cumsum(axis=2)
+        totals = cumulative[:, :, -1:]
+        lower = (cumulative > (totals - 1) // 2).argmax(axis=2)
+        upper = (cumulative > totals // 2).argmax(axis=2)
+        return ((lower + upper) / 2).T
 
     def getFinishedFrame(self, frame: MatLike) -> MatLike:
         """
@@ -523,3 +1029,66 @@ class CubeDetectionPipeline:
                 [1.0, 1.0],
             ]
         )
+
+
+def _angularOrder(points: np.ndarray) -> np.ndarray:
+    """
+    Indices sorting each row of a (B, 4, 2) array by the angle of the points
+    around the mean of the row.
+    """
+    offsets = points - points.mean(axis=1, keepdims=True)
+    return np.argsort(np.arctan2(offsets[..., 1], offsets[..., 0]), axis=1)
+
+
+# The 4 triples of points of a sample of 4 centroids
+_SampleTriples = np.array(list(itertools.combinations(range(4), 3)))
+
+
+def _hasCollinearTriple(points: np.ndarray) -> np.ndarray:
+    """
+    Whether any three of the 4 points of each row of a (B, 4, 2) array span a
+    triangle of less than half a square pixel.
+    """
+    triangles = points[:, _SampleTriples]
+    u = triangles[:, :, 1] - triangles[:, :, 0]
+    v = triangles[:, :, 2] - triangles[:, :, 0]
+    cross = u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+    return (np.abs(cross) < 1.0).any(axis=1)
+
+
+@lru_cache(maxsize=None)
+def _gridFrames() -> np.ndarray:
+    """
+    The homogeneous (Q * 9, 3) grid points in the frames of the Q ordered
+    quadruples of grid points a sample of 4 facelets can show: no three points
+    collinear, in angular order, and distinct up to rotations of the grid. The
+    frame of a quadruple maps its points onto the corners of the unit square.
+    """
+    grid = CubeDetectionPipeline.homographyGrid()
+    quadruples: set[tuple[int, ...]] = set()
+    for combination in itertools.combinations(range(9), 4):
+        rows = [divmod(i, 3) for i in combination]
+        if any(
+            (c1 - c0) * (r2 - r0) == (c2 - c0) * (r1 - r0)
+            for (r0, c0), (r1, c1), (r2, c2) in itertools.combinations(rows, 3)
+        ):
+            continue
+        order = _angularOrder(grid[None, list(combination)])[0]
+        ordered = [combination[i] for i in order]
+        for shift in range(4):
+            quadruple = ordered[shift:] + ordered[:shift]
+            # A quarter turn maps the grid point (row, col) to (col, 2 - row)
+            rotations = [quadruple]
+            for _ in range(3):
+                rotations.append([3 * (i % 3) + 2 - i // 3 for i in rotations[-1]])
+            quadruples.add(min(tuple(rotation) for rotation in rotations))
+
+    square = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+    points = np.hstack([grid, np.ones((9, 1))])
+    frames = []
+    for quadruple in sorted(quadruples):
+        frame = cv.getPerspectiveTransform(
+            grid[list(quadruple)].astype(np.float32), square
+        )
+        frames.append(points @ frame.T)
+    return np.concatenate(frames).astype(np.float32)
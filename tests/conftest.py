@@ -0,0 +1,10 @@
+import pytest
+
+from rubiksolver.cube import SolverTables
+
+
+@pytest.fixture(scope="session")
+def table_directory(tmp_path_factory) -> str:
+    directory = str(tmp_path_factory.mktemp("solver") / "tables")
+    SolverTables.build().save(directory)
+    return directory
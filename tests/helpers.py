@@ -0,0 +1,18 @@
+import random
+
+from rubiksolver.cube import CubeLabel, CubeMove, RubiksCube, compileNotation
+
+SOLVED = "UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB"
+
+
+def scramble(seed: int, length: int = 20) -> str:
+    rng = random.Random(seed)
+    cube = RubiksCube()
+    cube.state = [CubeLabel(i // 9) for i in range(54)]
+    for _ in range(length):
+        cube.applyMove(rng.choice(list(CubeMove)))
+    return str(cube)
+
+
+def isSolution(facelets: str, solution: str) -> bool:
+    return "".join(compileNotation(solution).applyState(list(facelets))) == SOLVED
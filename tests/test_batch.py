@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from rubiksolver.cube import CubeBatch, CubeLabel, CubeMove, RubiksCube
+
+SCRAMBLE = [CubeMove.R, CubeMove.UPRIME, CubeMove.F, CubeMove.D, CubeMove.BPRIME]
+
+
+@pytest.fixture
+def solved_cube() -> RubiksCube:
+    cube = RubiksCube()
+    cube.state = [CubeLabel(i // 9) for i in range(54)]
+    return cube
+
+
+def test_string_round_trip(solved_cube: RubiksCube):
+    for move in SCRAMBLE:
+        solved_cube.applyMove(move)
+
+    facelets = [str(solved_cube), str(RubiksCube())]
+    batch = CubeBatch.fromStrings(facelets)
+
+    assert batch.states.shape == (2, 54)
+    assert batch.states.dtype == np.uint8
+    assert batch.toStrings() == facelets
+
+
+def test_cube_round_trip(solved_cube: RubiksCube):
+    cubes = [solved_cube, RubiksCube()]
+    batch = CubeBatch.fromCubes(cubes)
+
+    assert [cube.state for cube in batch.toCubes()] == [cube.state for cube in cubes]
+
+
+def test_fromStrings_rejects_invalid():
+    with pytest.raises(ValueError):
+        CubeBatch.fromStrings(["U" * 53])
+
+    with pytest.raises(ValueError):
+        CubeBatch.fromStrings(["Q" * 54])
+
+
+@pytest.mark.parametrize("move", list(CubeMove))
+def test_applyMove_matches_cube(solved_cube: RubiksCube, move: CubeMove):
+    batch = CubeBatch.solved(3)
+    batch.applyMoves(SCRAMBLE)
+    batch.applyMove(move)
+
+    for scramble in SCRAMBLE:
+        solved_cube.applyMove(scramble)
+    solved_cube.applyMove(move)
+
+    assert batch.toStrings() == [str(solved_cube)] * 3
+
+
+def test_applyMove_per_row(solved_cube: RubiksCube):
+    moves = list(CubeMove)
+    batch = CubeBatch.solved(len(moves))
+    batch.applyMove(np.array([move.value for move in moves]))
+
+    expected = []
+    for move in moves:
+        cube = RubiksCube()
+        cube.state = list(solved_cube.state)
+        cube.applyMove(move)
+        expected.append(str(cube))
+
+    assert batch.toStrings() == expected
+    assert not batch.isSolved().any()
+
+
+def test_isSolved():
+    batch = CubeBatch.solved(2)
+    batch.applyMove(np.array([CubeMove.R.value, CubeMove.R.value]))
+    batch.applyMove(np.array([CubeMove.RPRIME.value, CubeMove.U.value]))
+
+    assert batch.isSolved().tolist() == [True, False]
@@ -0,0 +1,42 @@
+import json
+
+from rubiksolver.benchmark import benchmarkSolve, runBenchmarks
+
+
+def test_runBenchmarks_report_is_json():
+    report = runBenchmarks(moves=200, states=20, solves=2, seed=0, solvers=["kociemba"])
+
+    names = [result["name"] for result in report["benchmarks"]]
+    assert names == [
+        "cube.applyMove",
+        "batch.applyMove",
+        "cube.__str__",
+        "batch.toStrings",
+        "cube.parseSolution",
+        "solve.kociemba",
+    ]
+    assert all(result["rate"] > 0 for result in report["benchmarks"])
+    assert set(report["benchmarks"][-1]["latency"]) == {
+        "mean",
+        "p50",
+        "p90",
+        "p99",
+        "max",
+    }
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_benchmarkSolve_counts_timeouts():
+    calls = []
+
+    def solver(facelets: str) -> str:
+        calls.append(facelets)
+        if len(calls) % 2:
+            raise TimeoutError("The two-phase search timed out")
+        return ""
+
+    result = benchmarkSolve("solve.flaky", solver, 4, seed=0)
+
+    assert result.operations == 4
+    assert result.timeouts == 2
+    assert result.latency["max"] >= 0
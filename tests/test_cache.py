@@ -0,0 +1,74 @@
+import pytest
+
+from rubiksolver.cube import SolutionCache
+
+
+class CountingSolver:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, facelets: str) -> str:
+        self.calls.append(facelets)
+        if facelets == "invalid":
+            raise ValueError("invalid cube")
+        return f"solution of {facelets}"
+
+
+@pytest.fixture
+def solver() -> CountingSolver:
+    return CountingSolver()
+
+
+def test_repeat_solves_hit_cache(solver: CountingSolver):
+    cache = SolutionCache(solver, capacity=4)
+
+    assert cache("a") == "solution of a"
+    assert cache("a") == "solution of a"
+    assert solver.calls == ["a"]
+
+    statistics = cache.statistics()
+    assert (statistics.hits, statistics.misses, statistics.size) == (1, 1, 1)
+    assert statistics.hitRate == 0.5
+
+
+def test_lru_eviction(solver: CountingSolver):
+    cache = SolutionCache(solver, capacity=2)
+    cache("a")
+    cache("b")
+    cache("a")
+    cache("c")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.statistics().evictions == 1
+
+
+def test_errors_are_not_cached(solver: CountingSolver):
+    cache = SolutionCache(solver)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache("invalid")
+
+    assert solver.calls == ["invalid", "invalid"]
+    assert len(cache) == 0
+
+
+def test_disk_tier_survives_restart(tmp_path, solver: CountingSolver):
+    filename = str(tmp_path / "cache" / "solutions.sqlite3")
+    cache = SolutionCache(solver, filename=filename)
+    cache("a")
+    cache.close()
+
+    restarted = SolutionCache(solver, filename=filename)
+
+    assert restarted("a") == "solution of a"
+    assert solver.calls == ["a"]
+    assert restarted.statistics().diskHits == 1
+    restarted.close()
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        SolutionCache(capacity=0)
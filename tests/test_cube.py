@@ -1,6 +1,14 @@
 import pytest
 
-from rubiksolver.cube import CubeFace, CubeLabel, CubePosition, Facelet, RubiksCube
+from rubiksolver.cube import (
+    CubeFace,
+    CubeLabel,
+    CubeMove,
+    CubePosition,
+    Facelet,
+    MoveTimeline,
+    RubiksCube,
+)
 
 
 @pytest.fixture
@@ -307,3 +315,70 @@ def test_getFaceletLabel(cube_initalized: RubiksCube, moves: list[str]):
             )
 
     assert current_state == cube_initalized.state
+
+
+@pytest.mark.parametrize("move", list(CubeMove))
+def test_applyMove_matches_facelet_swaps(cube_initalized: RubiksCube, move: CubeMove):
+    for scramble in [CubeMove.R, CubeMove.UPRIME, CubeMove.F, CubeMove.L]:
+        cube_initalized.applyMove(scramble)
+
+    reference = RubiksCube()
+    reference.state = list(cube_initalized.state)
+    face, turns = RubiksCube.MoveTurns[move]
+    if turns == 3:
+        reference._rotateFaceCCW(face)
+    else:
+        for _ in range(turns):
+            reference._rotateFaceCW(face)
+
+    state = cube_initalized.state
+    cube_initalized.applyMove(move)
+
+    assert cube_initalized.state == reference.state
+    assert cube_initalized.state is state
+
+
+def test_isLabeled_and_setSolution(cube: RubiksCube, cube_initalized: RubiksCube):
+    assert not cube.isLabeled()
+    assert cube_initalized.isLabeled()
+
+    cube_initalized.setSolution("R U2 F'")
+    assert cube_initalized.solution is not None
+    assert cube_initalized.solution.moves == [CubeMove.R, CubeMove.U2, CubeMove.FPRIME]
+
+
+@pytest.mark.parametrize("interval", [1, 3, 8, 100])
+def test_timeline_seek(cube_initalized: RubiksCube, interval: int):
+    moves = [
+        CubeMove.R,
+        CubeMove.U2,
+        CubeMove.FPRIME,
+        CubeMove.L,
+        CubeMove.D2,
+        CubeMove.BPRIME,
+        CubeMove.U,
+        CubeMove.R2,
+        CubeMove.F,
+    ]
+    timeline = MoveTimeline(moves, list(cube_initalized.state), interval)
+
+    expected = [list(cube_initalized.state)]
+    for move in moves:
+        cube_initalized.applyMove(move)
+        expected.append(list(cube_initalized.state))
+
+    for position in [5, 0, 9, 3, 8, 1]:
+        assert timeline.seek(position) == expected[position]
+        assert timeline.currentPosition == position
+
+    timeline.seek(4)
+    assert timeline.next() == moves[4]
+    assert timeline.prev() == CubeMove.D2
+
+    with pytest.raises(IndexError):
+        timeline.seek(10)
+
+
+def test_timeline_seek_requires_state():
+    with pytest.raises(ValueError):
+        MoveTimeline([CubeMove.U]).seek(1)
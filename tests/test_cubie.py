@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from rubiksolver.cube import (
+    CubeLabel,
+    CubeMove,
+    CubieCoordinates,
+    CubieCube,
+    MoveTables,
+    RubiksCube,
+)
+from rubiksolver.cube.coord import (
+    N_CORNERS,
+    N_SLICE_SORTED,
+    MoveCubies,
+    Phase2Moves,
+    decodePermutation,
+    decodeSliceSorted,
+    encodePermutation,
+    encodeSliceSorted,
+    udEdgesCoordinate,
+)
+
+SCRAMBLE = [
+    CubeMove.R,
+    CubeMove.UPRIME,
+    CubeMove.F,
+    CubeMove.D,
+    CubeMove.BPRIME,
+    CubeMove.L,
+    CubeMove.U,
+    CubeMove.F,
+    CubeMove.RPRIME,
+]
+
+
+@pytest.fixture(scope="module")
+def move_tables() -> MoveTables:
+    return MoveTables.build()
+
+
+@pytest.fixture
+def scrambled() -> CubieCube:
+    cube = CubieCube()
+    for move in SCRAMBLE:
+        cube = cube.applyMove(move)
+    return cube
+
+
+def test_facelet_round_trip(scrambled: CubieCube):
+    facelet_cube = RubiksCube()
+    facelet_cube.state = [CubeLabel(i // 9) for i in range(54)]
+    for move in SCRAMBLE:
+        facelet_cube.applyMove(move)
+
+    assert scrambled.toFacelets() == facelet_cube.state
+    assert CubieCube.fromCube(facelet_cube) == scrambled
+
+
+def test_fromFacelets_rejects_invalid_cubie():
+    state = CubieCube().toFacelets()
+    state[0] = CubeLabel.RIGHT
+
+    with pytest.raises(ValueError):
+        CubieCube.fromFacelets(state)
+
+
+def test_inverse(scrambled: CubieCube):
+    assert scrambled.multiply(scrambled.inverse()) == CubieCube()
+    assert scrambled.inverse().multiply(scrambled) == CubieCube()
+
+
+def test_isSolvable(scrambled: CubieCube):
+    assert scrambled.isSolvable()
+
+    twisted = CubieCube(co=[1, 0, 0, 0, 0, 0, 0, 0])
+    flipped = CubieCube(eo=[1] + [0] * 11)
+    swapped = CubieCube(cp=[1, 0, 2, 3, 4, 5, 6, 7])
+
+    assert not twisted.isSolvable()
+    assert not flipped.isSolvable()
+    assert not swapped.isSolvable()
+
+
+def test_coordinates_round_trip(scrambled: CubieCube):
+    assert CubieCoordinates.fromCubie(CubieCube()) == CubieCoordinates(0, 0, 0, 0, 0)
+    assert CubieCoordinates.fromCubie(scrambled).toCubie() == scrambled
+
+
+def test_permutation_encoding():
+    permutations = decodePermutation(np.arange(N_CORNERS), 8)
+
+    assert np.array_equal(encodePermutation(permutations), np.arange(N_CORNERS))
+
+
+def test_slice_sorted_encoding():
+    ep = decodeSliceSorted(np.arange(N_SLICE_SORTED))
+
+    assert np.array_equal(encodeSliceSorted(ep), np.arange(N_SLICE_SORTED))
+
+
+@pytest.mark.parametrize("move", range(18))
+def test_move_tables(move_tables: MoveTables, scrambled: CubieCube, move: int):
+    before = CubieCoordinates.fromCubie(scrambled)
+    after = CubieCoordinates.fromCubie(scrambled.multiply(MoveCubies[move]))
+
+    assert move_tables.twist[before.twist, move] == after.twist
+    assert move_tables.flip[before.flip, move] == after.flip
+    assert move_tables.sliceSorted[before.sliceSorted, move] == after.sliceSorted
+    assert move_tables.corners[before.corners, move] == after.corners
+
+
+@pytest.mark.parametrize("move", Phase2Moves)
+def test_udEdges_move_table(move_tables: MoveTables, move: int):
+    cube = CubieCube()
+    for m in [0, 4, 9, 7, 13, 2, 16]:
+        cube = cube.multiply(MoveCubies[m])
+
+    before = udEdgesCoordinate(cube)
+    after = udEdgesCoordinate(cube.multiply(MoveCubies[move]))
+
+    assert move_tables.udEdges[before, move] == after
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+
+from rubiksolver.cube import (
+    CubeBatch,
+    CubeLabel,
+    CubeMove,
+    CubieCube,
+    PackedCube,
+    RubiksCube,
+    rankCubie,
+    unrankCubie,
+)
+from rubiksolver.cube.encoding import NumStates
+
+
+def scrambled(seed: int) -> RubiksCube:
+    rng = random.Random(seed)
+    cube = RubiksCube()
+    cube.state = [CubeLabel(i // 9) for i in range(54)]
+    for _ in range(25):
+        cube.applyMove(rng.choice(list(CubeMove)))
+    return cube
+
+
+def test_packed_round_trip():
+    cube = scrambled(0)
+    cube.state[7] = CubeLabel.UNLABELD
+    packed = PackedCube.fromCube(cube)
+
+    assert len(packed.data) == 21
+    assert packed.toCube().state == cube.state
+    assert packed.toString() == str(cube)
+    assert PackedCube.fromString(str(cube)) == packed
+    assert hash(PackedCube.fromString(str(cube))) == hash(packed)
+    assert packed != PackedCube.fromCube(scrambled(1))
+
+
+def test_batch_pack_matches_packed_cube():
+    cubes = [scrambled(seed) for seed in range(20)] + [RubiksCube()]
+    batch = CubeBatch.fromCubes(cubes)
+    packed = batch.pack()
+
+    assert packed.shape == (21, 21)
+    assert [row.tobytes() for row in packed] == [
+        PackedCube.fromCube(cube).data for cube in cubes
+    ]
+    assert np.array_equal(CubeBatch.fromPacked(packed).states, batch.states)
+
+
+def test_rank_round_trip():
+    assert rankCubie(CubieCube()) == 0
+    for seed in range(20):
+        cube = CubieCube.fromCube(scrambled(seed))
+        rank = rankCubie(cube)
+        assert 0 <= rank < NumStates
+        assert unrankCubie(rank) == cube
+
+
+def test_rank_extremes():
+    assert unrankCubie(NumStates - 1).isSolvable()
+    with pytest.raises(ValueError):
+        unrankCubie(NumStates)
@@ -0,0 +1,53 @@
+import pytest
+
+from rubiksolver.cube import CubeMove, Permutation, compileNotation
+from rubiksolver.cube.notation import movePermutation
+
+IDENTITY = Permutation.identity()
+
+
+@pytest.mark.parametrize("move", list(CubeMove))
+def test_face_turns_match_cube_moves(move: CubeMove):
+    name = move.name.replace("PRIME", "'")
+    assert compileNotation(name) == Permutation.fromMove(move)
+
+
+@pytest.mark.parametrize(
+    "notation, expected",
+    [
+        ("x", "R M' L'"),
+        ("y", "U E' D'"),
+        ("z", "F S B'"),
+        ("r", "R M'"),
+        ("Uw", "U E'"),
+        ("Rw2", "r2"),
+        ("(R U)2'", "U' R' U' R'"),
+        ("(R (U F)2)3", "R U F U F R U F U F R U F U F"),
+        ("R2'", "R2"),
+        ("x y x'", "z"),
+    ],
+)
+def test_equivalences(notation: str, expected: str):
+    assert compileNotation(notation) == compileNotation(expected)
+
+
+@pytest.mark.parametrize(
+    "notation", ["", "  ", "(R U R' U')6", "M4", "M' M", "(x y)3 (y x)3"]
+)
+def test_identities(notation: str):
+    assert compileNotation(notation) == IDENTITY
+
+
+def test_rotation_moves_centers():
+    assert movePermutation("x").indices[4] != 4
+    assert movePermutation("R").indices[4] == 4
+
+
+@pytest.mark.parametrize("notation", ["Q", "R U (", "R)", "(R U')2 ]", "R0", "Mw"])
+def test_invalid(notation: str):
+    with pytest.raises(ValueError):
+        compileNotation(notation)
+
+
+def test_cached():
+    assert compileNotation("R U R' U'") is compileNotation("R U R' U'")
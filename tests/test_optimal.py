@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from helpers import SOLVED, isSolution
+
+from rubiksolver.cube import (
+    OptimalSolver,
+    OptimalTables,
+    SolverTables,
+    TwoPhaseSolver,
+    compileNotation,
+    randomMoveScrambles,
+    randomStates,
+)
+from rubiksolver.cube.coord import MoveTables
+from rubiksolver.cube.solver import buildPruningTable
+
+
+@pytest.fixture(scope="module")
+def optimal_directory(tmp_path_factory) -> str:
+    directory = str(tmp_path_factory.mktemp("optimal") / "tables")
+    OptimalTables.build(maxDepth=6).save(directory)
+    return directory
+
+
+@pytest.fixture(scope="module")
+def twoPhase(table_directory: str) -> TwoPhaseSolver:
+    return TwoPhaseSolver(SolverTables.load(table_directory))
+
+
+@pytest.fixture(scope="module")
+def solver(optimal_directory: str, twoPhase: TwoPhaseSolver) -> OptimalSolver:
+    return OptimalSolver(OptimalTables.load(optimal_directory), twoPhase)
+
+
+def test_buildPruningTable_maxDepth_is_a_lower_bound():
+    moves = MoveTables.build()
+    udSlice = moves.sliceSorted[::24] // 24
+    full = buildPruningTable(moves.twist, udSlice, list(range(18)))
+    capped = buildPruningTable(moves.twist, udSlice, list(range(18)), maxDepth=5)
+
+    assert np.array_equal(np.minimum(full, 6), capped)
+
+
+def test_solve_solved(solver: OptimalSolver):
+    result = solver.search(SOLVED)
+
+    assert result.solution == ""
+    assert result.optimal
+
+
+def test_finds_shortest_solution(solver: OptimalSolver):
+    facelets = "".join(
+        compileNotation("R U R' U' F2 D").inverse().applyState(list(SOLVED))
+    )
+    result = solver.search(facelets)
+
+    assert result.optimal
+    assert result.length == result.lowerBound == 6
+    assert isSolution(facelets, result.solution)
+
+
+def test_never_longer_than_scramble(solver: OptimalSolver):
+    _, batch = randomMoveScrambles(5, 8, seed=2)
+    for facelets in batch.toStrings():
+        result = solver.search(facelets)
+
+        assert result.optimal
+        assert result.length <= 8
+        assert isSolution(facelets, result.solution)
+
+
+def test_budget_returns_best_so_far(solver: OptimalSolver, twoPhase: TwoPhaseSolver):
+    facelets = randomStates(1, seed=5).toStrings()[0]
+    result = solver.search(facelets, timeout=0.5)
+
+    assert not result.optimal
+    assert result.lowerBound < result.length <= twoPhase.maxLength
+    assert isSolution(facelets, result.solution)
+
+
+def test_parallel_search_matches_serial(
+    solver: OptimalSolver, optimal_directory: str, twoPhase: TwoPhaseSolver
+):
+    _, batch = randomMoveScrambles(3, 9, seed=7)
+    with OptimalSolver(
+        OptimalTables.load(optimal_directory),
+        twoPhase,
+        workers=2,
+        splitDepth=1,
+    ) as parallel:
+        for facelets in batch.toStrings():
+            result = parallel.search(facelets)
+
+            assert result.optimal
+            assert result.length == solver.search(facelets).length
+            assert isSolution(facelets, result.solution)
+
+
+def test_parallel_search_needs_saved_tables(optimal_directory: str):
+    tables = OptimalTables.load(optimal_directory)
+    parallel = OptimalSolver(tables, workers=2, directory="elsewhere")
+    assert parallel.directory == optimal_directory
+
+    memory = OptimalTables(
+        **{name: np.array(table) for name, table in vars(tables).items()}
+    )
+    with pytest.raises(ValueError):
+        OptimalSolver(memory, workers=2)
+
+
+def test_rejects_invalid(solver: OptimalSolver):
+    with pytest.raises(ValueError):
+        solver.solve("R" + SOLVED[1:])
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from rubiksolver.cube import (
+    CubeBatch,
+    CubeLabel,
+    CubeMove,
+    Permutation,
+    RubiksCube,
+)
+
+SEXY = [CubeMove.R, CubeMove.U, CubeMove.RPRIME, CubeMove.UPRIME]
+
+
+@pytest.fixture
+def cube() -> RubiksCube:
+    obj = RubiksCube()
+    obj.state = [CubeLabel(i // 9) for i in range(54)]
+    for move in [CubeMove.F, CubeMove.L2, CubeMove.DPRIME]:
+        obj.applyMove(move)
+    return obj
+
+
+def test_fromMoves_matches_applyMove(cube: RubiksCube):
+    expected = RubiksCube()
+    expected.state = list(cube.state)
+    for move in SEXY:
+        expected.applyMove(move)
+
+    permutation = Permutation.fromMoves(SEXY)
+    assert permutation.applyState(cube.state) == expected.state
+
+    state = cube.state
+    permutation.apply(cube)
+    assert cube.state == expected.state
+    assert cube.state is state
+
+
+def test_composition_and_notation():
+    product = Permutation.identity()
+    for move in SEXY:
+        product = product * Permutation.fromMove(move)
+
+    assert product == Permutation.fromMoves(SEXY)
+    assert product == Permutation.fromNotation("R U R' U'")
+    assert hash(product) == hash(Permutation.fromNotation("R U R' U'"))
+
+
+def test_inverse_and_powers():
+    permutation = Permutation.fromNotation("R U R' U'")
+    identity = Permutation.identity()
+
+    assert permutation.order() == 6
+    assert permutation**6 == identity
+    assert permutation**0 == identity
+    assert permutation * permutation.inverse() == identity
+    assert permutation**-2 == permutation.inverse() * permutation.inverse()
+    assert permutation**7 == permutation
+
+
+@pytest.mark.parametrize(
+    "notation, order",
+    [("", 1), ("U", 4), ("U2", 2), ("R U", 105), ("R U2 D' B D'", 1260)],
+)
+def test_order(notation: str, order: int):
+    assert Permutation.fromNotation(notation).order() == order
+
+
+def test_applyBatch():
+    batch = CubeBatch.solved(4)
+    batch.applyMove(np.array([0, 2, 4, 6]))
+    expected = batch.states.copy()
+
+    permutation = Permutation.fromNotation("R U R' U' F2")
+    permutation.applyBatch(batch)
+
+    assert np.array_equal(batch.states, expected[:, list(permutation.indices)])
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        Permutation([0, 0, 1])
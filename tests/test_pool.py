@@ -0,0 +1,97 @@
+import time
+
+from helpers import SOLVED, isSolution, scramble
+
+from rubiksolver.cube import SolverPool, SolveVariants, solveMany
+
+
+def test_ordered_results(table_directory: str):
+    states = [scramble(seed) for seed in range(6)] + ["U" * 54, SOLVED]
+    results = solveMany(states, workers=2, directory=table_directory)
+
+    assert [result.index for result in results] == list(range(len(states)))
+    assert [result.facelets for result in results] == states
+    for result in results[:6]:
+        assert result.ok
+        assert result.latency > 0
+        assert isSolution(result.facelets, result.solution)
+
+    assert not results[6].ok and results[6].solution is None
+    assert results[7].solution == ""
+
+
+def test_completion_order(table_directory: str):
+    states = [scramble(seed) for seed in range(10, 14)]
+    with SolverPool(2, directory=table_directory) as pool:
+        results = list(pool.solveMany(states, ordered=False))
+
+    assert sorted(result.index for result in results) == list(range(len(states)))
+    assert all(isSolution(r.facelets, r.solution) for r in results)
+
+
+def test_submit(table_directory: str):
+    facelets = scramble(20)
+    with SolverPool(1, directory=table_directory, context="spawn") as pool:
+        result = pool.submit(facelets, index=7).result()
+
+    assert result.index == 7
+    assert isSolution(facelets, result.solution)
+
+
+def test_submit_overrides_maxLength(table_directory: str):
+    facelets = scramble(21)
+    with SolverPool(1, directory=table_directory) as pool:
+        first = pool.submit(facelets).result()
+        length = len(first.solution.split())
+        shorter = pool.submit(facelets, maxLength=length - 1, timeout=5.0).result()
+        impossible = pool.submit(facelets, maxLength=3).result()
+
+    assert not shorter.ok or len(shorter.solution.split()) < length
+    assert not impossible.ok
+
+
+def test_solveShortest(table_directory: str):
+    facelets = scramble(22)
+    with SolverPool(2, directory=table_directory) as pool:
+        plain = pool.submit(facelets).result()
+        shortest = pool.solveShortest(facelets, timeout=10.0)
+        every = pool.solveShortest(facelets, timeout=10.0, variants=SolveVariants)
+        invalid = pool.solveShortest("U" * 54)
+
+    assert shortest.ok
+    assert isSolution(facelets, shortest.solution)
+    assert len(shortest.solution.split()) <= len(plain.solution.split())
+    assert isSolution(facelets, every.solution)
+    assert len(every.solution.split()) <= len(shortest.solution.split())
+    assert not invalid.ok
+
+
+def test_cancel_stops_running_solves(table_directory: str):
+    with SolverPool(1, directory=table_directory) as pool:
+        pool.warmUp()
+        # No solution of at most 12 moves exists, so the search runs until the
+        # timeout unless it gets cancelled
+        hard = pool.submit(scramble(23), index=5, maxLength=12, timeout=60.0)
+        time.sleep(0.2)
+        start = time.perf_counter()
+        pool.cancel(5)
+        cancelled = hard.result(timeout=10.0)
+        elapsed = time.perf_counter() - start
+        later = pool.submit(scramble(23), index=6).result()
+
+    assert not cancelled.ok and "cancelled" in cancelled.error
+    assert elapsed < 5.0
+    assert later.ok
+
+
+def test_solutions_stream_shorter_results(table_directory: str):
+    facelets = scramble(24)
+    with SolverPool(1, directory=table_directory) as pool:
+        results = list(pool.solutions(facelets, timeout=10.0, improveTime=1.0))
+        invalid = list(pool.solutions("U" * 54))
+
+    assert all(result.ok for result in results)
+    assert all(isSolution(facelets, result.solution) for result in results)
+    lengths = [len(result.solution.split()) for result in results]
+    assert lengths == sorted(set(lengths), reverse=True)
+    assert len(invalid) == 1 and not invalid[0].ok
@@ -0,0 +1,54 @@
+import numpy as np
+
+from rubiksolver.cube import (
+    CubeBatch,
+    CubeMove,
+    RubiksCube,
+    randomCube,
+    randomMoveScrambles,
+    randomStates,
+    validate,
+)
+from rubiksolver.cube.scramble import generateCorpus, randomMoves, writeCorpus
+
+
+def test_randomStates_are_valid_and_seeded():
+    batch = randomStates(500, seed=1)
+
+    assert all(validate(cube.state).isValid for cube in batch.toCubes())
+    assert np.array_equal(batch.states, randomStates(500, seed=1).states)
+    assert not np.array_equal(batch.states, randomStates(500, seed=2).states)
+    assert len(set(batch.toStrings())) == 500
+
+
+def test_randomCube():
+    assert validate(randomCube(3).state).isValid
+
+
+def test_randomMoves_never_repeat_a_face():
+    moves = randomMoves(200, 30, seed=4)
+    faces = np.array(
+        [[RubiksCube.MoveTurns[CubeMove(m)][0].value for m in row] for row in moves]
+    )
+    assert moves.shape == (200, 30)
+    assert np.all(faces[:, 1:] != faces[:, :-1])
+
+
+def test_randomMoveScrambles_match_applyMove():
+    moves, batch = randomMoveScrambles(5, 20, seed=5)
+    for row, facelets in zip(moves, batch.toStrings()):
+        single = CubeBatch.solved(1)
+        single.applyMoves([CubeMove(m) for m in row])
+        assert single.toStrings() == [facelets]
+
+
+def test_corpus(tmp_path):
+    filename = tmp_path / "corpus.txt"
+    writeCorpus(str(filename), 25, seed=6, chunkSize=10)
+
+    lines = filename.read_text().splitlines()
+    assert len(lines) == 25
+    assert lines == [s for chunk in generateCorpus(25, 6, chunkSize=10) for s in chunk]
+
+    scrambles = [s for chunk in generateCorpus(7, 6, length=10) for s in chunk]
+    assert len(scrambles) == 7
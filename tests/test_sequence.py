@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from rubiksolver.cube import (
+    CubeLabel,
+    CubeMove,
+    RubiksCube,
+    invertMoves,
+    simplifyMoves,
+)
+
+U, U2, UP = CubeMove.U, CubeMove.U2, CubeMove.UPRIME
+D, D2, DP = CubeMove.D, CubeMove.D2, CubeMove.DPRIME
+R, R2, RP = CubeMove.R, CubeMove.R2, CubeMove.RPRIME
+
+
+def applied(moves: list[CubeMove]) -> str:
+    cube = RubiksCube()
+    cube.state = [CubeLabel(i // 9) for i in range(54)]
+    for move in moves:
+        cube.applyMove(move)
+    return str(cube)
+
+
+@pytest.mark.parametrize(
+    "moves, expected",
+    [
+        ([], []),
+        ([U, UP], []),
+        ([U, U], [U2]),
+        ([U, U, U], [UP]),
+        ([U2, U2], []),
+        ([U, D, U], [U2, D]),
+        ([U, D, UP, DP], []),
+        ([R, U, D, UP, DP, RP], []),
+        ([R, U, R], [R, U, R]),
+        ([U, R, R2, R, U], [U2]),
+    ],
+)
+def test_simplifyMoves(moves: list[CubeMove], expected: list[CubeMove]):
+    assert simplifyMoves(moves) == expected
+
+
+def test_simplifyMoves_preserves_state():
+    rng = random.Random(0)
+    for _ in range(50):
+        moves = [rng.choice(list(CubeMove)) for _ in range(30)]
+        simplified = simplifyMoves(moves)
+        assert applied(simplified) == applied(moves)
+        assert simplifyMoves(simplified) == simplified
+
+
+def test_invertMoves():
+    moves = [R, U2, DP, R2, U]
+    assert applied(moves + invertMoves(moves)) == applied([])
+    assert simplifyMoves(moves + invertMoves(moves)) == []
@@ -0,0 +1,148 @@
+import json
+import socket
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from helpers import SOLVED
+
+from rubiksolver.cube import SolutionCache, SolverPool, randomStates
+from rubiksolver.serve import SolveServer, UnixSolveServer
+
+
+@pytest.fixture(scope="module")
+def server(table_directory: str):
+    with SolverPool(2, directory=table_directory) as pool:
+        pool.warmUp()
+        yield SolveServer(pool, SolutionCache(), maxPending=2)
+
+
+def serve(server: SolveServer, lines: list[str]) -> dict:
+    output: list[str] = []
+    server.serveLines(lines, output.append)
+    responses = [json.loads(line) for line in output]
+    return {response["id"]: response for response in responses}
+
+
+def test_streams_results_with_ids(server: SolveServer):
+    states = randomStates(5, seed=1).toStrings()
+    lines = [json.dumps({"id": f"r{i}", "facelets": f}) for i, f in enumerate(states)]
+    responses = serve(server, lines)
+
+    assert sorted(responses) == [f"r{i}" for i in range(5)]
+    for response in responses.values():
+        assert response["error"] is None
+        assert response["solution"]
+        assert response["latency"] > 0
+        assert not response["cached"]
+
+    again = serve(server, lines[:1])
+    assert again["r0"]["cached"]
+    assert again["r0"]["solution"] == responses["r0"]["solution"]
+
+
+def test_reports_errors(server: SolveServer):
+    output: list[str] = []
+    server.serveLines(
+        [json.dumps({"id": 1, "facelets": "U" * 54}), "not json", ""], output.append
+    )
+    responses = sorted((json.loads(line) for line in output), key=str)
+
+    assert len(responses) == 2
+    assert all(response["solution"] is None for response in responses)
+    assert {response["id"] for response in responses} == {1, None}
+    assert any(response["error"].startswith("Malformed") for response in responses)
+
+
+def test_malformed_requests_keep_their_id(server: SolveServer):
+    lines = [json.dumps({"id": 7}), json.dumps({"id": 8, "facelets": 3})]
+    responses = serve(server, lines)
+
+    assert sorted(responses) == [7, 8]
+    assert all(r["error"].startswith("Malformed") for r in responses.values())
+
+
+def test_improve_streams_shorter_solutions(server: SolveServer):
+    facelets = randomStates(1, seed=4).toStrings()[0]
+    output: list[str] = []
+    server.serveLines(
+        [json.dumps({"id": "a", "facelets": facelets, "improve": 0.5})],
+        output.append,
+    )
+    responses = [json.loads(line) for line in output]
+
+    assert len(responses) >= 2
+    assert all(response["id"] == "a" for response in responses)
+    assert [response["final"] for response in responses[:-1]] == [False] * (
+        len(responses) - 1
+    )
+    final = responses[-1]
+    assert final["final"]
+    assert final["solution"] == responses[-2]["solution"]
+    lengths = [len(response["solution"].split()) for response in responses[:-1]]
+    assert lengths == sorted(lengths, reverse=True)
+    assert server.cache.get(facelets) == final["solution"]
+
+
+def test_rejects_non_numeric_improve(server: SolveServer):
+    request = {"id": 1, "facelets": SOLVED, "improve": "soon"}
+    responses = serve(server, [json.dumps(request)])
+
+    assert responses[1]["error"].startswith("Malformed")
+
+
+class BrokenPool:
+    def __init__(self):
+        self.submits = 0
+
+    def submit(self, facelets: str):
+        self.submits += 1
+        raise BrokenProcessPool("A worker process terminated abruptly")
+
+
+def test_refuses_solves_once_the_pool_broke():
+    pool = BrokenPool()
+    cache = SolutionCache()
+    cache.put(SOLVED, "")
+    server = SolveServer(pool, cache, maxPending=1)
+    states = randomStates(3, seed=3).toStrings()
+    lines = [json.dumps({"id": i, "facelets": f}) for i, f in enumerate(states)]
+
+    responses = serve(server, [*lines, json.dumps({"id": "hit", "facelets": SOLVED})])
+
+    assert sorted(responses, key=str) == [0, 1, 2, "hit"]
+    for i in range(3):
+        assert responses[i]["solution"] is None
+        assert responses[i]["error"].startswith("Solver failure")
+    assert responses["hit"]["cached"]
+    assert pool.submits == 1
+
+
+def test_accepts_bare_facelet_strings(server: SolveServer):
+    responses = serve(server, [json.dumps(SOLVED)])
+
+    assert responses[None]["solution"] == ""
+    assert responses[None]["error"] is None
+
+
+def test_unix_socket(server: SolveServer, tmp_path):
+    address = str(tmp_path / "solver.sock")
+    states = randomStates(3, seed=2).toStrings()
+
+    with UnixSolveServer(address, server) as socketServer:
+        thread = threading.Thread(target=socketServer.serve_forever, daemon=True)
+        thread.start()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(address)
+            for i, facelets in enumerate(states):
+                request = {"id": i, "facelets": facelets}
+                client.sendall((json.dumps(request) + "\n").encode())
+            client.shutdown(socket.SHUT_WR)
+            lines = client.makefile().read().splitlines()
+
+        socketServer.shutdown()
+
+    responses = [json.loads(line) for line in lines]
+    assert sorted(response["id"] for response in responses) == [0, 1, 2]
+    assert all(response["solution"] for response in responses)
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+from helpers import SOLVED
+
+from rubiksolver.cube import (
+    CubeLabel,
+    CubeMove,
+    RubiksCube,
+    SolverTables,
+    TwoPhaseSolver,
+)
+
+SCRAMBLES = [
+    [CubeMove.R, CubeMove.U, CubeMove.RPRIME, CubeMove.UPRIME],
+    [
+        CubeMove.U,
+        CubeMove.U,
+        CubeMove.FPRIME,
+        CubeMove.R,
+        CubeMove.B,
+        CubeMove.B,
+        CubeMove.R,
+        CubeMove.R,
+        CubeMove.D,
+        CubeMove.LPRIME,
+        CubeMove.F,
+        CubeMove.DPRIME,
+        CubeMove.B,
+        CubeMove.L,
+        CubeMove.UPRIME,
+        CubeMove.F,
+        CubeMove.RPRIME,
+        CubeMove.D,
+        CubeMove.BPRIME,
+        CubeMove.L,
+        CubeMove.U,
+    ],
+]
+
+
+@pytest.fixture(scope="module")
+def solver(table_directory: str) -> TwoPhaseSolver:
+    return TwoPhaseSolver(SolverTables.load(table_directory))
+
+
+def scrambled(moves: list[CubeMove]) -> RubiksCube:
+    cube = RubiksCube()
+    cube.state = [CubeLabel(i // 9) for i in range(54)]
+    for move in moves:
+        cube.applyMove(move)
+    return cube
+
+
+def test_tables_are_memory_mapped(table_directory: str):
+    tables = SolverTables.load(table_directory)
+
+    assert isinstance(tables.twistSlicePrune, np.memmap)
+    assert isinstance(tables.corners, np.memmap)
+    assert not tables.udEdgesSlicePrune.flags.writeable
+
+
+def test_load_rejects_other_version(tmp_path, table_directory: str):
+    directory = tmp_path / "tables"
+    SolverTables.load(table_directory).save(str(directory))
+    manifest = directory / "manifest.json"
+    manifest.write_text(manifest.read_text().replace('"version": 1', '"version": 0'))
+
+    with pytest.raises(ValueError):
+        SolverTables.load(str(directory))
+
+
+def test_solve_solved(solver: TwoPhaseSolver):
+    assert solver.solve(SOLVED) == ""
+
+
+@pytest.mark.parametrize("moves", SCRAMBLES)
+def test_solve(solver: TwoPhaseSolver, moves: list[CubeMove]):
+    cube = scrambled(moves)
+    solution = solver.solve(str(cube))
+
+    assert len(solution.split()) <= solver.maxLength
+
+    timeline = cube.parseSolution(solution)
+    while (move := timeline.next()) is not None:
+        cube.applyMove(move)
+
+    assert str(cube) == SOLVED
+
+
+@pytest.mark.parametrize(
+    "facelets",
+    [
+        SOLVED[:-1],
+        SOLVED.replace("U", "X", 1),
+        "R" + SOLVED[1:],
+        SOLVED[:4] + "R" + SOLVED[5:13] + "U" + SOLVED[14:],
+    ],
+)
+def test_solve_rejects_invalid(solver: TwoPhaseSolver, facelets: str):
+    with pytest.raises(ValueError):
+        solver.solve(facelets)
+
+
+def test_solve_rejects_twisted_corner(solver: TwoPhaseSolver):
+    state = list(SOLVED)
+    state[8], state[9], state[20] = state[9], state[20], state[8]
+
+    with pytest.raises(ValueError):
+        solver.solve("".join(state))
+
+
+def test_isComplete_uses_solver(solver: TwoPhaseSolver):
+    cube = scrambled(SCRAMBLES[0])
+    cube.solver = solver
+
+    assert cube.isComplete()
+    assert cube.solution is not None
+    assert cube.solution.numMoves > 0
+
+
+def test_solveAnytime_gets_shorter(solver: TwoPhaseSolver):
+    cube = scrambled(SCRAMBLES[1])
+    solutions: list[str] = []
+    best = solver.solveAnytime(str(cube), solutions.append, timeout=2.0)
+
+    assert solutions[0] == solver.solve(str(cube))
+    assert best == solutions[-1]
+    lengths = [len(solution.split()) for solution in solutions]
+    assert lengths == sorted(set(lengths), reverse=True)
+
+    timeline = cube.parseSolution(best)
+    while (move := timeline.next()) is not None:
+        cube.applyMove(move)
+    assert str(cube) == SOLVED
+
+
+def test_solveAnytime_of_solved_and_invalid(solver: TwoPhaseSolver):
+    solutions: list[str] = []
+    assert solver.solveAnytime(SOLVED, solutions.append) == ""
+    assert solutions == [""]
+    with pytest.raises(ValueError):
+        solver.solveAnytime("U" * 54, solutions.append)
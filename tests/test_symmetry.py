@@ -0,0 +1,82 @@
+import kociemba
+import pytest
+from helpers import SOLVED, isSolution, scramble
+
+from rubiksolver.cube import CubeMove, RubiksCube, SolutionCache, canonicalize
+from rubiksolver.cube.solver import CharLabel
+from rubiksolver.cube.symmetry import Symmetries
+
+
+def fromString(facelets: str) -> RubiksCube:
+    cube = RubiksCube()
+    cube.state = [CharLabel[c] for c in facelets]
+    return cube
+
+
+def test_group_structure():
+    assert len(Symmetries) == 48
+    assert sum(s.isReflection for s in Symmetries) == 24
+    assert len({s.matrix for s in Symmetries}) == 48
+    for symmetry in Symmetries:
+        assert symmetry.inverse.inverse == symmetry
+        assert symmetry.faces[0].value in range(6)
+
+
+@pytest.mark.parametrize("symmetry", Symmetries, ids=lambda s: str(s.index))
+def test_moves_commute_with_symmetry(symmetry):
+    facelets = scramble(symmetry.index)
+    for move in CubeMove:
+        cube = fromString(facelets)
+        cube.applyMove(move)
+
+        transformed = fromString(symmetry.apply(facelets))
+        transformed.applyMove(symmetry.mapCubeMove(move))
+
+        assert symmetry.apply(str(cube)) == str(transformed)
+        assert symmetry.inverse.apply(symmetry.apply(facelets)) == facelets
+
+
+def test_canonical_form_is_shared_by_all_variants():
+    facelets = scramble(1)
+    canonical, symmetry = canonicalize(facelets)
+
+    assert symmetry.apply(facelets) == canonical
+    assert {canonicalize(s.apply(facelets))[0] for s in Symmetries} == {canonical}
+    assert canonicalize(SOLVED) == (SOLVED, Symmetries[0])
+
+
+def test_unlabeled_facelets_are_preserved():
+    facelets = "X" + scramble(2)[1:]
+    canonical, _ = canonicalize(facelets)
+    assert canonical.count("X") == 1
+
+
+def test_invalid_strings():
+    with pytest.raises(ValueError):
+        canonicalize("U" * 53)
+    with pytest.raises(ValueError):
+        canonicalize("Q" * 54)
+
+
+def test_mapped_solution_solves_original():
+    facelets = scramble(3)
+    canonical, symmetry = canonicalize(facelets)
+    solution = symmetry.inverse.mapSolution(kociemba.solve(canonical))
+    assert isSolution(facelets, solution)
+
+
+def test_cache_symmetry_reduction():
+    calls = []
+
+    def solver(facelets: str) -> str:
+        calls.append(facelets)
+        return kociemba.solve(facelets)
+
+    cache = SolutionCache(solver, symmetryReduction=True)
+    facelets = scramble(4)
+    for symmetry in Symmetries[::7]:
+        variant = symmetry.apply(facelets)
+        assert isSolution(variant, cache(variant))
+
+    assert len(calls) == 1
+    assert len(cache) == 1
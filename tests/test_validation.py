@@ -0,0 +1,75 @@
+import pytest
+
+from rubiksolver.cube import (
+    CubeFace,
+    CubeLabel,
+    CubeMove,
+    CubePosition,
+    Facelet,
+    RubiksCube,
+    ValidationStatus,
+    validate,
+)
+from rubiksolver.cube.cubie import CornerFacelets, EdgeFacelets
+
+
+@pytest.fixture
+def state() -> list[CubeLabel]:
+    cube = RubiksCube()
+    cube.state = [CubeLabel(i // 9) for i in range(54)]
+    for move in [CubeMove.R, CubeMove.U, CubeMove.FPRIME, CubeMove.L, CubeMove.D]:
+        cube.applyMove(move)
+    return cube.state
+
+
+def test_valid(state: list[CubeLabel]):
+    result = validate(state)
+    assert result.isValid
+    assert result.suspectFacelets == []
+
+
+def test_incomplete(state: list[CubeLabel]):
+    state[0] = CubeLabel.UNLABELD
+    result = validate(state)
+    assert result.status == ValidationStatus.INCOMPLETE
+    assert result.suspectFacelets == [Facelet(CubeFace.UP, CubePosition.ONE)]
+
+
+def test_center(state: list[CubeLabel]):
+    state[4], state[13] = state[13], state[4]
+    result = validate(state)
+    assert result.status == ValidationStatus.CENTER
+    assert len(result.suspectFacelets) == 2
+
+
+def test_color_count(state: list[CubeLabel]):
+    state[0] = CubeLabel.UP if state[0] != CubeLabel.UP else CubeLabel.RIGHT
+    result = validate(state)
+    assert result.status == ValidationStatus.COLOR_COUNT
+    assert Facelet(CubeFace.UP, CubePosition.ONE) in result.suspectFacelets
+
+
+def test_mirrored_corner(state: list[CubeLabel]):
+    a, b, c = CornerFacelets[0]
+    state[b], state[c] = state[c], state[b]
+    result = validate(state)
+    assert result.status == ValidationStatus.CORNER
+    assert {RubiksCube.FaceletToIndex(f) for f in result.suspectFacelets} >= {a, b, c}
+
+
+def test_corner_twist(state: list[CubeLabel]):
+    a, b, c = CornerFacelets[0]
+    state[a], state[b], state[c] = state[c], state[a], state[b]
+    assert validate(state).status == ValidationStatus.CORNER_TWIST
+
+
+def test_edge_flip(state: list[CubeLabel]):
+    a, b = EdgeFacelets[0]
+    state[a], state[b] = state[b], state[a]
+    assert validate(state).status == ValidationStatus.EDGE_FLIP
+
+
+def test_parity(state: list[CubeLabel]):
+    for a, b in zip(EdgeFacelets[0], EdgeFacelets[1]):
+        state[a], state[b] = state[b], state[a]
+    assert validate(state).status == ValidationStatus.PARITY
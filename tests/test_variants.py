@@ -0,0 +1,40 @@
+import kociemba
+import pytest
+from helpers import SOLVED, isSolution
+
+from rubiksolver.cube import (
+    SolveVariants,
+    invertFacelets,
+    invertSolution,
+    randomStates,
+)
+
+
+def test_invertFacelets():
+    facelets = randomStates(1, seed=1).toStrings()[0]
+    inverse = invertFacelets(facelets)
+
+    assert inverse != facelets
+    assert invertFacelets(inverse) == facelets
+    assert isSolution(inverse, invertSolution(kociemba.solve(facelets)))
+
+
+def test_invertSolution():
+    assert invertSolution("R U2 F'") == "F U2 R'"
+    assert invertSolution("") == ""
+
+
+def test_invertFacelets_rejects_invalid():
+    with pytest.raises(ValueError):
+        invertFacelets("R" + SOLVED[1:])
+
+
+def test_variants_map_back():
+    assert len(SolveVariants) == 6
+    for facelets in randomStates(3, seed=2).toStrings():
+        variants = {variant.apply(facelets) for variant in SolveVariants}
+        assert len(variants) == 6
+
+        for variant in SolveVariants:
+            solution = kociemba.solve(variant.apply(facelets))
+            assert isSolution(facelets, variant.mapSolution(solution))
@@ -0,0 +1,305 @@
+import cv2 as cv
+import numpy as np
+import pytest
+
+from rubiksolver.cube import CubeLabel
+from rubiksolver.vision import (
+    HSV,
+    CalibratedColorClassificationModel,
+    CubeDetectionParameters,
+    CubeDetectionPipeline,
+    DetectionStages,
+    DetectionTimings,
+    FixedColorClassificationModel,
+    LookupColorClassificationModel,
+    defaultColorModel,
+)
+from rubiksolver.vision.vision import ColorClassificationModel
+
+
+def square(x: int, y: int, size: int) -> np.ndarray:
+    return np.array(
+        [[[x, y]], [[x + size, y]], [[x + size, y + size]], [[x, y + size]]],
+        dtype=np.int32,
+    )
+
+
+def referenceMedians(frame: np.ndarray, facelets: list[np.ndarray]) -> np.ndarray:
+    frame_hsv = cv.cvtColor(frame, cv.COLOR_BGR2HSV)
+    medians = []
+    for facelet in facelets:
+        mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+        cv.drawContours(mask, [facelet], -1, (255,), -1)
+        medians.append(np.median(frame_hsv[mask == 255], axis=0))
+    return np.array(medians)
+
+
+def test_faceletMedians_match_full_frame_masks():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+    facelets = [
+        square(40 + 50 * col, 30 + 50 * row, 40 + row)
+        for row in range(3)
+        for col in range(3)
+    ]
+    facelets.append(np.array([[[300, 200]], [[330, 230]], [[290, 250]]], np.int32))
+
+    medians = CubeDetectionPipeline.faceletMedians(frame, facelets)
+
+    assert np.array_equal(medians, referenceMedians(frame, facelets))
+
+
+def test_labelFacelets():
+    frame = np.zeros((120, 120, 3), dtype=np.uint8)
+    frame[10:50, 10:50] = (255, 255, 255)
+    frame[60:100, 60:100] = (0, 200, 255)
+    pipeline = CubeDetectionPipeline(
+        FixedColorClassificationModel(), CubeDetectionParameters()
+    )
+
+    labels, colors, confidences = pipeline.labelFacelets(
+        frame, [square(15, 15, 30), square(65, 65, 30)]
+    )
+
+    assert labels == [CubeLabel.UP, CubeLabel.DOWN]
+    assert colors[0].saturation == 0 and colors[0].value == 255
+    assert confidences == [1.0, 1.0]
+    assert pipeline.labelFacelets(frame, []) == ([], [], [])
+
+
+class EvenHueModel(ColorClassificationModel):
+    def classify(self, hsv: HSV) -> CubeLabel:
+        return CubeLabel.UP if hsv.hue % 2 == 0 else CubeLabel.UNLABELD
+
+
+def test_classifyMany_matches_classify():
+    rng = np.random.default_rng(1)
+    colors = np.concatenate(
+        [rng.integers(0, [180, 256, 256], size=(2000, 3)), [[0, 0, 0], [15, 90, 5]]]
+    )
+    model = FixedColorClassificationModel()
+    expected = [model.classify(HSV(*color)).value for color in colors.tolist()]
+
+    assert model.classifyMany(colors).tolist() == expected
+    assert EvenHueModel().classifyMany(colors[:4]).tolist() == [
+        0 if hue % 2 == 0 else -1 for hue in colors[:4, 0]
+    ]
+
+
+def test_lookup_table_is_cached(tmp_path):
+    model = FixedColorClassificationModel()
+    lookup = LookupColorClassificationModel(model, str(tmp_path))
+    cached = LookupColorClassificationModel(model, str(tmp_path))
+
+    assert len(list(tmp_path.iterdir())) == 1
+    assert isinstance(cached.table, np.memmap)
+
+    rng = np.random.default_rng(2)
+    frame = rng.integers(0, [180, 256, 256], size=(48, 64, 3)).astype(np.uint8)
+    labels = cached.classifyMany(frame)
+    assert labels.shape == (48, 64)
+    assert np.array_equal(labels, model.classifyMany(frame))
+    assert np.array_equal(lookup.table, cached.table)
+    assert lookup.classify(HSV(0, 0, 200)) == CubeLabel.UP
+
+
+# Typical HSV colors of the stickers under indoor lighting, red close to 180
+CalibrationCenters = {
+    CubeLabel.UP: [(90, 20, 220)],
+    CubeLabel.RIGHT: [(102, 200, 150)],
+    CubeLabel.FRONT: [(170, 190, 160), (177, 190, 160)],
+    CubeLabel.DOWN: [(28, 190, 210)],
+    CubeLabel.LEFT: [(55, 180, 150)],
+    CubeLabel.BACK: [(8, 200, 220)],
+}
+
+
+def calibrationSamples(count: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    samples, labels = [], []
+    for label, centers in CalibrationCenters.items():
+        for center in centers:
+            noise = rng.normal(0, [1.5, 10, 10], size=(count, 3))
+            samples.append(np.round(np.array(center) + noise) % [180, 256, 256])
+            labels.append(np.full(count, label.value))
+    return np.concatenate(samples).astype(np.uint8), np.concatenate(labels)
+
+
+def test_calibrated_model_fits_unlabeled_samples():
+    samples, _ = calibrationSamples(100, 3)
+    model = CalibratedColorClassificationModel.fit(samples)
+
+    test, expected = calibrationSamples(50, 4)
+    predicted, confidence = model.classifyWithConfidence(test)
+    assert np.mean(predicted == expected) > 0.99
+    assert ((0 <= confidence) & (confidence <= 1)).all()
+    assert np.median(confidence) > 0.99
+    assert model.classify(HSV(179, 190, 160)) == CubeLabel.FRONT
+
+    far, farConfidence = model.classifyWithConfidence(np.array([[150, 255, 30]]))
+    assert far.tolist() == [CubeLabel.UNLABELD.value]
+    assert farConfidence.tolist() == [0.0]
+
+
+def test_calibrated_model_ignores_rejected_samples():
+    samples, _ = calibrationSamples(100, 3)
+    outliers = np.repeat(np.array([[100, 255, 255], [0, 0, 60]], np.uint8), 2, 0)
+    clean = CalibratedColorClassificationModel.fit(samples)
+    model = CalibratedColorClassificationModel.fit(np.concatenate([samples, outliers]))
+
+    assert np.allclose(model.means, clean.means)
+    assert (model.classifyMany(outliers) == CubeLabel.UNLABELD.value).all()
+
+
+def test_calibrated_centroid_model():
+    samples, labels = calibrationSamples(100, 5)
+    model = CalibratedColorClassificationModel.fit(samples, labels, kind="centroid")
+
+    assert np.allclose(model.covariances, model.covariances[0])
+    test, expected = calibrationSamples(50, 6)
+    assert np.mean(model.classifyMany(test) == expected) > 0.99
+
+
+def test_calibrated_model_round_trip(tmp_path):
+    samples, labels = calibrationSamples(20, 7)
+    model = CalibratedColorClassificationModel.fit(samples, labels)
+    filename = str(tmp_path / "models" / "colormodel.npz")
+    model.save(filename)
+
+    loaded = defaultColorModel(filename)
+    assert isinstance(loaded, CalibratedColorClassificationModel)
+    assert loaded.fingerprint() == model.fingerprint()
+    assert np.array_equal(loaded.classifyMany(samples), model.classifyMany(samples))
+
+    lookup = LookupColorClassificationModel(loaded, str(tmp_path))
+    assert np.array_equal(lookup.classifyMany(samples), model.classifyMany(samples))
+
+
+def test_calibrated_model_needs_every_color():
+    samples, labels = calibrationSamples(20, 8)
+    with pytest.raises(ValueError, match="BACK"):
+        CalibratedColorClassificationModel.fit(
+            samples[labels != 5], labels[labels != 5]
+        )
+    with pytest.raises(ValueError):
+        CalibratedColorClassificationModel(np.zeros((6, 3)), np.zeros((6, 3, 3)), "knn")
+
+
+def gridCandidates() -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """
+    The 9 facelets of a slightly rotated face in row major order and a few
+    stray candidates around it.
+    """
+    angle = np.deg2rad(8)
+    rotation = np.array(
+        [[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]]
+    )
+    facelets = []
+    for row in range(3):
+        for col in range(3):
+            x, y = rotation @ [60.0 * col, 60.0 * row] + [200, 120]
+            facelets.append(square(int(x), int(y), 40))
+    strays = [square(x, y, 30) for x, y in [(30, 30), (560, 400), (580, 20), (40, 420)]]
+    return facelets, strays
+
+
+def test_faceletCandidateRANSAC_finds_the_grid():
+    facelets, strays = gridCandidates()
+    candidates = strays[:2] + facelets[::-1] + strays[2:]
+    parameters = CubeDetectionParameters()
+    parameters.homographyRANSACMaxError = 20
+    pipeline = CubeDetectionPipeline(FixedColorClassificationModel(), parameters)
+
+    found = pipeline.faceletCandidateRANSAC(candidates)
+
+    assert [f.tolist() for f in found] == [f.tolist() for f in facelets]
+    for seed in range(20):
+        again = pipeline.faceletCandidateRANSAC(candidates, seed)
+        assert [f.tolist() for f in again] == [f.tolist() for f in facelets]
+
+
+def test_fitGrid_is_reproducible():
+    rng = np.random.default_rng(10)
+    centroids = rng.uniform(0, 400, size=(12, 2)).astype(np.float32)
+
+    masks = [
+        CubeDetectionPipeline.fitGrid(centroids, 40.0, np.random.default_rng(3))
+        for _ in range(3)
+    ]
+
+    assert masks[0].shape == (12,) and masks[0].dtype == bool
+    assert all(np.array_equal(mask, masks[0]) for mask in masks)
+
+
+def test_result_times_every_stage():
+    facelets, _ = gridCandidates()
+    frame = np.zeros((360, 480, 3), dtype=np.uint8)
+    cv.drawContours(frame, facelets, -1, (0, 200, 255), cv.FILLED)
+    pipeline = CubeDetectionPipeline(
+        FixedColorClassificationModel(), CubeDetectionParameters()
+    )
+    pipeline.forward(frame)
+
+    timings = pipeline.result().stageTimings
+
+    assert list(timings) == [*DetectionStages, "total"]
+    assert all(
+        isinstance(duration, int) and duration >= 0 for duration in timings.values()
+    )
+    assert sum(timings[stage] for stage in DetectionStages) <= timings["total"]
+
+
+def test_DetectionTimings_keeps_a_rolling_window():
+    timings = DetectionTimings(window=100)
+    for i in range(200):
+        timings.add({"ransac": i * 1_000_000, "total": 5_000_000})
+
+    statistics = timings.statistics()
+
+    assert statistics["ransac"].frames == 100
+    assert statistics["ransac"].p50 == 149.5
+    assert 194 < statistics["ransac"].p95 < statistics["ransac"].p99 < 199
+    assert statistics["total"].p99 == 5.0
+    timings.clear()
+    assert timings.statistics() == {}
+
+
+def test_fitGrid_rejects_collinear_samples():
+    line = np.array([[100 + 60 * i, 200 + 5 * i] for i in range(6)], np.float32)
+    rng = np.random.default_rng(11)
+
+    assert not CubeDetectionPipeline.fitGrid(line, 20.0, rng).any()
+    same = np.full((6, 2), 150, np.float32)
+    assert not CubeDetectionPipeline.fitGrid(same, 20.0, rng).any()
+
+    facelets, _ = gridCandidates()
+    strays = [square(40 + 60 * i, 420, 30) for i in range(6)]
+    parameters = CubeDetectionParameters()
+    parameters.homographyRANSACMaxError = 20
+    pipeline = CubeDetectionPipeline(FixedColorClassificationModel(), parameters)
+    found = pipeline.faceletCandidateRANSAC(strays + facelets)
+    assert [f.tolist() for f in found] == [f.tolist() for f in facelets]
+
+
+def test_lookup_table_without_writable_cache(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    model = FixedColorClassificationModel()
+
+    lookup = LookupColorClassificationModel(model, str(blocker / "tables"))
+
+    assert not isinstance(lookup.table, np.memmap)
+    assert lookup.classify(HSV(0, 0, 200)) == CubeLabel.UP
+
+
+def test_lookup_table_removes_partial_file(tmp_path, monkeypatch):
+    def failingSave(file, table):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(np, "save", failingSave)
+    lookup = LookupColorClassificationModel(
+        FixedColorClassificationModel(), str(tmp_path)
+    )
+
+    assert lookup.table.shape == (256, 256, 256)
+    assert list(tmp_path.iterdir()) == []